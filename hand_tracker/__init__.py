@@ -5,6 +5,7 @@ Hand Tracker package
 __all__ = [
     "app",
     "camera",
+    "camera_formats",
     "hands",
     "overlay",
     "gestures",
@@ -12,6 +13,22 @@ __all__ = [
     "slides",
     "games",
     "launcher",
+    "pipeline",
+    "recording",
+    "extract",
+    "bench",
+    "metrics",
+    "tracking",
+    "input_dispatch",
+    "events",
+    "frames",
+    "multicam",
+    "streaming",
+    "motion",
+    "motion_gate",
+    "runtime",
+    "quality",
+    "idle",
 ]
 __version__ = "0.1.0"
 
@@ -1,136 +1,675 @@
 import argparse
+import copy
+import functools
+import queue
+import signal
+import sys
+import threading
 import time
 import cv2
 
+from . import events as _events
+from . import metrics as _metrics
 from .camera import Camera
-from .hands import HandDetector, landmarks_px
-from .overlay import draw_hands, draw_fps, draw_label
-from .gestures import count_fingers_up
+from .frames import FramePool
+from .hands import HandDetector
+from .overlay import draw_hands, draw_fps, draw_label, draw_stats
+from .pipeline import POLICIES, Pipeline
+from .runtime import MODES, ControlServer, ModeSwitcher, open_warm, parse_modes, process_start_time, release_launch
 
 
 def build_argparser():
     p = argparse.ArgumentParser(description="Real-time Hand Tracker (MediaPipe + OpenCV)")
     p.add_argument("--camera", type=int, default=0, help="Camera index (default: 0)")
+    p.add_argument(
+        "--sources",
+        type=str,
+        help="Comma-separated sources, one worker process each, shown tiled: camera indices, "
+        "video files, .htrk logs or synthetic[:WxH[@FPS]] (e.g. 0,1)",
+    )
     p.add_argument("--width", type=int, help="Capture width")
     p.add_argument("--height", type=int, help="Capture height")
+    p.add_argument("--fps", type=float, help="Minimum capture frame rate to negotiate")
+    p.add_argument(
+        "--no-camera-negotiate",
+        action="store_true",
+        help="Keep the backend's own pixel format, frame rate and buffering instead of probing the camera",
+    )
+    p.add_argument("--camera-cache", type=str, help="Camera format cache file (default ~/.cache/hand_tracker/)")
     p.add_argument("--max-hands", type=int, default=2)
     p.add_argument("--complexity", type=int, default=1, choices=[0, 1, 2])
     p.add_argument("--det", type=float, default=0.5, help="Min detection confidence")
     p.add_argument("--track", type=float, default=0.5, help="Min tracking confidence")
     p.add_argument("--flip", action="store_true", help="Mirror the camera frame")
+    p.add_argument("--roi", action="store_true", help="Run inference on a crop around the previous frame's hands")
+    p.add_argument("--roi-pad", type=float, default=0.3, help="ROI padding, as a fraction of the hand box size")
+    p.add_argument("--roi-size", type=int, default=256, help="Downscale ROI crops to at most this many pixels per side")
+    p.add_argument("--roi-refresh", type=int, default=30, help="Run a full-frame detection at least every N frames")
+    p.add_argument(
+        "--target-fps",
+        type=float,
+        help="Adapt inference quality (downscale, complexity, max hands) so detection fits 80%% of the frame interval",
+    )
+    p.add_argument("--latency-budget", type=float, help="Adapt inference quality to this detection budget in ms per frame")
+    p.add_argument(
+        "--motion-gate",
+        action="store_true",
+        help="Skip inference (reuse the last result) on frames that barely differ from the last inferred one",
+    )
+    p.add_argument("--gate-threshold", type=float, default=0.005, help="Changed-pixel fraction that counts as motion")
+    p.add_argument("--gate-pixel-delta", type=int, default=12, help="Gray-level change that counts a pixel as changed")
+    p.add_argument("--gate-max-stale", type=float, default=1.0, help="Never reuse a result for longer than this (s)")
+    p.add_argument(
+        "--idle-after",
+        type=float,
+        help="Idle (no inference, --idle-fps pacing) after this many seconds without a hand; wake on motion",
+    )
+    p.add_argument("--idle-fps", type=float, default=5.0, help="Frame rate while idle")
+    p.add_argument("--idle-threshold", type=float, default=0.01, help="Changed-pixel fraction that wakes from idle")
+    p.add_argument("--idle-probe", type=float, default=2.0, help="Probe for a hand this often while idle (s, 0: off)")
+    p.add_argument("--decimate", type=int, default=1, help="Run the detector every N frames, predict landmarks in between")
+    p.add_argument(
+        "--decimate-adaptive",
+        action="store_true",
+        help="With --decimate, also detect early when the predicted landmark error grows too large",
+    )
+    p.add_argument("--decimate-max-error", type=float, default=6.0, help="Adaptive decimation error budget in pixels")
+    p.add_argument(
+        "--no-frame-pool",
+        action="store_true",
+        help="Allocate new frames every iteration instead of reusing preallocated buffers",
+    )
     p.add_argument("--no-overlay", action="store_true", help="Disable drawing overlays")
+    p.add_argument(
+        "--threaded-capture",
+        action="store_true",
+        help="Read the camera on a background thread and always process the newest frame",
+    )
+    p.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run capture, detection, mode logic and display as concurrent pipeline stages",
+    )
+    p.add_argument("--queue-depth", type=int, default=2, help="Pipeline queue depth between stages")
+    p.add_argument(
+        "--queue-policy",
+        type=str,
+        default="drop",
+        choices=list(POLICIES),
+        help="When a pipeline queue is full: drop the oldest frame or block the producer",
+    )
+    # Headless service mode / events
+    p.add_argument(
+        "--headless",
+        action="store_true",
+        help="No window and no drawing; run the mode logic and write events (stops on SIGTERM)",
+    )
+    p.add_argument("--events", type=str, help="Write JSON-lines events to this file ('-' = stdout; default with --headless)")
+    p.add_argument("--events-landmarks", action="store_true", help="Also emit every frame's landmarks as an event")
+    # Network streaming
+    p.add_argument("--stream-udp", type=int, help="Stream hands/events to UDP subscribers on this port")
+    p.add_argument("--stream-ws", type=int, help="Stream hands/events to WebSocket clients on this port")
+    p.add_argument("--stream-host", type=str, default="127.0.0.1", help="Address the stream server binds to")
+    p.add_argument("--stream-to", type=str, help="Also send every UDP message to these HOST:PORT targets (comma-separated)")
+    p.add_argument("--stream-json", action="store_true", help="Send JSON instead of binary messages to --stream-to targets")
+    p.add_argument("--stream-origin", type=str,
+                   help="Browser origins allowed to open --stream-ws besides localhost (comma-separated, or '*')")
+    # Instrumentation
+    p.add_argument("--stats", action="store_true", help="Show per-stage timing stats on screen (toggle with 's')")
+    p.add_argument("--metrics-file", type=str, help="Periodically write Prometheus text metrics to this file")
+    p.add_argument("--metrics-interval", type=float, default=5.0, help="Seconds between metrics file rewrites")
+    p.add_argument("--metrics-json", type=str, help="Write a JSON metrics snapshot to this file on exit")
+    # Recording / replay
+    p.add_argument("--record", type=str, help="Record per-frame landmarks to this session log")
+    p.add_argument("--record-frames", action="store_true", help="Also store JPEG-compressed frames in the log")
+    p.add_argument("--replay", type=str, help="Replay a session log instead of using the camera and detector")
+    p.add_argument("--replay-fast", action="store_true", help="Replay as fast as possible instead of real time")
+    p.add_argument("--replay-loop", action="store_true", help="Restart the replay when the log ends")
     # Modes
     p.add_argument(
         "--mode",
-        type=str,
+        type=_mode_spec,
         default="default",
-        choices=["default", "vmouse", "slides", "rps", "reaction"],
-        help="Run mode: default draw, virtual mouse, slides control, rock-paper-scissors, or reaction test",
+        help=f"Run mode ({', '.join(MODES)}): default draw, virtual mouse, slides control, rock-paper-scissors, "
+        "or reaction test. A comma-separated list (e.g. vmouse,slides) runs several modes on one detector "
+        "(switch while running with keys 1-5)",
+    )
+    p.add_argument(
+        "--control-port",
+        type=int,
+        help="Accept mode switches from the launcher on this localhost TCP port (see hand_tracker.runtime)",
     )
+    p.add_argument("--launch-time", type=float, help="Wall-clock time the launch was requested (set by the launcher)")
     # Virtual mouse options
     p.add_argument("--vm-pinch", type=float, default=0.45, help="Pinch threshold (normed 0..1) to hold click")
-    p.add_argument("--vm-smooth", type=float, default=0.25, help="Pointer smoothing alpha (0..1)")
+    p.add_argument(
+        "--vm-smooth",
+        type=float,
+        help="Deprecated: old pointer smoothing alpha (0..1), mapped onto --vm-min-cutoff",
+    )
+    p.add_argument("--vm-min-cutoff", type=float, default=1.0, help="One-Euro min cutoff in Hz (lower = less jitter at rest)")
+    p.add_argument("--vm-beta", type=float, default=0.01, help="One-Euro speed coefficient (higher = less lag on fast moves)")
+    p.add_argument("--vm-dcutoff", type=float, default=1.0, help="One-Euro cutoff in Hz for the speed estimate")
+    p.add_argument("--vm-predict", type=float, default=1.0, help="Extrapolate the pointer by this many frame ages (0 = off)")
+    p.add_argument("--vm-max-predict", type=float, default=0.08, help="Cap on the prediction horizon in seconds")
+    p.add_argument("--vm-latency", type=float, help="Fixed latency to compensate in seconds (default: measured)")
     p.add_argument("--vm-scroll", action="store_true", help="Enable scroll from pinch distance change")
     p.add_argument("--vm-scroll-gain", type=float, default=60.0, help="Scroll sensitivity")
+    # OS input
+    p.add_argument(
+        "--input-backend",
+        type=str,
+        default="auto",
+        choices=["auto", "pyautogui", "pynput", "fake", "none"],
+        help="OS input backend for vmouse/slides (fake records events, none disables them)",
+    )
+    p.add_argument("--input-hz", type=float, default=60.0, help="Max cursor moves per second (display refresh rate)")
     # Slides options
     p.add_argument("--slides-vx", type=float, default=900.0, help="Swipe velocity threshold (px/s)")
     p.add_argument("--slides-dx", type=float, default=120.0, help="Swipe distance threshold (px)")
     p.add_argument("--slides-window", type=float, default=0.25, help="Swipe time window (s)")
     p.add_argument("--slides-cooldown", type=float, default=0.8, help="Cooldown between triggers (s)")
+    p.add_argument("--slides-anchor", type=int, default=0, help="Landmark whose motion is tracked (0 = wrist, 8 = index tip)")
+    p.add_argument(
+        "--slides-directions",
+        type=str,
+        default="left,right,up,down",
+        help="Comma-separated swipe directions that send arrow keys",
+    )
     return p
 
 
-def main(argv=None):
-    args = build_argparser().parse_args(argv)
+def _mode_spec(value: str) -> str:
+    try:
+        return ",".join(parse_modes(value))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
-    cam = Camera(args.camera, args.width, args.height)
-    detector = HandDetector(
-        max_num_hands=args.max_hands,
-        model_complexity=args.complexity,
-        detection_confidence=args.det,
-        tracking_confidence=args.track,
-    )
 
-    # Initialize mode controllers
-    vm = None
-    slides = None
-    game = None
+def _wants_overlay(args, mode) -> bool:
+    return not args.no_overlay and (mode is None or "overlay" in mode.features)
+
+
+def _build_mode(args):
+    """Return the controller for ``args.mode`` (anything with ``update(frame, results)``) or None."""
+    draw = not args.headless
+    if args.mode in ("vmouse", "slides"):
+        from .input_dispatch import InputDispatcher, make_backend
+        dispatcher = InputDispatcher(make_backend(args.input_backend), move_hz=args.input_hz)
     if args.mode == "vmouse":
-        from .virtual_mouse import VirtualMouse
-        vm = VirtualMouse(pinch_threshold=args.vm_pinch, smoothing=args.vm_smooth,
-                          enable_scroll=args.vm_scroll, scroll_gain=args.vm_scroll_gain)
+        from .virtual_mouse import VirtualMouse, smoothing_to_cutoff
+        if args.vm_smooth is not None:
+            args.vm_min_cutoff = smoothing_to_cutoff(args.vm_smooth)
+            print(f"--vm-smooth is deprecated; using --vm-min-cutoff {args.vm_min_cutoff:.2f}", file=sys.stderr)
+        return VirtualMouse(pinch_threshold=args.vm_pinch, enable_scroll=args.vm_scroll,
+                            scroll_gain=args.vm_scroll_gain, min_cutoff=args.vm_min_cutoff, beta=args.vm_beta,
+                            d_cutoff=args.vm_dcutoff, predict=args.vm_predict, max_predict=args.vm_max_predict,
+                            latency=args.vm_latency, dispatcher=dispatcher, draw=draw)
     elif args.mode == "slides":
         from .slides import SlideController
-        slides = SlideController(vx_thresh=args.slides_vx, dx_thresh=args.slides_dx,
-                                 window_sec=args.slides_window, cooldown_sec=args.slides_cooldown)
+        return SlideController(vx_thresh=args.slides_vx, dx_thresh=args.slides_dx,
+                               window_sec=args.slides_window, cooldown_sec=args.slides_cooldown,
+                               dispatcher=dispatcher, draw=draw, anchor=args.slides_anchor,
+                               directions=[d.strip() for d in args.slides_directions.split(",") if d.strip()])
     elif args.mode == "rps":
         from .games import RPSGame
-        game = RPSGame()
+        return RPSGame(draw=draw)
     elif args.mode == "reaction":
         from .games import ReactionGame
-        game = ReactionGame()
+        return ReactionGame(draw=draw)
+    return None
 
-    prev_t = time.time()
 
-    try:
-        while True:
+def _mode_factory(args):
+    """``build(name, options)`` for ``ModeSwitcher``: ``_build_mode`` on a copy of ``args``
+    with ``--mode name`` and the extra mode ``options`` applied."""
+    parser = build_argparser()
+
+    def build(name, options=()):
+        mode_args = copy.copy(args)
+        if options:
+            try:
+                parser.parse_known_args(list(options), namespace=mode_args)
+            except SystemExit:
+                print(f"Ignoring invalid mode options: {' '.join(options)}", file=sys.stderr)
+                mode_args = copy.copy(args)
+        mode_args.mode = name
+        return _build_mode(mode_args)
+
+    return build
+
+
+def _draw_overlay(frame, hands):
+    draw_hands(frame, hands, draw=True)
+    _, counts = hands.finger_states()
+    for i in range(len(hands)):
+        x, y = hands.px[i, 0]
+        draw_label(frame, f"{hands.label(i)}: {counts[i]}", (int(x), max(20, int(y) - 10)))
+
+
+class _HandEvents:
+    """Emits ``hands`` events: every frame with landmarks, else when a finger count or gesture changes."""
+
+    def __init__(self, landmarks: bool = False) -> None:
+        self.landmarks = landmarks
+        self._last = None
+
+    def __call__(self, hands) -> None:
+        log = _events.active()
+        if not log.enabled:
+            return
+        _, counts = hands.finger_states()
+        matches = hands.gestures()
+        names = [[name for name, _ in matches.matching(i)] for i in range(len(hands))]
+        key = tuple(zip(hands.handedness, counts.tolist(), map(tuple, names)))
+        if not self.landmarks and key == self._last:
+            return
+        self._last = key
+        out = []
+        for i in range(len(hands)):
+            hand = {"label": hands.label(i), "score": round(float(hands.scores[i]), 3), "fingers": int(counts[i]),
+                    "gestures": names[i]}
+            if self.landmarks:
+                hand["landmarks"] = hands.norm[i].round(4).tolist()
+            out.append(hand)
+        log.emit("hands", frame_t=round(hands.timestamp, 4), hands=out)
+
+
+def _show(args, frame, mode=None) -> bool:
+    """Display the frame and handle keys; returns False when the user asked to quit.
+
+    Keys 1-5 switch ``mode`` (a ``ModeSwitcher``) to the corresponding entry of ``MODES``.
+    """
+    cv2.imshow("Hand Tracker", frame)
+    key = cv2.waitKey(1) & 0xFF
+    if key in (27, ord("q")):
+        return False
+    elif key == ord("h"):
+        args.no_overlay = not args.no_overlay
+    elif key == ord("s"):
+        args.stats = not args.stats
+    elif mode is not None and ord("1") <= key < ord("1") + len(MODES):
+        mode.request(MODES[key - ord("1")])
+    return True
+
+
+def _finish_frame(args, cam, frame, fps, metrics, mode=None) -> bool:
+    """Draw FPS/stats, display the frame and record frame-level metrics."""
+    metrics.inc("frames")
+    metrics.set_gauge("fps", round(fps, 1))
+    metrics.set_gauge("camera_dropped", getattr(cam, "frames_dropped", 0))
+    if args.headless:
+        return True
+    draw_fps(frame, fps)
+    if args.stats:
+        draw_stats(frame, metrics.summary_lines())
+    with metrics.span("display"):
+        return _show(args, frame, mode)
+
+
+def _is_repeat(cam, last_id) -> bool:
+    """True when a threaded camera handed back the frame it returned last time."""
+    return last_id is not None and getattr(cam, "last_frame_id", None) == last_id
+
+
+def _run_sequential(args, cam, detector, mode, recorder=None, stop=None, stream=None):
+    metrics = _metrics.active()
+    hand_events = _HandEvents(args.events_landmarks)
+    # Frames are done with before the next read, so pooled buffers can be reused safely
+    pool = None if args.no_frame_pool else FramePool()
+    frames = 0
+    last_id = None
+    prev_t = time.time()
+    while not (stop is not None and stop.is_set()):
+        with metrics.span("capture"):
             ok, frame = cam.read()
-            if not ok:
-                # Warm-up retry: some backends return False on the first read
-                for _ in range(10):
-                    ok, frame = cam.read()
-                    if ok:
-                        break
+        if ok and _is_repeat(cam, last_id):
+            time.sleep(0.001)  # threaded capture has nothing newer yet; don't redo the same frame
+            continue
+        if not ok:
+            if getattr(cam, "finished", False):
+                break
+            # Warm-up retry: some backends return False on the first read
+            for _ in range(10):
+                ok, frame = cam.read()
+                if ok:
+                    break
+                if not args.headless:
                     cv2.waitKey(1)
-                    time.sleep(0.05)
-                if not ok:
-                    print("Failed to read from camera; retrying...")
-                    continue
-            if args.flip:
+                time.sleep(0.05)
+            if not ok:
+                print("Failed to read from camera; retrying...", file=sys.stderr)
+                continue
+        last_id = getattr(cam, "last_frame_id", None)
+        rgb = None
+        if args.flip and pool is not None:
+            # Mirrored RGB for MediaPipe straight from the camera frame, in one pass
+            with metrics.span("color"):
+                rgb = pool.to_rgb(frame, mirror=True)
+            with metrics.span("flip"):
+                frame = pool.flip(frame)
+        elif args.flip:
+            with metrics.span("flip"):
+                frame = cv2.flip(frame, 1)
+        hands = detector.detect(frame, cam.last_timestamp, rgb=rgb)
+        if recorder is not None:
+            recorder.write(hands, frame)
+
+        if _wants_overlay(args, mode):
+            with metrics.span("overlay"):
+                _draw_overlay(frame, hands)
+
+        # Mode-specific updates
+        if mode is not None:
+            with metrics.span("mode"):
+                mode.update(frame, hands)
+        hand_events(hands)
+        if stream is not None:
+            stream.publish(hands)
+
+        now = time.time()
+        fps = 1.0 / max(1e-6, now - prev_t)
+        prev_t = now
+        frames += 1
+        if not _finish_frame(args, cam, frame, fps, metrics, mode):
+            break
+    return frames
+
+
+def _run_pipelined(args, cam, detector, mode, recorder=None, stop=None, stream=None):
+    """Same per-frame work as ``_run_sequential``, split into concurrent stages.
+
+    capture -> detect -> mode logic/OS events run on worker threads; overlay and
+    display run here on the main thread, as the GUI backends require.
+    """
+    metrics = _metrics.active()
+    hand_events = _HandEvents(args.events_landmarks)
+    last_id = [None]
+
+    def capture():
+        with metrics.span("capture"):
+            ok, frame = cam.read()
+        if ok and _is_repeat(cam, last_id[0]):
+            time.sleep(0.001)
+            return None
+        if not ok:
+            time.sleep(0.01)
+            return None
+        last_id[0] = getattr(cam, "last_frame_id", None)
+        if args.flip:
+            with metrics.span("flip"):
                 frame = cv2.flip(frame, 1)
-            results = detector.process(frame)
+        return frame, cam.last_timestamp
+
+    def detect(item):
+        frame, ts = item
+        hands = detector.detect(frame, ts)
+        if recorder is not None:
+            recorder.write(hands, frame)
+        # Logic and overlay read the frame on different threads: compute what they need once, here
+        features = set(mode.features if mode is not None else ())
+        if _wants_overlay(args, mode):
+            features.add("overlay")
+        hands.prepare(features)
+        return frame, hands
+
+    def logic(item):
+        frame, hands = item
+        if mode is not None:
+            with metrics.span("mode"):
+                mode.update(frame, hands)
+        hand_events(hands)
+        if stream is not None:
+            stream.publish(hands)
+        return item
+
+    pipe = Pipeline(
+        ("capture", capture),
+        [("detect", detect), ("logic", logic)],
+        depth=args.queue_depth,
+        policy=args.queue_policy,
+    ).start()
 
+    frames = 0
+    prev_t = time.time()
+    try:
+        while not (stop is not None and stop.is_set()):
+            try:
+                frame, hands = pipe.get(timeout=0.1)
+            except queue.Empty:
+                drained = not any(q["size"] for q in pipe.occupancy().values())
+                if getattr(cam, "finished", False) and drained:
+                    break
+                if not args.headless and cv2.waitKey(1) & 0xFF in (27, ord("q")):
+                    break
+                continue
+            occ = pipe.occupancy()
+            for name, q in occ.items():
+                metrics.set_gauge(f"queue[{name}]", q["size"])
+            if _wants_overlay(args, mode):
+                with metrics.span("overlay"):
+                    _draw_overlay(frame, hands)
             if not args.no_overlay:
-                draw_hands(frame, results, draw=True)
-                if getattr(results, "multi_hand_landmarks", None):
-                    handedness_list = getattr(results, "multi_handedness", [])
-                    for hand_landmarks, handedness in zip(results.multi_hand_landmarks, handedness_list):
-                        label = (
-                            handedness.classification[0].label
-                            if handedness and getattr(handedness, "classification", None)
-                            else "Hand"
-                        )
-                        count, _ = count_fingers_up(frame, hand_landmarks, label)
-                        pts = landmarks_px(frame, hand_landmarks)
-                        if pts:
-                            x, y = pts[0]
-                            draw_label(frame, f"{label}: {count}", (x, max(20, y - 10)))
-
-
-            # Mode-specific updates
-            if args.mode == "vmouse" and vm is not None:
-                vm.update(frame, results)
-            elif args.mode == "slides" and slides is not None:
-                slides.update(frame, results)
-            elif args.mode in ("rps", "reaction") and game is not None:
-                game.update(frame, results)
+                text = "  ".join(f"{name} {q['size']}/{q['maxsize']}" for name, q in occ.items())
+                draw_label(frame, text, (10, 60))
 
             now = time.time()
             fps = 1.0 / max(1e-6, now - prev_t)
             prev_t = now
-            draw_fps(frame, fps)
-
-            cv2.imshow("Hand Tracker", frame)
-            key = cv2.waitKey(1) & 0xFF
-            if key in (27, ord("q")):
+            frames += 1
+            if not _finish_frame(args, cam, frame, fps, metrics, mode):
                 break
-            elif key == ord("h"):
-                args.no_overlay = not args.no_overlay
+    finally:
+        pipe.stop()
+        for name, q in pipe.occupancy().items():
+            print(f"Queue {name}: {q['total']} items, {q['dropped']} dropped", file=sys.stderr)
+    return frames
+
 
+def main(argv=None):
+    args = build_argparser().parse_args(argv)
+
+    metrics = _metrics.NULL
+    exporter = None
+    if args.stats or args.metrics_file or args.metrics_json:
+        metrics = _metrics.enable()
+        if args.metrics_file:
+            exporter = _metrics.PrometheusFileExporter(metrics, args.metrics_file, args.metrics_interval).start()
+
+    # Mode controller; the active mode can be switched in place (keys 1-5, control socket)
+    stop = threading.Event()
+    mode = ModeSwitcher(_mode_factory(args), args.mode, started_at=args.launch_time or process_start_time())
+    control = None
+    if args.control_port is not None:
+        # Claim the control port before opening the camera: a second runtime started while this one
+        # is still warming up exits here instead of competing for the camera
+        try:
+            control = ControlServer(mode, stop, port=args.control_port).start()
+        except OSError as e:
+            mode.close()
+            if args.launch_time is not None:
+                release_launch()  # the runtime that holds the port answers the launcher from now on
+            if exporter is not None:
+                exporter.stop()
+            raise SystemExit(f"Control port {args.control_port} unavailable ({e}); is a runtime already running?")
+        if args.launch_time is not None:
+            release_launch()  # commands reach this runtime now, even while it is warming up
+        print(f"Control: {control.address[0]}:{control.address[1]}", file=sys.stderr)
+
+    if args.replay:
+        from .recording import ReplaySource
+        # One object plays both roles; recorded frames/landmarks are already mirrored if needed
+        cam = detector = ReplaySource(args.replay, realtime=not args.replay_fast, loop=args.replay_loop)
+        args.flip = False
+    elif args.sources:
+        from .multicam import MultiCamera
+        # Capture, mirroring and detection run in the workers; this object plays both roles
+        cam = detector = MultiCamera(
+            [s.strip() for s in args.sources.split(",") if s.strip()],
+            args.width or 640,
+            args.height or 480,
+            flip=args.flip,
+            max_hands=args.max_hands,
+            complexity=args.complexity,
+            det=args.det,
+            track=args.track,
+            roi=args.roi,
+            reuse_buffers=not (args.no_frame_pool or args.pipeline),
+        )
+        args.flip = False
+    else:
+        shape = (args.height or 480, args.width or 640, 3)
+
+        def hand_detector(complexity=args.complexity, max_hands=args.max_hands):
+            return HandDetector(
+                max_num_hands=max_hands,
+                model_complexity=complexity,
+                detection_confidence=args.det,
+                tracking_confidence=args.track,
+                roi=args.roi,
+                roi_pad=args.roi_pad,
+                roi_size=args.roi_size,
+                roi_refresh=args.roi_refresh,
+            )
+
+        build_detector = hand_detector
+        budget_ms = args.latency_budget or (800.0 / args.target_fps if args.target_fps else None)
+        if budget_ms:
+            from .quality import QualityController, default_ladder
+            ladder = default_ladder(args.complexity, args.max_hands)
+            build_detector = functools.partial(QualityController, hand_detector, budget_ms, ladder, warm_shape=shape)
+
+        # The model loads and runs on a dummy frame while the camera opens
+        cam, detector, warmup = open_warm(
+            lambda: Camera(
+                args.camera,
+                args.width,
+                args.height,
+                threaded=args.threaded_capture,
+                reuse_buffers=not (args.no_frame_pool or args.pipeline),
+                fps=args.fps,
+                negotiate=not args.no_camera_negotiate,
+                format_cache=args.camera_cache,
+            ),
+            build_detector,
+            shape,
+        )
+        print(f"Camera opened in {warmup['camera_ms']:.0f} ms, detector warm in {warmup['detector_ms']:.0f} ms",
+              file=sys.stderr)
+        if getattr(cam, "format", None) is not None:
+            how = "cached" if cam.format.cached else "probed"
+            print(f"Camera format: {cam.format.format} ({how}, {cam.format.measured_fps:g} fps measured)",
+                  file=sys.stderr)
+    if args.motion_gate and not (args.replay or args.sources):
+        from .motion_gate import MotionGate
+        detector = MotionGate(
+            detector, threshold=args.gate_threshold, pixel_delta=args.gate_pixel_delta, max_stale=args.gate_max_stale
+        )
+    if args.idle_after is not None and not (args.replay or args.sources):
+        from .idle import IdleController
+        detector = IdleController(
+            detector,
+            idle_after=args.idle_after,
+            idle_fps=args.idle_fps,
+            threshold=args.idle_threshold,
+            probe_factory=lambda: HandDetector(
+                max_num_hands=1, model_complexity=0, detection_confidence=args.det, tracking_confidence=args.track
+            ),
+            probe_every=args.idle_probe,
+        )
+    if args.decimate > 1:
+        from .tracking import DecimatingDetector
+        detector = DecimatingDetector(
+            detector, every=args.decimate, adaptive=args.decimate_adaptive, max_error_px=args.decimate_max_error
+        )
+    recorder = None
+    if args.record:
+        from .recording import SessionRecorder
+        recorder = SessionRecorder(args.record, frames=args.record_frames)
+
+    if args.headless:
+        args.no_overlay = True
+    events_path = args.events or ("-" if args.headless else None)
+    sinks = [_events.EventLog.open(events_path)] if events_path else []
+    stream = None
+    if args.stream_udp is not None or args.stream_ws is not None or args.stream_to:
+        from .streaming import StreamServer
+        targets = []
+        for target in (args.stream_to or "").split(","):
+            if target.strip():
+                host, _, port = target.strip().rpartition(":")
+                targets.append((host or "127.0.0.1", int(port)))
+        stream = StreamServer(
+            args.stream_host,
+            udp_port=args.stream_udp,
+            ws_port=args.stream_ws,
+            udp_targets=targets,
+            udp_format="json" if args.stream_json else "binary",
+            ws_origins=[o.strip() for o in (args.stream_origin or "").split(",") if o.strip()],
+        ).start()
+        print(f"Streaming: udp {stream.udp_address}, ws {stream.ws_address}", file=sys.stderr)
+        sinks.append(stream)
+    if sinks:
+        _events.enable(sinks[0] if len(sinks) == 1 else _events.Tee(*sinks))
+
+    # Stop cleanly on SIGTERM (service managers) and, headless, on Ctrl+C
+    previous_handlers = {}
+    for sig in (signal.SIGTERM, signal.SIGINT) if args.headless else (signal.SIGTERM,):
+        previous_handlers[sig] = signal.signal(sig, lambda signum, _frame: stop.set())
+
+    source = args.replay or (f"sources:{args.sources}" if args.sources else f"camera:{args.camera}")
+    _events.active().emit("start", mode=args.mode, source=source, headless=args.headless)
+    cpu0, frames = time.process_time(), 0
+    try:
+        if args.pipeline:
+            frames = _run_pipelined(args, cam, detector, mode, recorder, stop, stream)
+        else:
+            frames = _run_sequential(args, cam, detector, mode, recorder, stop, stream)
     finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        if control is not None:
+            control.close()
+        cpu_ms = (time.process_time() - cpu0) * 1000.0
+        _events.active().emit(
+            "stop", mode=mode.name, frames=frames, cpu_ms_per_frame=round(cpu_ms / frames, 3) if frames else None
+        )
+        _events.active().close()
+        _events.disable()
+        if exporter is not None:
+            exporter.stop()
+        if args.metrics_json:
+            with open(args.metrics_json, "w", encoding="utf-8") as f:
+                f.write(metrics.to_json())
+        if recorder is not None:
+            recorder.close()
+        mode.close()
         detector.close()
         cam.release()
-        cv2.destroyAllWindows()
+        if args.sources and not args.replay:
+            rates = ", ".join(f"{s} {r:.1f} fps" for s, r in zip(cam.sources, cam.rates()))
+            print(f"Sources: {rates}; {cam.frames_dropped} results unused, {cam.torn_reads} torn reads", file=sys.stderr)
+        elif args.threaded_capture and not args.replay:
+            print(f"Camera: {cam.frames_captured} frames captured, {cam.frames_dropped} dropped", file=sys.stderr)
+        layers, inner = [], detector
+        while inner is not None and len(layers) < 8:
+            layers.append(inner)
+            inner = getattr(inner, "detector", None)
+        for layer in layers:
+            if hasattr(layer, "wake_latencies_ms"):
+                seconds = ", ".join(f"{s} {t:.0f} s" for s, t in layer.state_seconds().items())
+                worst = f", slowest wake {max(layer.wake_latencies_ms):.0f} ms" if layer.wake_latencies_ms else ""
+                print(f"Idle: {seconds}; {layer.wakes} wakes{worst}", file=sys.stderr)
+            elif hasattr(layer, "skip_ratio"):
+                print(f"Motion gate: {layer.skipped} of {layer.frames} frames reused ({layer.skip_ratio:.1%})",
+                      file=sys.stderr)
+            elif hasattr(layer, "decisions"):
+                print(f"Quality: {len(layer.decisions)} changes, final level {layer.level} ({layer.current})",
+                      file=sys.stderr)
+        if args.decimate > 1:
+            print(f"Detector: {detector.real_frames} detected, {detector.synth_frames} predicted frames", file=sys.stderr)
+        if not args.headless:
+            cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
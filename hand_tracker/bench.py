@@ -0,0 +1,418 @@
+"""
+End-to-end benchmark of the per-frame pipeline stages.
+
+``run`` times the same stages ``app.main`` executes (flip, BGR->RGB, ``HandDetector``
+inference at each model complexity, ``draw_hands`` (and the ``drawing_utils`` renderer it
+replaced, as ``draw_hands_mp``), ``draw_label``, finger counting and each mode's
+``update``) on synthetic frames, a video file, or a recorded session log, for one or more
+resolutions. Per-stage p50/p95/p99 latency and throughput go to a JSON file.
+
+``compare`` diffs two such files and exits non-zero when a stage got slower than the
+allowed threshold, so it can gate mediapipe/opencv upgrades in CI.
+
+``gate`` runs clips through the detector with and without a ``MotionGate`` in front of it
+and reports, per gate threshold, the share of frames skipped and the process CPU saved.
+Without clips it uses a generated static scene (sensor noise only) and a moving one.
+
+    python -m hand_tracker.bench run -o base.json --resolutions 640x480,1280x720
+    python -m hand_tracker.bench compare base.json new.json --threshold 0.15
+    python -m hand_tracker.bench gate static.mp4 moving.htrk --thresholds 0.002,0.005,0.02
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .hands import FrameHands
+
+# A relaxed open right hand in normalized image coords (wrist at the bottom)
+_TEMPLATE = np.array([
+    (0.50, 0.80), (0.44, 0.76), (0.40, 0.70), (0.37, 0.64), (0.34, 0.59),
+    (0.45, 0.58), (0.44, 0.49), (0.44, 0.43), (0.44, 0.38),
+    (0.50, 0.57), (0.50, 0.47), (0.50, 0.40), (0.50, 0.35),
+    (0.55, 0.58), (0.56, 0.49), (0.56, 0.43), (0.56, 0.38),
+    (0.60, 0.61), (0.62, 0.54), (0.63, 0.49), (0.64, 0.45),
+], dtype=np.float32)
+_FINGER_CHAINS = ((6, 7, 8), (10, 11, 12), (14, 15, 16), (18, 19, 20))
+
+
+def synthetic_hands(n_frames: int, width: int, height: int, fps: float = 30.0, seed: int = 0) -> List[FrameHands]:
+    """Plausible single-hand landmark sequence: the hand sweeps left/right and fingers curl."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n_frames):
+        t = i / fps
+        pts = _TEMPLATE.copy()
+        pts[:, 0] += 0.25 * np.sin(2 * np.pi * 0.5 * t)
+        pts[:, 1] += 0.05 * np.sin(2 * np.pi * 0.3 * t)
+        for f, chain in enumerate(_FINGER_CHAINS):
+            curl = 0.5 + 0.5 * np.sin(2 * np.pi * (0.4 + 0.1 * f) * t)
+            _, dip, tip = chain  # fold DIP and tip down past the PIP when curled
+            pts[dip, 1] += curl * 0.12
+            pts[tip, 1] += curl * 0.22
+        pts += rng.normal(0, 0.002, pts.shape).astype(np.float32)
+        norm = np.concatenate([pts, np.zeros((21, 1), np.float32)], axis=1)[None]
+        out.append(FrameHands(norm, ["Right"], [0.95], width, height, timestamp=t))
+    return out
+
+
+def synthetic_frames(n: int, width: int, height: int, seed: int = 0) -> List[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    frames = []
+    for i in range(n):
+        f = np.roll(base, i * 7, axis=1)
+        cx = int(width * (0.3 + 0.4 * i / max(1, n - 1)))
+        cv2.ellipse(f, (cx, height // 2), (width // 10, height // 5), 0, 0, 360, (140, 170, 220), -1)
+        frames.append(f)
+    return frames
+
+
+def gate_clips(n: int, width: int, height: int, seed: int = 0) -> Dict[str, List[np.ndarray]]:
+    """A ``static`` scene (fixed background plus sensor noise) and a ``moving`` one (the same
+    background with a hand-sized blob sweeping across it)."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    base = np.dstack([(xx * 255 // width), (yy * 255 // height), ((xx + yy) * 127 // (width + height))])
+    base = cv2.GaussianBlur(base.astype(np.uint8), (0, 0), 3)
+    static, moving = [], []
+    for i in range(n):
+        noise = rng.normal(0, 2.0, base.shape)
+        static.append(np.clip(base + noise, 0, 255).astype(np.uint8))
+        f = static[-1].copy()
+        cx = int(width * (0.2 + 0.6 * (0.5 + 0.5 * np.sin(2 * np.pi * i / 60))))
+        cv2.ellipse(f, (cx, height // 2), (width // 12, height // 6), 0, 0, 360, (140, 170, 220), -1)
+        moving.append(f)
+    return {"static": static, "moving": moving}
+
+
+def _load_clip(path: str, n: int) -> List[np.ndarray]:
+    frames: List[np.ndarray] = []
+    if path.endswith(".htrk"):
+        from .recording import ReplaySource
+
+        src = ReplaySource(path, realtime=False)
+        for i in range(min(n, len(src))):
+            f = src.get(i)[1]
+            if f is not None:
+                frames.append(f)
+        src.close()
+    else:
+        cap = cv2.VideoCapture(path)
+        while len(frames) < n:
+            ok, f = cap.read()
+            if not ok:
+                break
+            frames.append(f)
+        cap.release()
+    return frames
+
+
+def bench_gate(clips: Dict[str, List[np.ndarray]], thresholds: Sequence[float], complexity: int = 1,
+               max_hands: int = 2, fps: float = 30.0, detector_factory: Optional[Callable] = None) -> Dict:
+    """Per clip: CPU ms per frame with the detector on every frame, then per gate threshold the
+    skip ratio, CPU ms per frame and CPU saved (process time, so MediaPipe's threads count)."""
+    from .motion_gate import MotionGate
+
+    if detector_factory is None:
+        from .hands import HandDetector
+
+        def detector_factory():
+            return HandDetector(max_num_hands=max_hands, model_complexity=complexity)
+
+    def cpu_per_frame(detector, frames) -> float:
+        detector.detect(frames[0], 1e-3)  # load outside the measurement
+        t0 = time.process_time()
+        for i, frame in enumerate(frames):
+            detector.detect(frame, 1.0 + i / fps)
+        ms = (time.process_time() - t0) * 1000.0 / len(frames)
+        detector.close()
+        return ms
+
+    report: Dict = {}
+    for name, frames in clips.items():
+        base = cpu_per_frame(detector_factory(), frames)
+        entry = {"frames": len(frames), "cpu_ms_per_frame": round(base, 3), "gate": {}}
+        for thr in thresholds:
+            gate = MotionGate(detector_factory(), threshold=thr)
+            ms = cpu_per_frame(gate, frames)
+            entry["gate"][f"{thr:g}"] = {
+                "skip_ratio": round(gate.skipped / max(1, gate.frames - 1), 3),
+                "cpu_ms_per_frame": round(ms, 3),
+                "cpu_saved": round(1.0 - ms / base, 3) if base > 0 else None,
+            }
+        report[name] = entry
+    return report
+
+
+def _load_inputs(args, width: int, height: int) -> Tuple[List[np.ndarray], List[FrameHands]]:
+    n = args.frames
+    frames: List[np.ndarray] = []
+    hands: List[FrameHands] = []
+    if args.replay:
+        from .recording import ReplaySource
+
+        src = ReplaySource(args.replay, realtime=False)
+        for i in range(min(n, len(src))):
+            h, f = src.get(i)
+            hands.append(h)
+            if f is not None:
+                frames.append(f)
+        src.close()
+    if args.video and not frames:
+        cap = cv2.VideoCapture(args.video)
+        while len(frames) < n:
+            ok, f = cap.read()
+            if not ok:
+                break
+            frames.append(f)
+        cap.release()
+    if not frames:
+        frames = synthetic_frames(min(n, 16), width, height)
+    frames = [f if f.shape[:2] == (height, width) else cv2.resize(f, (width, height)) for f in frames]
+    if not hands:
+        hands = synthetic_hands(n, width, height)
+    else:
+        hands = [FrameHands(h.norm, h.handedness, h.scores, width, height, h.timestamp) for h in hands]
+    return frames, hands
+
+
+def _summarize(samples_ns: Sequence[int]) -> Dict[str, float]:
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    mean = float(ms.mean())
+    return {
+        "n": int(ms.size),
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "fps": round(1000.0 / mean, 2) if mean > 0 else None,
+    }
+
+
+def _mode_stages() -> List[Tuple[str, object]]:
+    from .games import ReactionGame, RPSGame
+    from .input_dispatch import InputDispatcher
+    from .slides import SlideController
+    from .virtual_mouse import VirtualMouse
+
+    # A backend-less dispatcher: never move the real cursor while benchmarking
+    vm = VirtualMouse(screen_size=(1920, 1080), dispatcher=InputDispatcher(None))
+    slides = SlideController(dispatcher=InputDispatcher(None))
+    return [("mode_vmouse", vm), ("mode_slides", slides), ("mode_rps", RPSGame()), ("mode_reaction", ReactionGame())]
+
+
+def bench_resolution(args, width: int, height: int) -> Dict[str, Dict[str, float]]:
+    """Time every stage on ``args.frames`` frames at one resolution."""
+    from .gestures import REGISTRY, count_fingers_up, finger_states_batch
+    from .overlay import draw_hands, draw_hands_mp, draw_label
+
+    frames, hands_seq = _load_inputs(args, width, height)
+    detectors = {}
+    if not args.no_detector:
+        from .hands import HandDetector
+
+        for c in args.complexities:
+            detectors[c] = HandDetector(max_num_hands=args.max_hands, model_complexity=c)
+    modes = _mode_stages()
+
+    samples: Dict[str, List[int]] = {}
+
+    def timed(name: str, fn: Callable, *a):
+        t0 = time.perf_counter_ns()
+        out = fn(*a)
+        samples.setdefault(name, []).append(time.perf_counter_ns() - t0)
+        return out
+
+    total = args.warmup + args.frames
+    try:
+        for i in range(total):
+            if i == args.warmup:
+                samples.clear()
+            frame = frames[i % len(frames)].copy()
+            src = hands_seq[i % len(hands_seq)]
+
+            def fresh() -> FrameHands:
+                # FrameHands caches its derived features: each stage starts from a clean copy
+                return FrameHands(src.norm, src.handedness, src.scores, width, height, src.timestamp)
+
+            frame = timed("flip", cv2.flip, frame, 1)
+            rgb = timed("bgr2rgb", cv2.cvtColor, frame, cv2.COLOR_BGR2RGB)
+            for c, det in detectors.items():
+                results = timed(f"detect_c{c}", det.hands.process, rgb)
+                timed("to_arrays", FrameHands.from_results, results, width, height)
+            timed("draw_hands_mp", draw_hands_mp, frame.copy(), fresh())
+            timed("draw_hands", draw_hands, frame, fresh())
+            timed("draw_label", draw_label, frame, f"Right: {i % 6}", (10, height - 10))
+            hands = fresh()
+            hl = hands.multi_hand_landmarks or []
+            timed("count_fingers_up", lambda: [count_fingers_up(frame, h, hands.label(j)) for j, h in enumerate(hl)])
+            hands = fresh()
+            timed("finger_states_batch", finger_states_batch, hands.px, hands.handedness)
+            timed("gesture_registry", REGISTRY.evaluate, fresh())
+            for name, mode in modes:
+                timed(name, mode.update, frame, fresh())
+    finally:
+        for det in detectors.values():
+            det.close()
+    return {name: _summarize(s) for name, s in samples.items()}
+
+
+def _environment() -> Dict[str, str]:
+    env = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+    }
+    try:
+        import mediapipe as mp
+
+        env["mediapipe"] = getattr(mp, "__version__", "unknown")
+    except Exception:
+        env["mediapipe"] = "unavailable"
+    return env
+
+
+def run(args) -> Dict:
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "source": args.replay or args.video or "synthetic",
+            "env": _environment(),
+        },
+        "results": {},
+    }
+    for width, height in args.resolutions:
+        key = f"{width}x{height}"
+        print(f"Benchmarking {key} ...", file=sys.stderr)
+        report["results"][key] = bench_resolution(args, width, height)
+    return report
+
+
+def compare(base: Dict, new: Dict, metric: str = "p95_ms", threshold: float = 0.10,
+            min_delta_ms: float = 0.05) -> Tuple[List[Dict], List[Dict]]:
+    """Return ``(rows, regressions)`` comparing ``metric`` stage by stage.
+
+    A stage regresses when it is slower by more than ``threshold`` (relative) and by more
+    than ``min_delta_ms`` (absolute, to ignore noise on sub-microsecond stages).
+    """
+    rows, regressions = [], []
+    for res, stages in new.get("results", {}).items():
+        for stage, stats in stages.items():
+            old = base.get("results", {}).get(res, {}).get(stage)
+            if not old or old.get(metric) is None or stats.get(metric) is None:
+                continue
+            a, b = float(old[metric]), float(stats[metric])
+            change = (b - a) / a if a > 0 else 0.0
+            row = {"resolution": res, "stage": stage, "base": a, "new": b, "change": change}
+            rows.append(row)
+            if change > threshold and (b - a) > min_delta_ms:
+                regressions.append(row)
+    return rows, regressions
+
+
+def _parse_resolutions(text: str) -> List[Tuple[int, int]]:
+    out = []
+    for part in text.split(","):
+        w, h = part.lower().split("x")
+        out.append((int(w), int(h)))
+    return out
+
+
+def build_argparser():
+    p = argparse.ArgumentParser(description="Hand Tracker pipeline benchmark")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="Run the benchmark and write a JSON report")
+    r.add_argument("-o", "--out", default="bench.json", help="Output JSON path")
+    r.add_argument("--resolutions", type=_parse_resolutions, default=_parse_resolutions("640x480,1280x720"),
+                   help="Comma separated WxH list (default: 640x480,1280x720)")
+    r.add_argument("--frames", type=int, default=200, help="Measured frames per resolution")
+    r.add_argument("--warmup", type=int, default=10, help="Unmeasured warm-up frames")
+    r.add_argument("--complexities", type=lambda s: [int(c) for c in s.split(",")], default=[0, 1, 2],
+                   help="Model complexities to benchmark (default: 0,1,2)")
+    r.add_argument("--max-hands", type=int, default=2)
+    r.add_argument("--no-detector", action="store_true", help="Skip MediaPipe inference stages")
+    r.add_argument("--video", type=str, help="Use frames from this video instead of synthetic ones")
+    r.add_argument("--replay", type=str, help="Use landmarks (and frames, if stored) from a session log")
+
+    g = sub.add_parser("gate", help="Measure the CPU a motion gate saves on static and moving clips")
+    g.add_argument("clips", nargs="*", help="Video files or .htrk logs with frames (default: generated clips)")
+    g.add_argument("--thresholds", type=lambda s: [float(t) for t in s.split(",")], default=[0.002, 0.005, 0.02],
+                   help="Changed-pixel fractions to try (default: 0.002,0.005,0.02)")
+    g.add_argument("--frames", type=int, default=150, help="Frames per clip")
+    g.add_argument("--resolution", type=_parse_resolutions, default=_parse_resolutions("640x480"),
+                   help="Size of the generated clips (default: 640x480)")
+    g.add_argument("--complexity", type=int, default=1, choices=[0, 1, 2])
+    g.add_argument("-o", "--out", help="Also write the report to this JSON file")
+
+    c = sub.add_parser("compare", help="Compare two reports and flag regressions")
+    c.add_argument("base")
+    c.add_argument("new")
+    c.add_argument("--metric", default="p95_ms", choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+    c.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown (default: 0.10)")
+    c.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore absolute changes below this")
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_argparser().parse_args(argv)
+    if args.cmd == "run":
+        report = run(args)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        for res, stages in report["results"].items():
+            print(f"== {res}")
+            for stage, s in stages.items():
+                print(f"  {stage:<22} p50 {s['p50_ms']:8.3f} ms  p95 {s['p95_ms']:8.3f} ms  "
+                      f"p99 {s['p99_ms']:8.3f} ms  {s['fps'] or 0:9.1f}/s")
+        print(f"Wrote {args.out}")
+        return 0
+    if args.cmd == "gate":
+        width, height = args.resolution[0]
+        if args.clips:
+            clips = {path: _load_clip(path, args.frames) for path in args.clips}
+            clips = {path: frames for path, frames in clips.items() if frames}
+        else:
+            clips = gate_clips(args.frames, width, height)
+        report = bench_gate(clips, args.thresholds, args.complexity)
+        for name, entry in report.items():
+            print(f"== {name}: {entry['frames']} frames, {entry['cpu_ms_per_frame']:.2f} CPU ms/frame ungated")
+            for thr, g in entry["gate"].items():
+                print(f"  threshold {thr:<8} skipped {g['skip_ratio']:6.1%}  {g['cpu_ms_per_frame']:7.2f} CPU ms/frame"
+                      f"  saved {g['cpu_saved'] or 0:6.1%}")
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows, regressions = compare(base, new, args.metric, args.threshold, args.min_delta_ms)
+    for r in rows:
+        flag = "REGRESSION" if r in regressions else ""
+        print(f"{r['resolution']:>10} {r['stage']:<22} {r['base']:9.3f} -> {r['new']:9.3f} ms "
+              f"({r['change']:+.1%}) {flag}")
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed by more than {args.threshold:.0%} on {args.metric}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,55 @@
 import sys
-from typing import Optional
+import threading
+import time
+from collections import deque
+from typing import Deque, NamedTuple, Optional
 import cv2
 
+from .frames import FramePool
+
+
+class CapturedFrame(NamedTuple):
+    """A frame grabbed from the device, stamped at capture time."""
+
+    ok: bool
+    frame: Optional[object]
+    timestamp: float  # time.time() when the read returned
+    frame_id: int  # monotonically increasing per Camera, starting at 1
+
 
 class Camera:
     """Simple wrapper around cv2.VideoCapture.
 
     Uses AVFoundation by default on macOS for better compatibility.
+
+    With ``threaded=True`` a background thread keeps reading from the device and
+    stores only the newest frames in a small ring, so ``read()`` never waits on the
+    driver and stale frames are dropped instead of queueing up behind inference. A read
+    that finds no new frame returns the previous one again; compare ``last_frame_id``.
+
+    With ``reuse_buffers=True`` (synchronous mode only) frames are read into a pair of
+    preallocated buffers via ``VideoCapture.read(image=...)``: the frame returned by
+    ``read()`` stays valid until the next-but-one read.
+
+    With ``negotiate=True`` the pixel format, size and frame rate are chosen by
+    ``camera_formats.negotiate`` (minimal driver buffering, verified frame rate), and the
+    outcome is cached in ``format_cache`` (a path; default ``camera_formats.DEFAULT_CACHE``).
+    The result is in ``self.format`` (None when not negotiated).
     """
 
-    def __init__(self, index: int = 0, width: Optional[int] = None, height: Optional[int] = None, prefer_avfoundation: bool = True):
+    def __init__(
+        self,
+        index: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        prefer_avfoundation: bool = True,
+        threaded: bool = False,
+        ring_size: int = 2,
+        reuse_buffers: bool = False,
+        fps: Optional[float] = None,
+        negotiate: bool = False,
+        format_cache: Optional[str] = None,
+    ):
         self.index = index
 
         # Prefer AVFoundation on macOS, fall back to default backend if it fails
@@ -25,24 +65,124 @@ class Camera:
             cap = cv2.VideoCapture(index)
 
         self.cap = cap
-
-        if width is not None:
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        if height is not None:
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.format = None
 
         if not self.cap.isOpened():
             raise RuntimeError(
                 f"Could not open camera {index}. If on macOS, ensure 'Python' has Camera access in System Settings → Privacy & Security → Camera, close other apps using the camera, or try a different index with --camera 1."
             )
 
+        if negotiate:
+            from . import camera_formats
+
+            cache = camera_formats.FormatCache(format_cache or camera_formats.DEFAULT_CACHE)
+            key = camera_formats.device_key(index, self._backend_name())
+            self.format = camera_formats.negotiate(self.cap, key, width, height, fps, cache)
+        else:
+            if width is not None:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            if height is not None:
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps is not None:
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+        # Capture bookkeeping (shared by the synchronous and threaded paths)
+        self.threaded = bool(threaded)
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self._last = CapturedFrame(False, None, 0.0, 0)
+        self._last_returned_id = 0
+        # The capture thread would recycle buffers regardless of the consumer, so only sync mode reuses them
+        self._pool = FramePool(count=2) if reuse_buffers and not self.threaded else None
+        self._frame_shape = None
+
+        self._ring: Deque[CapturedFrame] = deque(maxlen=max(1, int(ring_size)))
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._capture_loop, name=f"camera-{index}", daemon=True)
+            self._thread.start()
+
+    def _backend_name(self) -> str:
+        try:
+            return self.cap.getBackendName()
+        except Exception:
+            return ""
+
+    def _grab(self) -> CapturedFrame:
+        if self._pool is not None and self._frame_shape is not None:
+            ok, frame = self.cap.read(image=self._pool.buffer("capture", self._frame_shape))
+        else:
+            ok, frame = self.cap.read()
+        if not ok:
+            return CapturedFrame(False, None, time.time(), self._last.frame_id)
+        if self._pool is not None:
+            self._frame_shape = frame.shape
+        self.frames_captured += 1
+        return CapturedFrame(True, frame, time.time(), self.frames_captured)
+
+    def _capture_loop(self) -> None:
+        while not self._stop.is_set():
+            item = self._grab()
+            if not item.ok:
+                time.sleep(0.005)
+                continue
+            with self._cond:
+                if len(self._ring) == self._ring.maxlen:
+                    # Oldest frame is about to be evicted without ever being read
+                    if self._ring[0].frame_id > self._last_returned_id:
+                        self.frames_dropped += 1
+                self._ring.append(item)
+                self._cond.notify_all()
+
+    def read_stamped(self, timeout: Optional[float] = None) -> CapturedFrame:
+        """Return the newest frame with its capture timestamp and frame id.
+
+        In threaded mode this never waits by default: it returns the newest captured
+        frame straight away, which is the previous one again (same ``frame_id``) when the
+        loop outpaces the camera, and ``ok=False`` only before the first frame arrives.
+        Pass ``timeout`` > 0 to wait up to that long for a frame not yet returned instead.
+        Frames that were superseded before being read are counted in ``frames_dropped``.
+        """
+        if not self.threaded:
+            self._last = self._grab()
+            return self._last
+        with self._cond:
+            if timeout and (not self._ring or self._ring[-1].frame_id <= self._last_returned_id):
+                self._cond.wait_for(
+                    lambda: bool(self._ring) and self._ring[-1].frame_id > self._last_returned_id,
+                    timeout=timeout,
+                )
+            if not self._ring:
+                return CapturedFrame(False, None, time.time(), self._last_returned_id)
+            item = self._ring[-1]
+            skipped = sum(1 for f in self._ring if self._last_returned_id < f.frame_id < item.frame_id)
+            self.frames_dropped += skipped
+            self._last_returned_id = item.frame_id
+            self._last = item
+            return item
+
     def read(self):
         """Return (ok, frame)."""
-        return self.cap.read()
+        item = self.read_stamped()
+        return item.ok, item.frame
+
+    @property
+    def last_timestamp(self) -> float:
+        """Capture timestamp of the frame returned by the last read."""
+        return self._last.timestamp
+
+    @property
+    def last_frame_id(self) -> int:
+        return self._last.frame_id
 
     def release(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
         try:
             self.cap.release()
         except Exception:
             pass
-
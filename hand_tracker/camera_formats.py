@@ -0,0 +1,223 @@
+"""
+Capture format negotiation for ``Camera``.
+
+Left alone, a backend picks its own pixel format, frame rate and buffer depth: on Linux V4L2
+that is often uncompressed YUYV, capped at a low frame rate for HD sizes, with several frames
+queued in the driver. ``negotiate``:
+
+1. sets ``CAP_PROP_BUFFERSIZE`` to 1 so reads return the newest frame;
+2. probes FOURCC x resolution x FPS combinations and keeps what the device actually reports
+   back after each ``set`` (``probe``);
+3. ranks them (``rank``): the smallest resolution covering the request, then the highest
+   frame rate (shortest frame interval), then uncompressed over MJPG at equal rate (no decode);
+4. applies the best one and measures the frame rate really delivered. When it falls short
+   of what the device claimed, the next candidates that could still do better are measured
+   too, and the fastest measured one wins;
+5. stores the outcome per device and request in a JSON file (``FormatCache``), so later
+   startups apply it directly.
+
+Everything goes through the ``VideoCapture`` methods ``set``/``get``/``read``, so a fake
+capture object can stand in for a device in tests.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import cv2
+
+FOURCCS = ("MJPG", "YUYV")
+SIZES = ((320, 240), (640, 480), (800, 600), (960, 540), (1280, 720), (1920, 1080))
+RATES = (60, 30)
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "hand_tracker", "camera_formats.json")
+
+
+class CaptureFormat(NamedTuple):
+    fourcc: str
+    width: int
+    height: int
+    fps: float  # as reported by the backend; 0 when it doesn't say
+
+    def __str__(self) -> str:
+        return f"{self.fourcc or '?'} {self.width}x{self.height}@{self.fps:g}"
+
+
+class Negotiated(NamedTuple):
+    format: CaptureFormat
+    measured_fps: float
+    cached: bool  # applied from the cache without probing
+
+
+def fourcc_name(code: float) -> str:
+    """Four-character name of a ``CAP_PROP_FOURCC`` value ('' when the backend reports none)."""
+    code = int(code)
+    name = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return name if code and name.isprintable() else ""
+
+
+def current_format(cap) -> CaptureFormat:
+    return CaptureFormat(
+        fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)),
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        round(float(cap.get(cv2.CAP_PROP_FPS)), 2),
+    )
+
+
+def apply_format(cap, fmt: CaptureFormat) -> CaptureFormat:
+    """Request ``fmt`` (FOURCC first: V4L2 picks sizes and rates per pixel format) and return
+    what the device reports back."""
+    if fmt.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fmt.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, fmt.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, fmt.height)
+    if fmt.fps:
+        cap.set(cv2.CAP_PROP_FPS, fmt.fps)
+    return current_format(cap)
+
+
+def probe(
+    cap,
+    fourccs: Sequence[str] = FOURCCS,
+    sizes: Iterable[Tuple[int, int]] = SIZES,
+    rates: Sequence[float] = RATES,
+) -> List[CaptureFormat]:
+    """Every distinct format the device settled on while being asked for each combination."""
+    found: Dict[CaptureFormat, None] = {}
+    for fourcc in fourccs:
+        for w, h in sizes:
+            for fps in rates:
+                actual = apply_format(cap, CaptureFormat(fourcc, w, h, fps))
+                if actual.width > 0 and actual.height > 0:
+                    found[actual] = None
+    return list(found)
+
+
+def rank(
+    formats: Iterable[CaptureFormat], width: int, height: int, fps: Optional[float] = None
+) -> List[CaptureFormat]:
+    """``formats`` ordered from lowest to highest expected latency for a ``width`` x ``height``
+    (and at least ``fps``) request; formats that don't cover the request come last."""
+
+    def key(f: CaptureFormat):
+        covers = f.width >= width and f.height >= height
+        fast_enough = not fps or f.fps >= fps
+        return (
+            not covers,
+            not fast_enough,
+            abs(f.width * f.height - width * height),
+            -f.fps,
+            f.fourcc == "MJPG",  # same rate: skip the JPEG decode
+        )
+
+    return sorted(formats, key=key)
+
+
+def measure_fps(cap, frames: int = 20, warmup: int = 3, timeout: float = 3.0) -> float:
+    """Frame rate actually delivered by ``cap.read()`` over ``frames`` frames (after ``warmup``)."""
+    for _ in range(warmup):
+        cap.read()
+    t0 = time.perf_counter()
+    got = 0
+    while got < frames and time.perf_counter() - t0 < timeout:
+        ok, _ = cap.read()
+        got += bool(ok)
+    elapsed = time.perf_counter() - t0
+    return got / elapsed if got and elapsed > 0 else 0.0
+
+
+def device_key(index, backend: str = "") -> str:
+    """Cache key for a capture device: backend, index and, on Linux, the V4L2 device name."""
+    name = ""
+    try:
+        with open(f"/sys/class/video4linux/video{int(index)}/name", encoding="utf-8") as f:
+            name = f.read().strip()
+    except (OSError, ValueError):
+        pass
+    return ":".join(str(p) for p in (backend or "default", index, name))
+
+
+class FormatCache:
+    """Negotiation results per device and request, kept in a small JSON file."""
+
+    def __init__(self, path: str = DEFAULT_CACHE) -> None:
+        self.path = path
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._load().get(key)
+
+    def put(self, key: str, record: Dict) -> None:
+        data = self._load()
+        data[key] = record
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not write camera format cache {self.path}: {e}", file=sys.stderr)
+
+
+def negotiate(
+    cap,
+    key: str,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    fps: Optional[float] = None,
+    cache: Optional[FormatCache] = None,
+    verify_frames: int = 20,
+    tolerance: float = 0.8,
+    max_tries: int = 3,
+) -> Optional[Negotiated]:
+    """Configure ``cap`` for the lowest-latency format meeting the request (see module doc).
+
+    ``width``/``height`` default to the device's current size. Returns None when the backend
+    doesn't report formats back (nothing to choose from; the request is applied as-is).
+    """
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    start = current_format(cap)
+    width, height = width or start.width, height or start.height
+    request = f"{width}x{height}@{fps or 'any'}"
+    cache_key = f"{key}|{request}"
+
+    record = cache.get(cache_key) if cache is not None else None
+    if record is not None:
+        fmt = CaptureFormat(*record["format"])
+        if apply_format(cap, fmt)[:3] == fmt[:3]:
+            return Negotiated(fmt, float(record["measured_fps"]), True)
+
+    candidates = rank(probe(cap, sizes=sorted(set(SIZES) | {(width, height)})), width, height, fps)
+    if not candidates:
+        apply_format(cap, CaptureFormat("", width, height, fps or 0))
+        return None
+    # A smaller frame than requested is only an option when no format covers the request
+    covering = [f for f in candidates if f.width >= width and f.height >= height] or candidates
+    best: Optional[Negotiated] = None
+    tries = 0
+    for fmt in covering:
+        if best is not None and (tries >= max_tries or (fmt.fps and fmt.fps <= best.measured_fps)):
+            continue  # can't deliver more than it claims
+        tries += 1
+        actual = apply_format(cap, fmt)
+        measured = measure_fps(cap, verify_frames)
+        if best is None or measured > 1.05 * best.measured_fps:  # earlier rank wins near-ties
+            best = Negotiated(actual, round(measured, 2), False)
+        if not actual.fps or measured >= tolerance * actual.fps:
+            break
+    if best.format != current_format(cap):
+        apply_format(cap, best.format)
+    if cache is not None:
+        record = {"format": list(best.format), "measured_fps": best.measured_fps, "t": round(time.time())}
+        cache.put(cache_key, record)
+    return best
@@ -0,0 +1,98 @@
+"""
+Structured gesture events as JSON lines.
+
+Modes report what they did (clicks, swipes, game results, ...) with
+``events.active().emit("swipe", direction="left")``; each call becomes one JSON object per
+line with a wall-clock ``t`` and a ``type`` field. Like ``metrics``, logging is off by
+default: ``active()`` returns ``NULL`` until ``enable()`` installs a sink: an ``EventLog``,
+a ``streaming.StreamServer``, or a ``Tee`` of several.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from typing import IO
+
+
+class EventLog:
+    """Writes one JSON object per line to ``stream`` (flushed per event, safe across threads)."""
+
+    enabled = True
+
+    def __init__(self, stream: IO[str], close_stream: bool = False) -> None:
+        self.stream = stream
+        self.count = 0
+        self._close_stream = close_stream
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> "EventLog":
+        """``-`` means stdout; anything else is appended to as a file."""
+        if path == "-":
+            return cls(sys.stdout)
+        return cls(open(path, "a", encoding="utf-8"), close_stream=True)
+
+    def emit(self, type: str, **fields) -> None:
+        line = json.dumps({"t": round(time.time(), 4), "type": type, **fields}, separators=(",", ":"))
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._close_stream:
+                self.stream.close()
+            else:
+                self.stream.flush()
+
+
+class NullEvents:
+    """Disabled log: ``emit`` is a no-op."""
+
+    enabled = False
+
+    def emit(self, type: str, **fields) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class Tee:
+    """Forwards every event to several sinks (e.g. a log file and a network stream)."""
+
+    enabled = True
+
+    def __init__(self, *sinks) -> None:
+        self.sinks = sinks
+
+    def emit(self, type: str, **fields) -> None:
+        for sink in self.sinks:
+            sink.emit(type, **fields)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+NULL = NullEvents()
+_active = NULL
+
+
+def active():
+    """The process-wide event log (``NULL`` unless ``enable()`` was called)."""
+    return _active
+
+
+def enable(log=None):
+    global _active
+    _active = log if log is not None else EventLog(sys.stdout)
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = NULL
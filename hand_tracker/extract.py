@@ -0,0 +1,325 @@
+"""
+Offline batch extraction: video files / image folders -> chunked columnar landmark dataset.
+
+Work is split into fixed-size frame chunks and spread over a pool of worker processes,
+each owning its own ``HandDetector``. Every chunk is written atomically as one ``.npz``
+file, so an interrupted job can be rerun and only missing chunks are processed.
+
+Output layout::
+
+    OUT/manifest.json
+    OUT/<source-key>/chunk_000000.npz ...
+
+Each chunk holds, for F frames and H detected hands in total:
+
+- ``frame_index`` (F,) int64: frame number within the source (images: sorted position)
+- ``image_size`` (F, 2) int32: (width, height) of each frame
+- ``hand_offsets`` (F + 1,) int64: hands of frame i are rows ``hand_offsets[i]:hand_offsets[i+1]``
+- ``landmarks`` (H, 21, 3) float32 normalized coords, ``scores`` (H,) float32
+- ``handedness`` (H,) int8: 0 = Left, 1 = Right, -1 = unknown
+- ``finger_states`` (H, 5) bool ordered as ``gestures.FINGERS``
+- ``frame_range`` (2,) int64: the planned ``[start, stop)`` frames; a rerun only skips a
+  chunk file whose range matches the current plan (e.g. after a ``--chunk-size`` change)
+- ``source_fingerprint`` () str: digest of the chunk's input files (name, size, mtime); a
+  chunk whose images were added, removed or replaced, or whose video changed, is redone
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+HANDEDNESS_CODES = {"left": 0, "right": 1}
+
+# Per-process detector state, created by the pool initializer
+_worker_opts: Dict = {}
+_image_detector = None
+
+
+def _source_key(path: str) -> str:
+    base = os.path.splitext(os.path.basename(os.path.normpath(path)))[0] or "source"
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return f"{base}-{digest}"
+
+
+def _list_images(folder: str) -> List[str]:
+    names = sorted(n for n in os.listdir(folder) if n.lower().endswith(IMAGE_EXTS))
+    return [os.path.join(folder, n) for n in names]
+
+
+def _video_frame_count(path: str) -> int:
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video {path}")
+        n = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        if n <= 0:  # some containers don't report a count; decode once to find out
+            while cap.grab():
+                n += 1
+        return n
+    finally:
+        cap.release()
+
+
+def _fingerprint(files: Sequence[str]) -> str:
+    digest = hashlib.sha1()
+    for f in files:
+        st = os.stat(f)
+        digest.update(f"{os.path.basename(f)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def plan_chunks(sources: Sequence[str], chunk_size: int) -> List[Dict]:
+    """Split every source into chunks of at most ``chunk_size`` frames, in source order."""
+    chunks = []
+    for src in sources:
+        key = _source_key(src)
+        if os.path.isdir(src):
+            images = _list_images(src)
+            kind, n = "images", len(images)
+        else:
+            kind, n = "video", _video_frame_count(src)
+            video_print = _fingerprint([src])
+        for ci, start in enumerate(range(0, n, chunk_size)):
+            stop = min(n, start + chunk_size)
+            chunks.append({
+                "source": os.path.abspath(src),
+                "key": key,
+                "kind": kind,
+                "chunk": ci,
+                "start": start,
+                "stop": stop,
+                "fingerprint": _fingerprint(images[start:stop]) if kind == "images" else video_print,
+            })
+    return chunks
+
+
+def chunk_path(out_dir: str, chunk: Dict) -> str:
+    return os.path.join(out_dir, chunk["key"], f"chunk_{chunk['chunk']:06d}.npz")
+
+
+def _chunk_done(path: str, chunk: Dict) -> bool:
+    try:
+        with np.load(path) as data:
+            if not {"hand_offsets", "frame_range", "source_fingerprint"} <= set(data.files):
+                return False
+            return (data["frame_range"].tolist() == [chunk["start"], chunk["stop"]]
+                    and str(data["source_fingerprint"]) == chunk["fingerprint"])
+    except Exception:
+        return False
+
+
+def _iter_frames(chunk: Dict) -> Iterator[Tuple[int, np.ndarray]]:
+    if chunk["kind"] == "images":
+        files = _list_images(chunk["source"])[chunk["start"]:chunk["stop"]]
+        for i, f in enumerate(files, chunk["start"]):
+            img = cv2.imread(f, cv2.IMREAD_COLOR)
+            if img is not None:
+                yield i, img
+        return
+    cap = cv2.VideoCapture(chunk["source"])
+    try:
+        if chunk["start"]:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, chunk["start"])
+        for i in range(chunk["start"], chunk["stop"]):
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield i, frame
+    finally:
+        cap.release()
+
+
+def _init_worker(opts: Dict) -> None:
+    global _worker_opts
+    _worker_opts = dict(opts)
+
+
+def _make_detector(static: bool):
+    from .hands import HandDetector
+
+    return HandDetector(
+        static_image_mode=static,
+        max_num_hands=_worker_opts.get("max_hands", 2),
+        model_complexity=_worker_opts.get("complexity", 1),
+        detection_confidence=_worker_opts.get("det", 0.5),
+        tracking_confidence=_worker_opts.get("track", 0.5),
+    )
+
+
+def _run_chunk(chunk: Dict, out_path: str) -> Tuple[str, int]:
+    """Worker entry: detect hands on every frame of ``chunk`` and write it to ``out_path``."""
+    global _image_detector
+    if chunk["kind"] == "images":
+        if _image_detector is None:
+            _image_detector = _make_detector(static=True)
+        detector = _image_detector
+    else:
+        # Fresh tracker per video chunk so results don't depend on which chunks a worker ran before
+        detector = _make_detector(static=False)
+
+    frame_index, sizes, offsets = [], [], [0]
+    landmarks, handed, scores, fingers = [], [], [], []
+    try:
+        for i, frame in _iter_frames(chunk):
+            if _worker_opts.get("flip"):
+                frame = cv2.flip(frame, 1)
+            hands = detector.detect(frame)
+            frame_index.append(i)
+            sizes.append((hands.width, hands.height))
+            offsets.append(offsets[-1] + len(hands))
+            if len(hands):
+                states, _ = hands.finger_states()
+                landmarks.append(hands.norm)
+                scores.append(hands.scores)
+                fingers.append(states)
+                handed.extend(HANDEDNESS_CODES.get(h.lower(), -1) for h in hands.handedness)
+    finally:
+        if detector is not _image_detector:
+            detector.close()
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp = out_path + ".tmp.npz"
+    np.savez(
+        tmp,
+        frame_index=np.asarray(frame_index, np.int64),
+        image_size=np.asarray(sizes, np.int32).reshape(-1, 2),
+        hand_offsets=np.asarray(offsets, np.int64),
+        landmarks=np.concatenate(landmarks) if landmarks else np.zeros((0, 21, 3), np.float32),
+        handedness=np.asarray(handed, np.int8),
+        scores=np.concatenate(scores) if scores else np.zeros((0,), np.float32),
+        finger_states=np.concatenate(fingers) if fingers else np.zeros((0, 5), bool),
+        frame_range=np.asarray([chunk["start"], chunk["stop"]], np.int64),
+        source_fingerprint=np.asarray(chunk["fingerprint"]),
+    )
+    os.replace(tmp, out_path)  # atomic: a chunk file either is complete or doesn't exist
+    return out_path, len(frame_index)
+
+
+def extract(
+    sources: Sequence[str],
+    out_dir: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    max_hands: int = 2,
+    complexity: int = 1,
+    det: float = 0.5,
+    track: float = 0.5,
+    flip: bool = False,
+    verbose: bool = True,
+) -> Dict:
+    """Run extraction over ``sources`` into ``out_dir``; returns the manifest dict.
+
+    Chunks whose output file already exists for the same frame range and unchanged input
+    files are skipped, so rerunning after a crash only processes what is missing.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = plan_chunks(sources, chunk_size)
+    manifest = {
+        "version": 1,
+        "chunk_size": chunk_size,
+        "sources": {c["key"]: {"path": c["source"], "kind": c["kind"]} for c in chunks},
+        "chunks": [
+            {"key": c["key"], "chunk": c["chunk"], "start": c["start"], "stop": c["stop"],
+             "file": os.path.relpath(chunk_path(out_dir, c), out_dir)}
+            for c in chunks
+        ],
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    todo = [c for c in chunks if not _chunk_done(chunk_path(out_dir, c), c)]
+    if verbose:
+        print(f"{len(chunks)} chunks planned, {len(chunks) - len(todo)} already done, {len(todo)} to run")
+    if not todo:
+        return manifest
+
+    opts = {"max_hands": max_hands, "complexity": complexity, "det": det, "track": track, "flip": flip}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo)))
+    t0 = time.time()
+    frames = 0
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(opts,)) as pool:
+        futures = [pool.submit(_run_chunk, c, chunk_path(out_dir, c)) for c in todo]
+        for done, fut in enumerate(as_completed(futures), 1):
+            path, n = fut.result()
+            frames += n
+            if verbose:
+                rate = frames / max(1e-6, time.time() - t0)
+                print(f"[{done}/{len(todo)}] {os.path.relpath(path, out_dir)}: {n} frames ({rate:.1f} fps total)")
+    return manifest
+
+
+def load_dataset(out_dir: str, key: Optional[str] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Concatenate finished chunks per source in frame order. Returns {source_key: columns}."""
+    with open(os.path.join(out_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    parts: Dict[str, List[Dict[str, np.ndarray]]] = {}
+    for c in manifest["chunks"]:
+        if key is not None and c["key"] != key:
+            continue
+        path = os.path.join(out_dir, c["file"])
+        if not os.path.exists(path):
+            continue
+        with np.load(path) as data:
+            parts.setdefault(c["key"], []).append({name: data[name] for name in data.files})
+
+    out = {}
+    for k, chunks in parts.items():
+        cols = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]
+                if name not in ("hand_offsets", "frame_range", "source_fingerprint")}
+        offsets, base = [np.zeros(1, np.int64)], 0
+        for c in chunks:
+            offsets.append(c["hand_offsets"][1:] + base)
+            base += int(c["hand_offsets"][-1])
+        cols["hand_offsets"] = np.concatenate(offsets)
+        out[k] = cols
+    return out
+
+
+def build_argparser():
+    p = argparse.ArgumentParser(description="Extract hand landmarks from videos / image folders into a chunked dataset")
+    p.add_argument("inputs", nargs="+", help="Video files or directories of images")
+    p.add_argument("-o", "--out", required=True, help="Output directory")
+    p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p.add_argument("--chunk-size", type=int, default=256, help="Frames per chunk (unit of work and of resume)")
+    p.add_argument("--max-hands", type=int, default=2)
+    p.add_argument("--complexity", type=int, default=1, choices=[0, 1, 2])
+    p.add_argument("--det", type=float, default=0.5, help="Min detection confidence")
+    p.add_argument("--track", type=float, default=0.5, help="Min tracking confidence")
+    p.add_argument("--flip", action="store_true", help="Mirror frames before detection")
+    return p
+
+
+def main(argv=None):
+    args = build_argparser().parse_args(argv)
+    missing = [p for p in args.inputs if not os.path.exists(p)]
+    if missing:
+        print(f"Input not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    extract(
+        args.inputs,
+        args.out,
+        workers=args.workers,
+        chunk_size=max(1, args.chunk_size),
+        max_hands=args.max_hands,
+        complexity=args.complexity,
+        det=args.det,
+        track=args.track,
+        flip=args.flip,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Reusable frame buffers for the per-frame image work.
+
+Capture, mirroring and the BGR->RGB conversion each used to allocate a full frame. A
+``FramePool`` hands out fixed destination buffers (round-robin, ``count`` per purpose)
+that OpenCV writes into through its ``dst=`` parameters, so after the first frame the
+hot path allocates nothing.
+
+Mirroring and color conversion are fused where possible: reversing each row of a
+contiguous BGR frame byte by byte (``cv2.flip`` on an ``(h, w * 3)`` view) mirrors the
+pixels and swaps B and R in a single pass.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+
+class FramePool:
+    """Round-robin destination buffers keyed by purpose.
+
+    A buffer is handed out again ``count`` calls later, so callers must be done with a
+    frame by then (one frame in flight plus the one being produced needs ``count=2``).
+    """
+
+    def __init__(self, count: int = 2) -> None:
+        self.count = max(1, int(count))
+        self.allocations = 0
+        self._buffers: Dict[str, List[np.ndarray]] = {}
+        self._next: Dict[str, int] = {}
+
+    def buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        bufs = self._buffers.get(name)
+        if not bufs or bufs[0].shape != tuple(shape) or bufs[0].dtype != dtype:
+            bufs = self._buffers[name] = [np.empty(shape, dtype) for _ in range(self.count)]
+            self._next[name] = 0
+            self.allocations += self.count
+        i = self._next[name]
+        self._next[name] = (i + 1) % self.count
+        buf = bufs[i]
+        buf.flags.writeable = True
+        return buf
+
+    def flip(self, frame: np.ndarray) -> np.ndarray:
+        """Horizontally mirrored copy of ``frame`` in a pooled buffer."""
+        return cv2.flip(frame, 1, dst=self.buffer("flip", frame.shape))
+
+    def to_rgb(self, frame_bgr: np.ndarray, mirror: bool = False, name: str = "rgb") -> np.ndarray:
+        """RGB (optionally mirrored) copy of ``frame_bgr``, returned read-only.
+
+        MediaPipe wraps read-only arrays by reference instead of copying them.
+        """
+        rgb = self.buffer(name, frame_bgr.shape)
+        if mirror and frame_bgr.ndim == 3 and frame_bgr.shape[2] == 3 and frame_bgr.flags.c_contiguous:
+            h = frame_bgr.shape[0]
+            cv2.flip(frame_bgr.reshape(h, -1), 1, dst=rgb.reshape(h, -1))
+        else:
+            cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+            if mirror:
+                cv2.flip(rgb, 1, dst=rgb)
+        rgb.flags.writeable = False
+        return rgb
@@ -4,8 +4,9 @@ from typing import Optional, Tuple
 
 import cv2
 
-from .gestures import count_fingers_up
-from .hands import landmarks_px
+from . import events as _events
+from .gestures import GestureRegistry
+from .hands import FrameHands
 from .overlay import draw_label
 
 
@@ -14,15 +15,21 @@ from .overlay import draw_label
 class RPSGame:
     """Simple Rock-Paper-Scissors using hand shape.
 
-    Player gesture mapping:
-      - Rock: fist (<=1 finger up)
-      - Paper: open hand (>=4 fingers up)
-      - Scissors: index+middle up only
+    Player gesture mapping (gestures of ``registry``, checked in this order):
+      - Rock: ``fist`` (<=1 finger up)
+      - Paper: ``open_palm`` (>=4 fingers up)
+      - Scissors: ``victory`` (index+middle up, ring+pinky down)
+
+    Each round is reported as an ``rps_result`` event; ``draw=False`` skips all drawing.
     """
 
     SIGNS = ("rock", "paper", "scissors")
+    GESTURES = {"fist": "rock", "open_palm": "paper", "victory": "scissors"}
+    features = ("fingers", "gestures", "overlay")
 
-    def __init__(self) -> None:
+    def __init__(self, draw: bool = True, registry: Optional[GestureRegistry] = None) -> None:
+        self.draw = draw
+        self.registry = registry
         self.state = "countdown"  # countdown -> show_result -> countdown
         self.round_end: float = 0.0
         self.countdown_end: float = time.time() + 3.0
@@ -32,19 +39,10 @@ class RPSGame:
         self.score_cpu = 0
 
     def _recognize(self, frame_bgr, results) -> Optional[str]:
-        if not results or not getattr(results, "multi_hand_landmarks", None):
+        hands = FrameHands.of(results, frame_bgr)
+        if len(hands) == 0:
             return None
-        hl = results.multi_hand_landmarks[0]
-        handed = getattr(results, "multi_handedness", [])
-        label = handed[0].classification[0].label if handed else "Hand"
-        cnt, st = count_fingers_up(frame_bgr, hl, label)
-        if cnt <= 1:
-            return "rock"
-        if cnt >= 4:
-            return "paper"
-        if st.get("Index") and st.get("Middle") and not st.get("Ring") and not st.get("Pinky"):
-            return "scissors"
-        return None
+        return self.GESTURES.get(hands.gestures(self.registry).first(tuple(self.GESTURES)))
 
     @staticmethod
     def _winner(a: str, b: str) -> int:
@@ -59,23 +57,34 @@ class RPSGame:
         h, w = frame_bgr.shape[:2]
         now = time.time()
         if self.state == "countdown":
-            secs = max(0, int(self.countdown_end - now) + 1)
-            draw_label(frame_bgr, f"RPS: Show rock/paper/scissors in {secs}s", (10, h - 10))
+            if self.draw:
+                secs = max(0, int(self.countdown_end - now) + 1)
+                draw_label(frame_bgr, f"RPS: Show rock/paper/scissors in {secs}s", (10, h - 10))
             if now >= self.countdown_end:
                 # lock player's gesture
-                self.player = self._recognize(frame_bgr, results) or random.choice(self.SIGNS)
+                recognized = self._recognize(frame_bgr, results)
+                self.player = recognized or random.choice(self.SIGNS)
                 self.cpu = random.choice(self.SIGNS)
                 win = self._winner(self.player, self.cpu)
                 if win > 0:
                     self.score_player += 1
                 elif win < 0:
                     self.score_cpu += 1
+                _events.active().emit(
+                    "rps_result",
+                    player=self.player,
+                    recognized=recognized is not None,
+                    cpu=self.cpu,
+                    winner={1: "player", -1: "cpu", 0: "tie"}[win],
+                    score=[self.score_player, self.score_cpu],
+                )
                 self.round_end = now + 2.0
                 self.state = "show_result"
         elif self.state == "show_result":
-            msg = f"You: {self.player} | CPU: {self.cpu}  Score {self.score_player}-{self.score_cpu}"
-            # big center text
-            cv2.putText(frame_bgr, msg, (20, int(h * 0.5)), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (50, 220, 50), 2, cv2.LINE_AA)
+            if self.draw:
+                msg = f"You: {self.player} | CPU: {self.cpu}  Score {self.score_player}-{self.score_cpu}"
+                # big center text
+                cv2.putText(frame_bgr, msg, (20, int(h * 0.5)), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (50, 220, 50), 2, cv2.LINE_AA)
             if now >= self.round_end:
                 self.countdown_end = now + 3.0
                 self.state = "countdown"
@@ -87,9 +96,14 @@ class ReactionGame:
     """Wait for GO, then close your hand as fast as you can.
 
     Sequence: get_ready (random 1-3s) -> go (measure time) -> result (2s) -> repeat
+    Each measurement is reported as a ``reaction`` event; ``draw=False`` skips all drawing.
     """
 
-    def __init__(self) -> None:
+    features = ("fingers", "gestures", "overlay")
+
+    def __init__(self, draw: bool = True, registry: Optional[GestureRegistry] = None) -> None:
+        self.draw = draw
+        self.registry = registry
         self.state = "get_ready"
         self.next_at = time.time() + random.uniform(1.0, 3.0)
         self.go_at: Optional[float] = None
@@ -97,33 +111,34 @@ class ReactionGame:
         self.best: Optional[float] = None
 
     def _is_closed(self, frame_bgr, results) -> bool:
-        if not results or not getattr(results, "multi_hand_landmarks", None):
+        hands = FrameHands.of(results, frame_bgr)
+        if len(hands) == 0:
             return False
-        hl = results.multi_hand_landmarks[0]
-        handed = getattr(results, "multi_handedness", [])
-        label = handed[0].classification[0].label if handed else "Hand"
-        cnt, _ = count_fingers_up(frame_bgr, hl, label)
-        return cnt <= 1
+        return hands.gestures(self.registry).has("fist")
 
     def update(self, frame_bgr, results) -> None:
         h, w = frame_bgr.shape[:2]
         now = time.time()
         if self.state == "get_ready":
-            draw_label(frame_bgr, "Reaction: Wait...", (10, h - 10))
+            if self.draw:
+                draw_label(frame_bgr, "Reaction: Wait...", (10, h - 10))
             if now >= self.next_at:
                 self.state = "go"
                 self.go_at = now
         elif self.state == "go":
-            cv2.putText(frame_bgr, "GO!", (int(w * 0.45), int(h * 0.2)), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3, cv2.LINE_AA)
+            if self.draw:
+                cv2.putText(frame_bgr, "GO!", (int(w * 0.45), int(h * 0.2)), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3, cv2.LINE_AA)
             if self._is_closed(frame_bgr, results):
                 rt = now - (self.go_at or now)
                 self.reaction = rt
                 self.best = min(self.best, rt) if (self.best is not None) else rt
+                _events.active().emit("reaction", ms=round(rt * 1000, 1), best_ms=round(self.best * 1000, 1))
                 self.state = "result"
                 self.next_at = now + 2.0
         elif self.state == "result":
-            txt = f"Reaction: {self.reaction*1000:.0f} ms (best: {self.best*1000:.0f} ms)"
-            draw_label(frame_bgr, txt, (10, h - 10))
+            if self.draw:
+                txt = f"Reaction: {self.reaction*1000:.0f} ms (best: {self.best*1000:.0f} ms)"
+                draw_label(frame_bgr, txt, (10, h - 10))
             if now >= self.next_at:
                 self.state = "get_ready"
                 self.next_at = now + random.uniform(1.0, 3.0)
@@ -1,5 +1,62 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from .hands import landmarks_px
 
+FINGERS = ("Thumb", "Index", "Middle", "Ring", "Pinky")
+_TIPS = np.array([8, 12, 16, 20])
+_PIPS = np.array([6, 10, 14, 18])
+
+
+def _left_mask(handedness, n: int) -> np.ndarray:
+    """Boolean (n,) mask of hands labelled "Left" (case-insensitive prefix match)."""
+    if isinstance(handedness, np.ndarray) and handedness.dtype == np.bool_:
+        return np.broadcast_to(handedness, (n,))
+    if handedness is None or isinstance(handedness, str):
+        handedness = [handedness] * n
+    labels = np.array(["" if h is None else str(h) for h in handedness], dtype=str)
+    return np.char.startswith(np.char.lower(labels), "left").reshape(n)
+
+
+def finger_states_batch(landmarks, handedness, image_size=None):
+    """Classify fingers for many hands at once.
+
+    ``landmarks`` is an (N, 21, 2|3) array. Pass pixel coords (e.g. ``FrameHands.px``),
+    or normalized coords together with ``image_size=(w, h)`` to get them truncated to
+    pixels exactly like ``landmarks_px``. ``handedness`` is a sequence of N labels
+    ("Left"/"Right"/anything else) or a boolean "is left" array.
+
+    Returns ``(states, counts)``: an (N, 5) bool matrix ordered as ``FINGERS`` and an
+    (N,) int count, using the same heuristics as ``count_fingers_up``.
+    """
+    pts = np.asarray(landmarks)
+    if pts.ndim != 3 or pts.shape[1] < 21:
+        raise ValueError(f"Expected an (N, 21, 2|3) landmark array, got shape {pts.shape}")
+    n = pts.shape[0]
+    if image_size is not None:
+        pts = (pts[..., :2].astype(np.float64) * (image_size[0], image_size[1])).astype(np.int32)
+    x = pts[..., 0]
+    y = pts[..., 1]
+
+    states = np.empty((n, 5), dtype=bool)
+    # Thumb: tip x vs MCP x, mirrored for left hands; unknown labels behave like right
+    states[:, 0] = np.where(_left_mask(handedness, n), x[:, 4] < x[:, 2], x[:, 4] > x[:, 2])
+    # Other fingers: tip above PIP (y grows downward)
+    states[:, 1:] = y[:, _TIPS] < y[:, _PIPS]
+    return states, states.sum(axis=1)
+
+
+def fingers_up(pts, hand_label: str):
+    """Same as ``count_fingers_up`` but on precomputed pixel points.
+
+    ``pts`` is a sequence of 21 (x, y) pairs, e.g. ``FrameHands.px[i]``.
+    """
+    if pts is None or len(pts) < 21:
+        return 0, {name: False for name in FINGERS}
+    states, counts = finger_states_batch(np.asarray(pts)[None], [hand_label])
+    return int(counts[0]), dict(zip(FINGERS, states[0].tolist()))
+
 
 def count_fingers_up(image, hand_landmarks, hand_label: str):
     """Return (count, states) where states is a dict of finger->bool (up?).
@@ -8,32 +65,218 @@ def count_fingers_up(image, hand_landmarks, hand_label: str):
     - Index/Middle/Ring/Pinky: tip.y < pip.y (y axis grows downward)
     - Thumb: compare x of tip vs mcp; depends on handedness label ("Left"/"Right")
     """
-    pts = landmarks_px(image, hand_landmarks)
-    if not pts or len(pts) < 21:
-        return 0, {"Thumb": False, "Index": False, "Middle": False, "Ring": False, "Pinky": False}
-
-    hand_label_l = (hand_label or "").lower()
-
-    def is_thumb_up():
-        tip_x = pts[4][0]
-        mcp_x = pts[2][0]
-        if hand_label_l.startswith("right"):
-            return tip_x > mcp_x
-        if hand_label_l.startswith("left"):
-            return tip_x < mcp_x
-        # Fallback if label missing: assume right-hand-like orientation
-        return tip_x > mcp_x
-
-    def is_finger_up(tip_idx, pip_idx):
-        return pts[tip_idx][1] < pts[pip_idx][1]
-
-    states = {
-        "Thumb": is_thumb_up(),
-        "Index": is_finger_up(8, 6),
-        "Middle": is_finger_up(12, 10),
-        "Ring": is_finger_up(16, 14),
-        "Pinky": is_finger_up(20, 18),
-    }
-    count = sum(1 for v in states.values() if v)
-    return count, states
+    return fingers_up(landmarks_px(image, hand_landmarks), hand_label)
+
+
+# --- Declarative gesture registry ----------------------------------------------------
+
+_PALM = (5, 17)  # index MCP to pinky MCP: the hand scale distances are divided by
+_FINGER_INDEX = {name.lower(): i for i, name in enumerate(FINGERS)}
+_FINGER_CODES = 1 << np.arange(5)
+
+
+def _bounds(rng) -> Tuple[float, float]:
+    lo, hi = rng if rng is not None else (None, None)
+    return (-np.inf if lo is None else float(lo)), (np.inf if hi is None else float(hi))
+
+
+class Gesture:
+    """A static pose declared as constraints, all of which must hold.
+
+    - ``fingers``: {finger name: up?} for the fingers that matter (see ``FINGERS``)
+    - ``count``: (min, max) number of fingers up, either end may be None
+    - ``distances``: {(landmark a, landmark b): (min, max)} in palm widths (the pixel
+      distance between landmarks 5 and 17), e.g. ``{(4, 8): (None, 0.45)}`` for a pinch
+    - ``angles``: {(a, b, c): (min, max)} in degrees, the angle at ``b``
+
+    The score of a match is how far the distance/angle values sit inside their ranges
+    (0 at a bound, 1 at least one bound-width inside), or 1 without such constraints.
+    """
+
+    def __init__(self, name: str, fingers=None, count=None, distances=None, angles=None) -> None:
+        self.name = name
+        self.fingers = {str(k): bool(v) for k, v in (fingers or {}).items()}
+        unknown = [k for k in self.fingers if k.lower() not in _FINGER_INDEX]
+        if unknown:
+            raise ValueError(f"Unknown finger(s) {unknown} in gesture {name!r}; use {FINGERS}")
+        self.count = _bounds(count)
+        self.distances = {tuple(int(i) for i in k): _bounds(v) for k, v in (distances or {}).items()}
+        self.angles = {tuple(int(i) for i in k): _bounds(v) for k, v in (angles or {}).items()}
+
+    def _key(self):
+        return (self.name, sorted(self.fingers.items()), self.count,
+                sorted(self.distances.items()), sorted(self.angles.items()))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Gesture) and self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return f"Gesture({self.name!r})"
+
+
+class GestureMatches:
+    """Every registered gesture evaluated for every hand of one frame.
+
+    ``mask``/``scores`` are (n_hands, n_gestures) arrays in registration order;
+    ``features`` holds the palm-normalized distances and angles by their landmark tuple.
+    """
+
+    def __init__(self, names, mask, scores, features) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self.mask = mask
+        self.scores = scores
+        self.features: Dict[Tuple[int, ...], np.ndarray] = features
+        self._index = {n: i for i, n in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return self.mask.shape[0]
+
+    def has(self, name: str, hand: int = 0) -> bool:
+        return hand < len(self) and bool(self.mask[hand, self._index[name]])
+
+    def score(self, name: str, hand: int = 0) -> float:
+        return float(self.scores[hand, self._index[name]]) if hand < len(self) else 0.0
+
+    def matching(self, hand: int = 0) -> List[Tuple[str, float]]:
+        """``(name, score)`` of every gesture hand ``hand`` matches, in registration order."""
+        if hand >= len(self):
+            return []
+        return [(self.names[g], float(self.scores[hand, g])) for g in np.flatnonzero(self.mask[hand])]
+
+    def first(self, names: Sequence[str], hand: int = 0) -> Optional[str]:
+        """The first of ``names`` that hand ``hand`` matches (``names`` gives the priority)."""
+        for name in names:
+            if self.has(name, hand):
+                return name
+        return None
+
+    def distance(self, a: int, b: int) -> np.ndarray:
+        """(n_hands,) palm-normalized distance between landmarks ``a`` and ``b``."""
+        return self.features[(a, b)]
+
+
+class GestureRegistry:
+    """Named gestures compiled into a single NumPy evaluation over all hands of a frame.
+
+    ``evaluate`` is normally reached through ``FrameHands.gestures(registry)``, which
+    caches the result on the frame so every mode shares one evaluation.
+    """
+
+    def __init__(self, gestures: Sequence[Gesture] = ()) -> None:
+        self._gestures: Dict[str, Gesture] = {}
+        self.version = 0
+        self._compiled = None
+        for g in gestures:
+            self.register(g)
+
+    def __len__(self) -> int:
+        return len(self._gestures)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._gestures
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._gestures)
+
+    def register(self, gesture: Gesture) -> Gesture:
+        """Add ``gesture``, replacing one of the same name; re-registering it unchanged is free."""
+        if self._gestures.get(gesture.name) != gesture:
+            self._gestures[gesture.name] = gesture
+            self.version += 1
+            self._compiled = None
+        return gesture
+
+    def unregister(self, name: str) -> None:
+        if self._gestures.pop(name, None) is not None:
+            self.version += 1
+            self._compiled = None
+
+    def _compile(self):
+        gestures = list(self._gestures.values())
+        care = np.zeros(len(gestures), np.int64)  # finger bits that matter, bit i = FINGERS[i]
+        want = np.zeros(len(gestures), np.int64)
+        keys: List[Tuple[int, ...]] = []
+        owners, cols, lo, hi = [], [], [], []
+        for gi, g in enumerate(gestures):
+            for name, up in g.fingers.items():
+                bit = 1 << _FINGER_INDEX[name.lower()]
+                care[gi] |= bit
+                want[gi] |= bit if up else 0
+            # Constraints are appended gesture by gesture, so each gesture owns one contiguous run
+            for key, (a, b) in list(g.distances.items()) + list(g.angles.items()):
+                if key not in keys:
+                    keys.append(key)
+                owners.append(gi)
+                cols.append(key)
+                lo.append(a)
+                hi.append(b)
+        pairs = [k for k in keys if len(k) == 2]
+        triples = [k for k in keys if len(k) == 3]
+        order = pairs + triples  # feature columns
+        lo_a, hi_a = np.array(lo, np.float64), np.array(hi, np.float64)
+        # Margin scale: the range width, or the bound itself for one-sided ranges
+        width = np.where(np.isfinite(lo_a) & np.isfinite(hi_a), hi_a - lo_a,
+                         np.abs(np.where(np.isfinite(lo_a), lo_a, hi_a)))
+        owned, starts = np.unique(np.array(owners, np.intp), return_index=True)
+        self._compiled = {
+            "names": [g.name for g in gestures],
+            "care": care,
+            "want": want,
+            "count": np.array([g.count for g in gestures], np.float64).reshape(-1, 2).T.copy(),
+            "pairs": np.array(pairs, np.intp).reshape(-1, 2).T.copy(),
+            "triples": np.array(triples, np.intp).reshape(-1, 3).T.copy(),
+            "keys": order,
+            "column": np.array([order.index(k) for k in cols], np.intp),
+            "lo": lo_a,
+            "hi": hi_a,
+            "inv_width": 1.0 / np.maximum(np.nan_to_num(width, posinf=1.0), 1e-9),
+            "owned": owned,
+            "starts": starts,
+        }
+        return self._compiled
+
+    def evaluate(self, hands) -> GestureMatches:
+        """Match every gesture against every hand of ``hands`` (a ``FrameHands``)."""
+        c = self._compiled or self._compile()
+        states, counts = hands.finger_states()
+        n = len(hands)
+        code = states @ _FINGER_CODES  # (n_hands,) finger bits
+        mask = (code[:, None] & c["care"]) == c["want"]
+        mask &= (counts[:, None] >= c["count"][0]) & (counts[:, None] <= c["count"][1])
+        scores = np.ones(mask.shape, np.float32)
+        features: Dict[Tuple[int, ...], np.ndarray] = {}
+        if c["keys"]:
+            pts = hands.px.astype(np.float64)
+            palm = pts[:, _PALM[0]] - pts[:, _PALM[1]]
+            scale = np.maximum(1.0, np.hypot(palm[:, 0], palm[:, 1]))
+            cols = []
+            if c["pairs"].size:
+                d = pts[:, c["pairs"][0]] - pts[:, c["pairs"][1]]
+                cols.append(np.hypot(d[..., 0], d[..., 1]) / scale[:, None])
+            if c["triples"].size:
+                u = pts[:, c["triples"][0]] - pts[:, c["triples"][1]]
+                v = pts[:, c["triples"][2]] - pts[:, c["triples"][1]]
+                cross = u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+                cols.append(np.degrees(np.abs(np.arctan2(cross, (u * v).sum(axis=-1)))))
+            values = np.concatenate(cols, axis=1) if len(cols) > 1 else cols[0]
+            features = {key: values[:, i] for i, key in enumerate(c["keys"])}
+            v = values[:, c["column"]]  # (n_hands, n_constraints)
+            margin = np.minimum(v - c["lo"], c["hi"] - v) * c["inv_width"]
+            np.clip(margin, 0.0, 1.0, out=margin)  # negative = outside the range
+            if n:
+                owned, starts = c["owned"], c["starts"]
+                mask[:, owned] &= np.logical_and.reduceat((v >= c["lo"]) & (v <= c["hi"]), starts, axis=1)
+                scores[:, owned] = np.minimum.reduceat(margin, starts, axis=1)
+        scores[~mask] = 0.0
+        return GestureMatches(c["names"], mask, scores, features)
+
 
+# Shared registry used by the built-in modes; FrameHands.gestures() evaluates it by default
+REGISTRY = GestureRegistry([
+    Gesture("fist", count=(None, 1)),
+    Gesture("open_palm", count=(4, None)),
+    Gesture("victory", fingers={"Index": True, "Middle": True, "Ring": False, "Pinky": False}),
+    Gesture("point", fingers={"Index": True, "Middle": False, "Ring": False, "Pinky": False}),
+    Gesture("pinch", distances={(4, 8): (None, 0.45)}),
+])
@@ -1,9 +1,218 @@
+from typing import List, Optional, Sequence, Tuple
+
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from . import metrics as _metrics
+from .frames import FramePool
+
+NUM_LANDMARKS = 21
+# Per-frame features a mode can ask for; see ``FrameHands.prepare``
+FEATURES = ("px", "fingers", "pinch", "gestures", "handedness", "overlay")
+_PINCH = (4, 8)  # thumb tip, index tip
+_PALM = (5, 17)  # index MCP, pinky MCP: the hand scale (same as gestures)
+
+
+class FrameHands:
+    """All hands detected in one frame, as NumPy arrays built once right after detection.
+
+    - ``norm``: (n_hands, 21, 3) float32 normalized landmark coords (x, y in 0..1, z relative)
+    - ``px``: (n_hands, 21, 2) int32 pixel coords, truncated like ``landmarks_px``
+      (computed on first access)
+    - ``handedness``: list of "Left"/"Right"/"Hand" labels, ``scores``: (n_hands,) float32
+
+    Derived features (``px``, ``finger_states()``, ``pinch_ratio()``, ``gestures()``) are
+    computed lazily and cached, so each is computed at most once per frame however many
+    modes read it.
+
+    ``multi_hand_landmarks``/``multi_handedness`` mirror the MediaPipe results API, so a
+    FrameHands can be passed anywhere a results object was accepted. ``synthetic`` is True
+    when the landmarks were predicted between detector runs rather than detected.
+    """
+
+    def __init__(
+        self,
+        norm,
+        handedness: Sequence[str],
+        scores,
+        width: int,
+        height: int,
+        timestamp: float = 0.0,
+        raw=None,
+    ) -> None:
+        self.norm = np.asarray(norm, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        self.width = int(width)
+        self.height = int(height)
+        self._px = None
+        self.handedness: List[str] = list(handedness)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        self.timestamp = float(timestamp)
+        self.synthetic = False
+        self._raw = raw
+        self._fingers = None
+        self._pinch = None
+        self._gesture_cache = {}
+        self._landmark_lists = None
+        self._handedness_lists = None
+
+    @classmethod
+    def empty(cls, width: int, height: int, timestamp: float = 0.0) -> "FrameHands":
+        return cls(np.zeros((0, NUM_LANDMARKS, 3), np.float32), [], [], width, height, timestamp)
+
+    @classmethod
+    def from_results(cls, results, width: int, height: int, timestamp: float = 0.0) -> "FrameHands":
+        """Convert MediaPipe ``Hands.process`` output into arrays (one pass over the landmarks)."""
+        hand_lists = getattr(results, "multi_hand_landmarks", None) or []
+        handed_lists = getattr(results, "multi_handedness", None) or []
+        n = len(hand_lists)
+        norm = np.zeros((n, NUM_LANDMARKS, 3), np.float32)
+        labels, scores = [], []
+        for i, hl in enumerate(hand_lists):
+            norm[i] = [(lm.x, lm.y, lm.z) for lm in hl.landmark][:NUM_LANDMARKS]
+            handed = handed_lists[i] if i < len(handed_lists) else None
+            if handed and getattr(handed, "classification", None):
+                labels.append(handed.classification[0].label)
+                scores.append(handed.classification[0].score)
+            else:
+                labels.append("Hand")
+                scores.append(0.0)
+        return cls(norm, labels, scores, width, height, timestamp, raw=results)
+
+    @classmethod
+    def of(cls, results, image, timestamp: float = 0.0) -> "FrameHands":
+        """Return ``results`` if it already is a FrameHands, else build one for ``image``."""
+        if isinstance(results, cls):
+            return results
+        h, w = image.shape[:2]
+        if results is None:
+            return cls.empty(w, h, timestamp)
+        return cls.from_results(results, w, h, timestamp)
+
+    def __len__(self) -> int:
+        return self.norm.shape[0]
+
+    @property
+    def px(self) -> np.ndarray:
+        if self._px is None:
+            # float64 product then truncation toward zero == int(lm.x * w) per landmark
+            self._px = (self.norm[..., :2].astype(np.float64) * (self.width, self.height)).astype(np.int32)
+        return self._px
+
+    def label(self, i: int) -> str:
+        return self.handedness[i] if i < len(self.handedness) else "Hand"
+
+    def points(self, i: int) -> List[Tuple[int, int]]:
+        """Pixel coords of hand ``i`` as a list of (x, y) tuples, like ``landmarks_px``."""
+        return [tuple(p) for p in self.px[i].tolist()]
+
+    def finger_states(self):
+        """``(states, counts)`` for every hand, computed once per frame.
+
+        See ``gestures.finger_states_batch``: states is (n_hands, 5) bool, counts (n_hands,).
+        """
+        if self._fingers is None:
+            from .gestures import finger_states_batch
+
+            with _metrics.active().span("gestures"):
+                self._fingers = finger_states_batch(self.px, self.handedness)
+        return self._fingers
+
+    def pinch_ratio(self) -> np.ndarray:
+        """(n_hands,) thumb-to-index tip distance in palm widths, computed once per frame.
+
+        Same value as ``gestures(...).distance(4, 8)``, without evaluating a gesture registry.
+        """
+        if self._pinch is None:
+            pts = self.px.astype(np.float64)
+            palm = pts[:, _PALM[0]] - pts[:, _PALM[1]]
+            d = pts[:, _PINCH[0]] - pts[:, _PINCH[1]]
+            self._pinch = np.hypot(d[:, 0], d[:, 1]) / np.maximum(1.0, np.hypot(palm[:, 0], palm[:, 1]))
+        return self._pinch
+
+    def prepare(self, features) -> "FrameHands":
+        """Compute the named ``FEATURES`` now instead of on first use.
+
+        Used when the consumers run on other threads, so two of them never both compute a
+        feature. ``gestures`` evaluates the shared ``gestures.REGISTRY``; ``handedness`` comes
+        with the detection; ``overlay`` needs pixels and fingers.
+        """
+        features = set(features)
+        if features & {"px", "overlay"}:
+            self.px
+        if features & {"fingers", "overlay"}:
+            self.finger_states()
+        if "pinch" in features:
+            self.pinch_ratio()
+        if "gestures" in features:
+            self.gestures()
+        return self
+
+    def gestures(self, registry=None):
+        """Every gesture of ``registry`` (default ``gestures.REGISTRY``) matched against every
+        hand, evaluated once per frame and registry version; see ``gestures.GestureMatches``.
+        """
+        if registry is None:
+            from .gestures import REGISTRY as registry
+        cached = self._gesture_cache.get(id(registry))
+        if cached is None or cached[0] != registry.version:
+            self.finger_states()  # timed under its own span
+            with _metrics.active().span("gestures"):
+                cached = self._gesture_cache[id(registry)] = (registry.version, registry.evaluate(self))
+        return cached[1]
+
+    # --- MediaPipe results compatibility -------------------------------------------
+
+    @property
+    def multi_hand_landmarks(self):
+        if len(self) == 0:
+            return None
+        if self._landmark_lists is None:
+            raw = getattr(self._raw, "multi_hand_landmarks", None)
+            if raw is not None and len(raw) == len(self):
+                self._landmark_lists = list(raw)
+            else:
+                from mediapipe.framework.formats import landmark_pb2
+
+                lists = []
+                for hand in self.norm.tolist():
+                    lst = landmark_pb2.NormalizedLandmarkList()
+                    for x, y, z in hand:
+                        lst.landmark.add(x=x, y=y, z=z)
+                    lists.append(lst)
+                self._landmark_lists = lists
+        return self._landmark_lists
+
+    @property
+    def multi_handedness(self):
+        if len(self) == 0:
+            return None
+        if self._handedness_lists is None:
+            raw = getattr(self._raw, "multi_handedness", None)
+            if raw is not None and len(raw) == len(self):
+                self._handedness_lists = list(raw)
+            else:
+                from mediapipe.framework.formats import classification_pb2
+
+                lists = []
+                for i, (label, score) in enumerate(zip(self.handedness, self.scores.tolist())):
+                    lst = classification_pb2.ClassificationList()
+                    lst.classification.add(index=i, label=label, score=score)
+                    lists.append(lst)
+                self._handedness_lists = lists
+        return self._handedness_lists
 
 
 class HandDetector:
-    """MediaPipe Hands wrapper."""
+    """MediaPipe Hands wrapper.
+
+    With ``roi=True``, ``detect`` feeds MediaPipe only a padded square crop around the
+    hands found in the previous frame (downscaled to at most ``roi_size`` pixels per side)
+    and maps the landmarks back to full-frame coordinates. Crops are detected independently
+    (static image mode); following the hand from frame to frame is done by re-centering the
+    box. It falls back to a full-frame pass when the crop loses the hand and every
+    ``roi_refresh`` frames, so hands entering elsewhere in the frame are still picked up.
+    """
 
     def __init__(
         self,
@@ -12,26 +221,110 @@ class HandDetector:
         model_complexity: int = 1,
         detection_confidence: float = 0.5,
         tracking_confidence: float = 0.5,
+        roi: bool = False,
+        roi_pad: float = 0.3,
+        roi_size: Optional[int] = 256,
+        roi_refresh: int = 30,
     ):
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
+        self._options = dict(
             static_image_mode=static_image_mode,
             max_num_hands=max_num_hands,
             model_complexity=model_complexity,
             min_detection_confidence=detection_confidence,
             min_tracking_confidence=tracking_confidence,
         )
+        self.hands = self.mp_hands.Hands(**self._options)
+
+        self.roi = bool(roi)
+        self.roi_pad = float(roi_pad)
+        self.roi_size = int(roi_size) if roi_size else None
+        self.roi_refresh = max(1, int(roi_refresh))
+        # Separate instance for crops, in static image mode: the box moves and resizes between
+        # frames, so tracking state kept in crop coordinates would follow the wrong spot
+        self._roi_hands = None
+        self._roi_box: Optional[Tuple[int, int, int, int]] = None
+        self._since_full = 0
+        # Conversion buffers; process() is synchronous, so one of each is enough
+        self._pool = FramePool(count=1)
 
-    def process(self, frame_bgr):
+    def process(self, frame_bgr, rgb=None):
+        """Run MediaPipe on ``frame_bgr``; pass ``rgb`` if its RGB version was already made."""
+        metrics = _metrics.active()
         # MediaPipe expects RGB input
-        frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-        return self.hands.process(frame_rgb)
+        if rgb is None:
+            with metrics.span("color"):
+                rgb = self._pool.to_rgb(frame_bgr)
+        with metrics.span("inference"):
+            return self.hands.process(rgb)
+
+    def detect(self, frame_bgr, timestamp: Optional[float] = None, rgb=None) -> FrameHands:
+        """Run ``process`` and return the per-frame ``FrameHands`` arrays.
+
+        ``rgb`` optionally supplies the RGB version of ``frame_bgr`` (see ``FramePool.to_rgb``);
+        ROI crops are always converted here.
+        """
+        h, w = frame_bgr.shape[:2]
+        ts = timestamp or 0.0
+        if self.roi and self._roi_box is not None and self._since_full < self.roi_refresh:
+            hands = self._detect_roi(frame_bgr, self._roi_box, ts)
+            if len(hands):
+                self._since_full += 1
+                self._roi_box = self._box_around(hands)
+                return hands
+        hands = FrameHands.from_results(self.process(frame_bgr, rgb), w, h, ts)
+        if self.roi:
+            _metrics.active().inc("roi_full_frames")
+            self._since_full = 0
+            self._roi_box = self._box_around(hands) if len(hands) else None
+        return hands
+
+    def _box_around(self, hands: FrameHands) -> Optional[Tuple[int, int, int, int]]:
+        """Padded square (x0, y0, x1, y1) covering every hand, shifted to stay inside the frame."""
+        w, h = hands.width, hands.height
+        pts = hands.px.reshape(-1, 2)
+        x0, y0 = pts.min(axis=0)
+        x1, y1 = pts.max(axis=0)
+        side = int(max(x1 - x0, y1 - y0) * (1.0 + 2.0 * self.roi_pad))
+        side = max(32, min(side, w, h))
+        cx, cy = (int(x0) + int(x1)) // 2, (int(y0) + int(y1)) // 2
+        bx = min(max(0, cx - side // 2), w - side)
+        by = min(max(0, cy - side // 2), h - side)
+        return bx, by, bx + side, by + side
+
+    def _detect_roi(self, frame_bgr, box: Tuple[int, int, int, int], ts: float) -> FrameHands:
+        metrics = _metrics.active()
+        h, w = frame_bgr.shape[:2]
+        x0, y0, x1, y1 = box
+        crop = frame_bgr[y0:y1, x0:x1]
+        side = x1 - x0
+        with metrics.span("color"):
+            if self.roi_size and side > self.roi_size:
+                dst = self._pool.buffer("roi", (self.roi_size, self.roi_size, 3))
+                crop = cv2.resize(crop, (self.roi_size, self.roi_size), dst=dst, interpolation=cv2.INTER_AREA)
+            crop_rgb = self._pool.to_rgb(crop, name="roi_rgb")
+        if self._roi_hands is None:
+            self._roi_hands = self.mp_hands.Hands(**dict(self._options, static_image_mode=True))
+        with metrics.span("inference"):
+            results = self._roi_hands.process(crop_rgb)
+        metrics.inc("roi_frames")
+        local = FrameHands.from_results(results, side, side, ts)
+        if len(local) == 0:
+            return local
+        # Crop-normalized -> full-frame-normalized (z is scaled like x, relative to image width)
+        norm = local.norm.copy()
+        norm[..., 0] = (norm[..., 0] * side + x0) / w
+        norm[..., 1] = (norm[..., 1] * side + y0) / h
+        norm[..., 2] *= side / w
+        return FrameHands(norm, local.handedness, local.scores, w, h, ts)
 
     def close(self):
-        try:
-            self.hands.close()
-        except Exception:
-            pass
+        for hands in (self.hands, self._roi_hands):
+            try:
+                if hands is not None:
+                    hands.close()
+            except Exception:
+                pass
 
 
 def landmarks_px(image, hand_landmarks):
@@ -45,4 +338,3 @@ def landmarks_px(image, hand_landmarks):
     for lm in hand_landmarks.landmark:
         pts.append((int(lm.x * w), int(lm.y * h)))
     return pts
-
@@ -0,0 +1,150 @@
+"""
+Idle power mode: slow down while nobody is in front of the camera.
+
+``IdleController`` wraps the detector with a two-state machine:
+
+- ``active``: every frame goes through the detector. After ``idle_after`` seconds of capture
+  time without a hand it switches to ``idle``.
+- ``idle``: ``detect`` returns no hands without running inference. Each idle frame only gets
+  a ``FrameDiff`` motion check against the previous idle frame; a quiet one then sleeps
+  until the next ``idle_fps`` slot before returning, so capture, drawing and display slow
+  down with it and the next frame is read after the wait, not before it. Every
+  ``probe_every`` seconds it also runs a low-complexity probe detector, which catches a hand
+  that entered while holding still. Motion or a probed hand switches back to ``active`` and
+  runs the full detector on that same frame.
+
+The wake latency is measured from the capture time of the last quiet idle frame to the end
+of the full detection. Motion can't have started earlier than that frame, so the figure
+bounds the real latency from above: one idle frame interval plus one detection (plus the
+camera's own frame interval when the next read has to wait for a new frame).
+Time spent in each state and wake latencies are exported as metrics
+(``idle_state_seconds[...]`` gauges, ``wake_latency`` histogram) and ``idle`` events.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from . import events as _events
+from . import metrics as _metrics
+from .hands import FrameHands
+from .motion_gate import FrameDiff
+
+ACTIVE, IDLE = "active", "idle"
+
+
+class IdleController:
+    """Detector wrapper that idles after ``idle_after`` seconds without hands.
+
+    ``probe_factory()`` builds the cheap detector used every ``probe_every`` seconds while
+    idle (None or ``probe_every <= 0`` disables probing). ``threshold`` is the changed-pixel
+    fraction between consecutive idle frames that counts as motion.
+    """
+
+    def __init__(
+        self,
+        detector,
+        idle_after: float = 10.0,
+        idle_fps: float = 5.0,
+        threshold: float = 0.01,
+        probe_factory: Optional[Callable] = None,
+        probe_every: float = 2.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.detector = detector
+        self.idle_after = float(idle_after)
+        self.idle_interval = 1.0 / max(0.1, float(idle_fps))
+        self.threshold = float(threshold)
+        self.probe_factory = probe_factory
+        self.probe_every = float(probe_every)
+        self.sleep = sleep
+        self.clock = clock
+        self.wall_clock = wall_clock  # the clock of capture timestamps
+        self.diff = FrameDiff()
+
+        self.state = ACTIVE
+        self.wakes = 0
+        self.wake_latencies_ms: List[float] = []
+        self._state_seconds: Dict[str, float] = {ACTIVE: 0.0, IDLE: 0.0}
+        self._entered = clock()
+        self._last_hand_t: Optional[float] = None
+        self._quiet_t = 0.0  # capture time of the last idle frame without motion
+        self._last_probe_t = 0.0
+        self._next_frame = 0.0
+        self._probe = None
+
+    def state_seconds(self) -> Dict[str, float]:
+        """Seconds spent in each state so far, including the current one."""
+        out = dict(self._state_seconds)
+        out[self.state] += self.clock() - self._entered
+        return out
+
+    def _enter(self, state: str, **fields) -> None:
+        now = self.clock()
+        self._state_seconds[self.state] += now - self._entered
+        self._entered = now
+        self.state = state
+        metrics = _metrics.active()
+        metrics.set_gauge("idle_state", int(state == IDLE))
+        for name, seconds in self._state_seconds.items():
+            metrics.set_gauge(f"idle_state_seconds[{name}]", round(seconds, 1))
+        _events.active().emit("idle", state=state, **fields)
+
+    def detect(self, frame_bgr, timestamp: Optional[float] = None, rgb=None) -> FrameHands:
+        ts = timestamp or self.wall_clock()
+        if self.state == IDLE:
+            woke = self._idle_frame(frame_bgr, ts)
+            if woke is None:
+                h, w = frame_bgr.shape[:2]
+                return FrameHands.empty(w, h, timestamp or 0.0)
+            hands = self.detector.detect(frame_bgr, timestamp, rgb=rgb)
+            self._wake(woke, ts)
+        else:
+            hands = self.detector.detect(frame_bgr, timestamp, rgb=rgb)
+        if len(hands) or self._last_hand_t is None or ts < self._last_hand_t:
+            self._last_hand_t = ts
+        elif ts - self._last_hand_t >= self.idle_after:
+            self._enter(IDLE, after_s=round(ts - self._last_hand_t, 1))
+            self.diff.measure(frame_bgr)  # the reference for the first idle frame
+            self.diff.accept()
+            self._quiet_t = self._last_probe_t = ts
+            self._next_frame = self.clock()
+        return hands
+
+    def _idle_frame(self, frame_bgr, ts: float) -> Optional[str]:
+        """Check the frame and return the wake reason; a quiet frame waits for the next slot."""
+        with _metrics.active().span("idle_check"):
+            change = self.diff.measure(frame_bgr)
+            self.diff.accept()
+        if change > self.threshold:
+            return "motion"
+        if self.probe_factory is not None and self.probe_every > 0 and ts - self._last_probe_t >= self.probe_every:
+            self._last_probe_t = ts
+            if self._probe is None:
+                self._probe = self.probe_factory()
+            with _metrics.active().span("idle_probe"):
+                if len(self._probe.detect(frame_bgr, ts)):
+                    return "hand"
+        self._quiet_t = ts
+        self._next_frame = max(self._next_frame + self.idle_interval, self.clock())
+        delay = self._next_frame - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+        return None
+
+    def _wake(self, reason: str, ts: float) -> None:
+        ms = (self.wall_clock() - self._quiet_t) * 1000.0
+        self.wakes += 1
+        self.wake_latencies_ms.append(ms)
+        self._last_hand_t = ts  # stay active for at least ``idle_after``
+        _metrics.active().observe("wake_latency", ms)
+        self._enter(ACTIVE, reason=reason, wake_ms=round(ms, 1))
+        print(f"Idle: woke on {reason} within {ms:.0f} ms", file=sys.stderr)
+
+    def close(self) -> None:
+        if self._probe is not None:
+            self._probe.close()
+        self.detector.close()
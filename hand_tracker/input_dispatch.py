@@ -0,0 +1,252 @@
+"""
+Asynchronous OS input dispatch.
+
+pyautogui/pynput calls can block for tens of milliseconds (pyautogui sleeps ``PAUSE``
+after every call by default), so modes hand their events to an ``InputDispatcher`` and
+return immediately. A worker thread sends them to the backend:
+
+- consecutive cursor moves are coalesced, only the latest position is sent;
+- button, scroll and key events keep their order relative to each other and to moves;
+- moves are rate-limited to ``move_hz`` (the display refresh rate, by default 60 Hz).
+
+``FakeBackend`` records events instead of sending them, for tests and headless runs.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from . import metrics as _metrics
+
+# Optional OS control backends
+try:
+    import pyautogui as _pygui  # type: ignore
+except Exception:  # pragma: no cover - optional
+    _pygui = None
+
+try:
+    from pynput.keyboard import Controller as _KeyCtl, Key as _Key  # type: ignore
+    from pynput.mouse import Controller as _PynputMouse, Button as _MouseButton  # type: ignore
+except Exception:  # pragma: no cover - optional
+    _KeyCtl = _Key = _PynputMouse = _MouseButton = None
+
+BACKENDS = ("auto", "pyautogui", "pynput", "fake", "none")
+
+
+class PyAutoGuiBackend:
+    name = "pyautogui"
+
+    def __init__(self) -> None:
+        _pygui.FAILSAFE = False
+
+    def move(self, x: float, y: float) -> None:
+        _pygui.moveTo(x, y, _pause=False)
+
+    def button(self, down: bool) -> None:
+        if down:
+            _pygui.mouseDown(_pause=False)
+        else:
+            _pygui.mouseUp(_pause=False)
+
+    def scroll(self, dy: int) -> None:
+        _pygui.scroll(dy, _pause=False)
+
+    def key(self, name: str) -> None:
+        _pygui.press(name, _pause=False)
+
+
+class PynputBackend:
+    name = "pynput"
+
+    def __init__(self) -> None:
+        self._mouse = _PynputMouse()
+        self._keys = _KeyCtl()
+
+    def move(self, x: float, y: float) -> None:
+        self._mouse.position = (int(x), int(y))
+
+    def button(self, down: bool) -> None:
+        if down:
+            self._mouse.press(_MouseButton.left)
+        else:
+            self._mouse.release(_MouseButton.left)
+
+    def scroll(self, dy: int) -> None:
+        self._mouse.scroll(0, int(dy))
+
+    def key(self, name: str) -> None:
+        key = getattr(_Key, name)
+        self._keys.press(key)
+        self._keys.release(key)
+
+
+class FakeBackend:
+    """Records dispatched events as ``(time, kind, args)`` tuples."""
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[float, str, tuple]] = []
+
+    def move(self, x: float, y: float) -> None:
+        self.events.append((time.perf_counter(), "move", (x, y)))
+
+    def button(self, down: bool) -> None:
+        self.events.append((time.perf_counter(), "down" if down else "up", ()))
+
+    def scroll(self, dy: int) -> None:
+        self.events.append((time.perf_counter(), "scroll", (dy,)))
+
+    def key(self, name: str) -> None:
+        self.events.append((time.perf_counter(), "key", (name,)))
+
+    def kinds(self) -> List[str]:
+        return [e[1] for e in self.events]
+
+
+def make_backend(kind: str = "auto"):
+    """Instantiate an OS backend by name; ``auto`` tries pyautogui, then pynput. None if unavailable."""
+    if kind == "fake":
+        return FakeBackend()
+    if kind in ("auto", "pyautogui") and _pygui is not None:
+        try:
+            return PyAutoGuiBackend()
+        except Exception:
+            pass
+    if kind in ("auto", "pynput") and _PynputMouse is not None:
+        try:
+            return PynputBackend()
+        except Exception:
+            pass
+    return None
+
+
+def screen_size() -> Optional[Tuple[int, int]]:
+    if _pygui is not None:
+        try:
+            sz = _pygui.size()
+            return int(sz[0]), int(sz[1])
+        except Exception:
+            pass
+    return None
+
+
+class InputDispatcher:
+    """Queue of input events drained by a background thread (see module docstring).
+
+    With ``backend=None`` every call is a no-op and no thread is started.
+    """
+
+    def __init__(self, backend=None, move_hz: float = 60.0) -> None:
+        self.backend = backend
+        self.min_move_interval = 1.0 / move_hz if move_hz and move_hz > 0 else 0.0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._events: Deque[tuple] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stop = False
+        self._last_move = 0.0
+        self._thread: Optional[threading.Thread] = None
+        if backend is not None:
+            self._thread = threading.Thread(target=self._run, name="input-dispatch", daemon=True)
+            self._thread.start()
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.backend.name if self.backend is not None else None
+
+    def _put(self, event: tuple) -> None:
+        if self._thread is None:
+            return
+        with self._cond:
+            if event[0] == "move" and self._events and self._events[-1][0] == "move":
+                self._events[-1] = event  # nothing ordered in between: keep only the newest
+                self.coalesced += 1
+                _metrics.active().inc("input_coalesced")
+            else:
+                self._events.append(event)
+            self._cond.notify()
+
+    def move(self, x: float, y: float) -> None:
+        self._put(("move", x, y))
+
+    def button(self, down: bool) -> None:
+        self._put(("button", down))
+
+    def scroll(self, dy: int) -> None:
+        if dy:
+            self._put(("scroll", int(dy)))
+
+    def key(self, name: str) -> None:
+        self._put(("key", name))
+
+    def _next(self) -> Optional[tuple]:
+        with self._cond:
+            while True:
+                if not self._events:
+                    if self._stop:
+                        return None
+                    self._cond.wait()
+                    continue
+                head = self._events[0]
+                if head[0] == "move" and len(self._events) == 1 and not self._stop:
+                    wait = self._last_move + self.min_move_interval - time.perf_counter()
+                    if wait > 0:
+                        # Too soon after the last move; newer moves keep coalescing into this one
+                        self._cond.wait(wait)
+                        continue
+                self._busy = True
+                return self._events.popleft()
+
+    def _send(self, event: tuple) -> None:
+        kind = event[0]
+        if kind == "move":
+            self.backend.move(event[1], event[2])
+            self._last_move = time.perf_counter()
+        elif kind == "button":
+            self.backend.button(event[1])
+        elif kind == "scroll":
+            self.backend.scroll(event[1])
+        elif kind == "key":
+            self.backend.key(event[1])
+
+    def _run(self) -> None:
+        while True:
+            event = self._next()
+            if event is None:
+                return
+            try:
+                with _metrics.active().span("dispatch"):
+                    self._send(event)
+                self.dispatched += 1
+            except Exception:
+                self.errors += 1
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wait until every queued event was sent; False on timeout."""
+        if self._thread is None:
+            return True
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while self._events or self._busy:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Send what is still queued, then stop the worker."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
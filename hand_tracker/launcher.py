@@ -2,18 +2,47 @@
 Simple GUI/console launcher to choose a Hand Tracker mode.
 - Uses Tkinter if available (no extra deps)
 - Falls back to a console prompt otherwise
-- Spawns the main app as a subprocess with selected options
+- Starts the tracker runtime once, then switches its mode over the control socket
+  (a launch lock makes a second click wait for a runtime that is still starting)
 """
 from __future__ import annotations
 import sys
 import subprocess
+import time
 from typing import List
 
+from .runtime import DEFAULT_CONTROL_PORT, claim_launch, launch_pending, send_command
 
-def _launch(args: List[str]) -> None:
-    # Launch the app as a subprocess using the current Python interpreter
-    cmd = [sys.executable, "-m", "hand_tracker.app"] + args
+# Options that only take effect when the runtime starts (camera/loop settings)
+_STARTUP_ONLY = ("--flip",)
+
+
+def _try_switch(command: str) -> bool:
+    try:
+        return send_command(command, DEFAULT_CONTROL_PORT).startswith("ok")
+    except OSError:
+        return False
+
+
+def _launch(args: List[str]) -> str:
+    """Switch a running runtime to the chosen mode, or start one; returns what happened."""
+    mode = args[args.index("--mode") + 1] if "--mode" in args else "default"
+    options = [a for a in args if a not in _STARTUP_ONLY and a not in ("--mode", mode)]
+    command = " ".join(["mode", mode] + options)
+    while True:
+        if _try_switch(command):
+            return f"Switched the running tracker to {mode}"
+        if claim_launch():
+            break
+        # Another launch is starting a runtime: wait for its control port rather than start a second one
+        while launch_pending():
+            if _try_switch(command):
+                return f"Switched the running tracker to {mode}"
+            time.sleep(0.1)
+    # No runtime yet: launch one with the current Python interpreter, keeping it warm for later switches
+    cmd = [sys.executable, "-m", "hand_tracker.runtime", "--launch-time", repr(time.time())] + args
     subprocess.Popen(cmd, close_fds=True)
+    return "Started: python -m hand_tracker.runtime " + " ".join(args)
 
 
 def _console_main() -> None:
@@ -39,8 +68,7 @@ def _console_main() -> None:
     if mode == "vmouse" and vm_scroll:
         args.append("--vm-scroll")
 
-    print("Launching:", "python -m hand_tracker.app", " ".join(args))
-    _launch(args)
+    print(_launch(args))
 
 
 def main() -> None:
@@ -84,10 +112,10 @@ def main() -> None:
         if mode.get() == "vmouse" and vm_scroll.get():
             args.append("--vm-scroll")
         try:
-            _launch(args)
+            status = _launch(args)
             messagebox.showinfo(
                 "Launched",
-                f"Started: python -m hand_tracker.app {' '.join(args)}\nYou can close this window or launch another.",
+                f"{status}\nYou can close this window or launch another mode.",
             )
         except Exception as e:
             messagebox.showerror("Error launching app", str(e))
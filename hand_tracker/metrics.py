@@ -0,0 +1,286 @@
+"""
+Lightweight hot-path instrumentation.
+
+Named spans (``with metrics.active().span("inference"): ...``) are timed with
+``perf_counter`` into fixed-bucket histograms; counters and gauges cover everything else.
+The collected data can be read as a JSON-able ``snapshot()``, rendered as Prometheus text
+(``to_prometheus()``, or periodically rewritten to a file by ``PrometheusFileExporter``),
+or summarized for the on-screen stats panel.
+
+Updates are thread-safe: the pipeline stages record into the same registry concurrently.
+
+Instrumentation is off by default: ``active()`` returns ``NULL``, whose spans are a single
+shared no-op object, so instrumented code costs nothing measurable until ``enable()`` is
+called.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0, 66.0, 133.0, 266.0, 533.0, 1000.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (milliseconds); ``observe`` may be called from any thread."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "_lock")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float) -> None:
+        i = bisect.bisect_left(self.bounds, ms)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += ms
+
+    def state(self):
+        """Consistent ``(counts, count, sum)`` copy for exporters."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile, linearly interpolated inside the matching bucket."""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= target:
+                lo = self.bounds[i - 1] if i > 0 else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lo + (hi - lo) * (target - seen) / c
+            seen += c
+        return self.bounds[-1]
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class _Span:
+    __slots__ = ("_hist", "_t0")
+
+    def __init__(self, hist: Histogram) -> None:
+        self._hist = hist
+        self._t0 = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._hist.observe((time.perf_counter() - self._t0) * 1000.0)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """Registry of span histograms, counters and gauges."""
+
+    enabled = True
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets_ms = tuple(buckets_ms)
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(name, Histogram(self.buckets_ms))
+        return hist
+
+    def span(self, name: str) -> _Span:
+        """Context manager timing its body into the ``name`` histogram."""
+        return _Span(self.histogram(name))
+
+    def observe(self, name: str, ms: float) -> None:
+        self.histogram(name).observe(ms)
+
+    def inc(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value  # a single store: atomic under the GIL
+
+    def snapshot(self) -> Dict:
+        """JSON-able view of everything collected so far."""
+        spans = {}
+        for name, h in list(self.histograms.items()):
+            counts, count, _ = h.state()
+            spans[name] = {
+                "count": count,
+                "mean_ms": round(h.mean, 4),
+                "p50_ms": round(h.quantile(0.50), 4),
+                "p95_ms": round(h.quantile(0.95), 4),
+                "p99_ms": round(h.quantile(0.99), 4),
+                "buckets_ms": list(h.bounds),
+                "bucket_counts": counts,
+            }
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "spans": spans,
+            "counters": counters,
+            "gauges": dict(self.gauges),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def summary_lines(self) -> List[str]:
+        """Short per-span lines for the on-screen stats panel."""
+        lines = []
+        for name, h in list(self.histograms.items()):
+            lines.append(f"{name:<10} p50 {h.quantile(0.5):6.1f}  p95 {h.quantile(0.95):6.1f} ms")
+        for name, v in list(self.gauges.items()):
+            lines.append(f"{name:<10} {v:g}")
+        return lines
+
+    def to_prometheus(self, prefix: str = "hand_tracker") -> str:
+        """Prometheus text exposition format (spans as histograms in seconds)."""
+        out = [
+            f"# HELP {prefix}_stage_seconds Time spent in each pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for name, h in list(self.histograms.items()):
+            counts, count, total = h.state()
+            cum = 0
+            for bound, c in zip(h.bounds, counts):
+                cum += c
+                out.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound / 1000.0:g}"}} {cum}')
+            out.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+            out.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {total / 1000.0:.6f}')
+            out.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {count}')
+        for name, v in list(self.counters.items()):
+            metric = f"{prefix}_{_sanitize(name)}_total"
+            out += [f"# TYPE {metric} counter", f"{metric} {v:g}"]
+        for name, v in list(self.gauges.items()):
+            metric = f"{prefix}_{_sanitize(name)}"
+            out += [f"# TYPE {metric} gauge", f"{metric} {v:g}"]
+        return "\n".join(out) + "\n"
+
+
+class NullMetrics:
+    """Disabled registry: same API as ``Metrics``, every call is a no-op."""
+
+    enabled = False
+
+    def span(self, name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def observe(self, name: str, ms: float) -> None:
+        pass
+
+    def inc(self, name: str, n: float = 1) -> None:
+        pass
+
+    def set_gauge(self, name: str, value: float) -> None:
+        pass
+
+    def snapshot(self) -> Dict:
+        return {}
+
+    def to_json(self) -> str:
+        return "{}"
+
+    def summary_lines(self) -> List[str]:
+        return []
+
+    def to_prometheus(self, prefix: str = "hand_tracker") -> str:
+        return ""
+
+
+NULL = NullMetrics()
+_active = NULL
+
+
+def _sanitize(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def active():
+    """The process-wide registry (``NULL`` unless ``enable()`` was called)."""
+    return _active
+
+
+def enable(registry: Optional[Metrics] = None) -> Metrics:
+    global _active
+    _active = registry if registry is not None else Metrics()
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = NULL
+
+
+class PrometheusFileExporter:
+    """Background thread rewriting a Prometheus text file every ``interval`` seconds.
+
+    The file is replaced atomically so a node_exporter textfile collector never reads a
+    partial write.
+    """
+
+    def __init__(self, registry: Metrics, path: str, interval: float = 5.0) -> None:
+        self.registry = registry
+        self.path = path
+        self.interval = max(0.1, float(interval))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self) -> "PrometheusFileExporter":
+        self._thread.start()
+        return self
+
+    def write(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.registry.to_prometheus())
+        os.replace(tmp, self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        try:
+            self.write()
+        except OSError:
+            pass
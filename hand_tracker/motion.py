@@ -0,0 +1,110 @@
+"""
+Windowed motion statistics over timestamped 2-D positions.
+
+``MotionWindow`` keeps the samples of the last ``window_sec`` seconds in a fixed NumPy
+ring and maintains the sums a least-squares line fit needs as samples enter and leave,
+so ``push`` and every statistic cost the same however many samples the window holds.
+Timestamps are stored relative to an origin that is moved up to the oldest sample (and
+the sums recomputed from the ring) once every ``capacity`` pushes, which keeps the
+running sums well conditioned on long sessions at an amortized O(1) cost.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+class MotionWindow:
+    """Positions ``(x, y)`` seen over the last ``window_sec`` seconds of capture time.
+
+    ``capacity`` bounds the ring; at 30-60 fps the default covers windows of several
+    seconds. A timestamp older than the newest sample (e.g. a replay restarting) clears it.
+    """
+
+    def __init__(self, window_sec: float, capacity: int = 256) -> None:
+        self.window_sec = float(window_sec)
+        self.capacity = max(2, int(capacity))
+        self._buf = np.zeros((self.capacity, 3), np.float64)  # t - origin, x, y
+        self._pushes = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self._head = 0  # slot of the oldest sample
+        self._size = 0
+        self._origin = 0.0
+        self._st = self._sx = self._sy = self._stt = self._stx = self._sty = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _add(self, t: float, x: float, y: float, sign: float) -> None:
+        self._st += sign * t
+        self._sx += sign * x
+        self._sy += sign * y
+        self._stt += sign * t * t
+        self._stx += sign * t * x
+        self._sty += sign * t * y
+
+    def _evict(self) -> None:
+        t, x, y = self._buf[self._head].tolist()
+        self._add(t, x, y, -1.0)
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+
+    def _rebase(self) -> None:
+        """Move the time origin to the oldest sample and recompute the sums from the ring."""
+        idx = (self._head + np.arange(self._size)) % self.capacity
+        t0 = self._buf[self._head, 0]
+        self._buf[idx, 0] -= t0
+        self._origin += t0
+        t, x, y = self._buf[idx].T
+        self._st, self._sx, self._sy = float(t.sum()), float(x.sum()), float(y.sum())
+        self._stt, self._stx, self._sty = float(t @ t), float(t @ x), float(t @ y)
+
+    def push(self, t: float, x: float, y: float) -> None:
+        if self._size == 0:
+            self._origin = t
+        elif t - self._origin < self.newest[0]:
+            self.clear()
+            self._origin = t
+        rt = t - self._origin
+        if self._size == self.capacity:
+            self._evict()
+        slot = (self._head + self._size) % self.capacity
+        self._buf[slot] = (rt, x, y)
+        self._size += 1
+        self._add(rt, float(x), float(y), 1.0)
+        while rt - self._buf[self._head, 0] > self.window_sec:
+            self._evict()
+        self._pushes += 1
+        if self._pushes % self.capacity == 0:
+            self._rebase()
+
+    @property
+    def oldest(self) -> Tuple[float, float, float]:
+        return tuple(self._buf[self._head].tolist())
+
+    @property
+    def newest(self) -> Tuple[float, float, float]:
+        return tuple(self._buf[(self._head + self._size - 1) % self.capacity].tolist())
+
+    def duration(self) -> float:
+        """Seconds between the oldest and the newest sample in the window."""
+        return self.newest[0] - self.oldest[0] if self._size else 0.0
+
+    def displacement(self) -> Tuple[float, float]:
+        """Newest minus oldest position."""
+        if self._size < 2:
+            return 0.0, 0.0
+        _, x0, y0 = self.oldest
+        _, x1, y1 = self.newest
+        return x1 - x0, y1 - y0
+
+    def velocity(self) -> Tuple[float, float]:
+        """Least-squares slope of x and y over time (units per second)."""
+        n = self._size
+        denom = n * self._stt - self._st * self._st
+        if n < 2 or denom <= 1e-12 * max(1.0, n * self._stt):
+            return 0.0, 0.0
+        return (n * self._stx - self._st * self._sx) / denom, (n * self._sty - self._st * self._sy) / denom
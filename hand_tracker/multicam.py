@@ -0,0 +1,501 @@
+"""
+Multi-camera tracking: one capture + inference worker process per source.
+
+Every source gets its own spawned process that owns the device and its own detector, so
+N cameras keep up to N cores busy without sharing a GIL. Frames come back through a
+``multiprocessing.shared_memory`` ring per source (``FrameRing``) instead of being
+pickled; only the small landmark arrays travel over a queue.
+
+``MultiCamera`` merges the per-source results into one timestamp-aligned stream and,
+like ``recording.ReplaySource``, stands in for both ``Camera`` and ``HandDetector``:
+``read()`` returns a tiled preview of all sources and ``detect()`` the hands of every
+source, remapped into the preview's coordinates, so modes, overlays and the recorder
+work unchanged.
+
+Source specs: a camera index (``0``), a video file, a session log (``*.htrk``, replayed
+with its recorded landmarks) or ``synthetic[:WxH[@FPS]]`` for a generated test pattern.
+
+Throughput check (run with 1..N sources and compare the per-source rates)::
+
+    python -m hand_tracker.multicam 0 1 --seconds 10
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from . import metrics as _metrics
+from .frames import FramePool
+from .hands import FrameHands
+
+_HEADER = np.dtype([("seq", "<i8"), ("ts", "<f8")])
+
+
+class FrameRing:
+    """Fixed frame slots in shared memory, written by one process and read by others.
+
+    Each slot carries the sequence number and timestamp of the frame in it. The writer
+    marks a slot busy (``seq = -1``) while filling it and readers re-check the sequence
+    number after copying out, so a frame overwritten mid-read is reported as missing
+    instead of returned torn. Pass ``name`` to attach to a ring created elsewhere.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], slots: int = 4, name: Optional[str] = None) -> None:
+        self.shape = tuple(int(s) for s in shape)
+        self.slots = max(2, int(slots))
+        self.owner = name is None
+        header_bytes = -(-self.slots * _HEADER.itemsize // 64) * 64
+        size = header_bytes + self.slots * int(np.prod(self.shape))
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.header = np.ndarray((self.slots,), _HEADER, buffer=self.shm.buf)
+        self.frames = np.ndarray((self.slots,) + self.shape, np.uint8, buffer=self.shm.buf, offset=header_bytes)
+        if self.owner:
+            self.header["seq"] = -1
+            self.header["ts"] = 0.0
+        self.seq = 0  # last sequence number written by this side
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, frame: np.ndarray, timestamp: float) -> int:
+        """Store ``frame`` (resized to the ring shape if needed); returns its sequence number."""
+        seq = self.seq + 1
+        slot = seq % self.slots
+        self.header["seq"][slot] = -1
+        dst = self.frames[slot]
+        if frame.shape == self.shape:
+            np.copyto(dst, frame)
+        else:
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=dst, interpolation=cv2.INTER_AREA)
+        self.header["ts"][slot] = timestamp
+        self.header["seq"][slot] = seq
+        self.seq = seq
+        return seq
+
+    def read(self, seq: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Copy frame ``seq`` into ``out`` (or a new array); None if it was overwritten."""
+        slot = seq % self.slots
+        if self.header["seq"][slot] != seq:
+            return None
+        if out is None:
+            out = self.frames[slot].copy()
+        else:
+            np.copyto(out, self.frames[slot])
+        if self.header["seq"][slot] != seq:
+            return None
+        return out
+
+    def close(self) -> None:
+        if self.shm is None:
+            return
+        # The NumPy views pin the mapping; drop them before closing it
+        self.header = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+
+# --- Sources -----------------------------------------------------------------------
+
+
+class _SyntheticSource:
+    """Moving test pattern paced at ``fps``; never finishes."""
+
+    def __init__(self, width: int, height: int, fps: float) -> None:
+        self.width, self.height = width, height
+        self.period = 1.0 / max(1e-3, fps)
+        self.finished = False
+        self._i = 0
+        self._next = time.perf_counter()
+        ramp = np.linspace(40, 140, width, dtype=np.uint8)
+        self._background = np.dstack([np.tile(ramp, (height, 1))] * 3)
+        self._frame = np.empty_like(self._background)
+
+    def read(self):
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + self.period, time.perf_counter() - self.period)
+        np.copyto(self._frame, self._background)
+        x = int((0.5 + 0.4 * math.sin(self._i * 0.1)) * self.width)
+        cv2.circle(self._frame, (x, self.height // 2), max(4, self.height // 8), (60, 180, 240), -1)
+        cv2.putText(self._frame, str(self._i), (8, 24), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        self._i += 1
+        return True, self._frame
+
+    def release(self) -> None:
+        pass
+
+
+class _VideoSource:
+    """Video file played back at its own frame rate."""
+
+    def __init__(self, path: str) -> None:
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video {path}")
+        self.period = 1.0 / (self.cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        self.finished = False
+        self._next = time.perf_counter()
+
+    def read(self):
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + self.period, time.perf_counter() - self.period)
+        ok, frame = self.cap.read()
+        if not ok:
+            self.finished = True
+        return ok, frame
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+def parse_synthetic(spec: str) -> Tuple[int, int, float]:
+    """``synthetic[:WxH[@FPS]]`` -> (width, height, fps); defaults 640x480 @ 30."""
+    width, height, fps = 640, 480, 30.0
+    rest = spec.partition(":")[2]
+    if rest:
+        size, _, rate = rest.partition("@")
+        if size:
+            w, _, h = size.lower().partition("x")
+            width, height = int(w), int(h)
+        if rate:
+            fps = float(rate)
+    return width, height, fps
+
+
+def _open_source(spec: str, opts: Dict):
+    """Return ``(source, detector)`` for a source spec; ``detector`` may be None."""
+    if spec.startswith("synthetic"):
+        source = _SyntheticSource(*parse_synthetic(spec))
+    elif spec.endswith(".htrk"):
+        from .recording import ReplaySource
+
+        source = ReplaySource(spec, realtime=True, loop=opts.get("loop", False))
+        return source, source  # recorded landmarks stand in for the detector
+    elif spec.isdigit():
+        from .camera import Camera
+
+        source = Camera(int(spec), opts.get("width"), opts.get("height"))
+    else:
+        source = _VideoSource(spec)
+    detector = None
+    if opts.get("detect", True):
+        from .hands import HandDetector
+
+        detector = HandDetector(
+            max_num_hands=opts.get("max_hands", 2),
+            model_complexity=opts.get("complexity", 1),
+            detection_confidence=opts.get("det", 0.5),
+            tracking_confidence=opts.get("track", 0.5),
+            roi=opts.get("roi", False),
+        )
+    return source, detector
+
+
+def _camera_worker(index: int, spec: str, ring_name: str, shape, slots: int, results, stop, opts: Dict) -> None:
+    """Worker process: capture, detect, publish the frame to the ring and the landmarks to ``results``."""
+    ring = FrameRing(shape, slots, name=ring_name)
+    source = detector = None
+    try:
+        source, detector = _open_source(spec, opts)
+        replay = detector is source
+        stamped = spec.isdigit()  # Camera stamps frames at capture; other sources here
+        while not stop.is_set():
+            ok, frame = source.read()
+            if not ok:
+                if getattr(source, "finished", False):
+                    break
+                time.sleep(0.005)
+                continue
+            ts = source.last_timestamp if stamped else time.time()
+            if opts.get("flip") and not replay:  # recorded sessions are already mirrored
+                frame = cv2.flip(frame, 1)
+            if detector is not None:
+                hands = detector.detect(frame, ts)
+            else:
+                hands = FrameHands.empty(frame.shape[1], frame.shape[0], ts)
+            seq = ring.write(frame, ts)
+            results.put((index, seq, ts, hands.norm, hands.handedness, hands.scores))
+    except Exception as exc:
+        print(f"Source {spec}: {exc}", file=sys.stderr)
+    finally:
+        results.put((index, None, 0.0, None, None, None))  # end of stream
+        if detector is not None and detector is not source:
+            detector.close()
+        if source is not None:
+            source.release()
+        ring.close()
+
+
+# --- Merged stream -----------------------------------------------------------------
+
+
+class _Result:
+    __slots__ = ("seq", "ts", "norm", "handedness", "scores")
+
+    def __init__(self, seq, ts, norm, handedness, scores) -> None:
+        self.seq, self.ts, self.norm, self.handedness, self.scores = seq, ts, norm, handedness, scores
+
+
+class MultiCamera:
+    """Several sources, each captured and tracked in its own process, read as one stream.
+
+    Each ``read()`` waits for a new aligned moment: the reference time is the newest
+    capture time of the slowest source, and every other source contributes its result
+    captured closest to it. ``read()`` returns the sources tiled ``cols`` wide (each
+    resized to ``width`` x ``height``) and ``detect()`` the hands of all sources in tile
+    coordinates. Per-source results of the last read are in ``last_hands`` (source
+    coordinates) and ``hand_sources`` maps each merged hand to its source index.
+
+    With ``reuse_buffers=True`` the tiled frame is written into a pair of pooled
+    buffers, so it stays valid until the next-but-one read.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[str],
+        width: int = 640,
+        height: int = 480,
+        slots: int = 4,
+        history: int = 8,
+        cols: Optional[int] = None,
+        detect: bool = True,
+        flip: bool = False,
+        max_hands: int = 2,
+        complexity: int = 1,
+        det: float = 0.5,
+        track: float = 0.5,
+        roi: bool = False,
+        loop: bool = False,
+        reuse_buffers: bool = False,
+        startup_timeout: float = 30.0,
+    ) -> None:
+        if not sources:
+            raise ValueError("MultiCamera needs at least one source")
+        self.sources = [str(s) for s in sources]
+        self.width, self.height = int(width), int(height)
+        n = len(self.sources)
+        self.cols = max(1, min(n, cols or math.ceil(math.sqrt(n))))
+        self.rows = math.ceil(n / self.cols)
+        self.startup_timeout = startup_timeout
+        self.finished = False
+        self.frames_received = [0] * n
+        self.frames_used = [0] * n
+        self.torn_reads = 0
+        self.skew = 0.0
+        self.last_hands: List[FrameHands] = [FrameHands.empty(self.width, self.height) for _ in range(n)]
+        self.hand_sources = np.zeros(0, np.int32)
+        self._history: List[Deque[_Result]] = [deque(maxlen=max(2, history)) for _ in range(n)]
+        self._ended = [False] * n
+        self._last_seq = [0] * n
+        self._last_ref = -math.inf
+        self._current = FrameHands.empty(self.width * self.cols, self.height * self.rows)
+        self._pool = FramePool(count=2) if reuse_buffers else None
+        self._started = time.time()
+        self._got_frame = False
+
+        opts = {"detect": detect, "flip": flip, "max_hands": max_hands, "complexity": complexity,
+                "det": det, "track": track, "roi": roi, "loop": loop, "width": width, "height": height}
+        ctx = multiprocessing.get_context("spawn")
+        self._results = ctx.Queue()
+        self._stop = ctx.Event()
+        shape = (self.height, self.width, 3)
+        self._rings = [FrameRing(shape, slots) for _ in self.sources]
+        self._procs = []
+        for i, spec in enumerate(self.sources):
+            p = ctx.Process(
+                target=_camera_worker,
+                args=(i, spec, self._rings[i].name, shape, slots, self._results, self._stop, opts),
+                name=f"camera-{i}",
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @property
+    def frames_dropped(self) -> int:
+        """Results that were superseded before any aligned read used them."""
+        return sum(self.frames_received) - sum(self.frames_used)
+
+    def _receive(self, timeout: float) -> bool:
+        """Move queued worker results into the per-source histories; False on timeout."""
+        try:
+            msg = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        while True:
+            index, seq, ts, norm, handedness, scores = msg
+            if seq is None:
+                self._ended[index] = True
+            else:
+                self._history[index].append(_Result(seq, ts, norm, handedness, scores))
+                self.frames_received[index] += 1
+            try:
+                msg = self._results.get_nowait()
+            except queue.Empty:
+                return True
+
+    def _aligned(self) -> Optional[List[Optional[_Result]]]:
+        live = [i for i, h in enumerate(self._history) if h and not self._ended[i]]
+        waiting = [i for i, h in enumerate(self._history) if not h and not self._ended[i]]
+        if not live or waiting:
+            return None
+        ref = min(self._history[i][-1].ts for i in live)
+        if ref <= self._last_ref:
+            return None
+        self._last_ref = ref
+        group: List[Optional[_Result]] = [None] * len(self.sources)
+        for i in live:
+            group[i] = min(self._history[i], key=lambda r: abs(r.ts - ref))
+        return group
+
+    def read(self, timeout: float = 1.0):
+        """Return (ok, tiled frame) for the next aligned moment."""
+        deadline = time.time() + (timeout if self._got_frame else self.startup_timeout)
+        group = self._aligned()
+        while group is None:
+            if all(self._ended):
+                self.finished = True
+                return False, None
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False, None
+            if not self._receive(min(remaining, 0.1)):
+                # A worker that died (e.g. killed by a signal) never sends its end marker
+                for i, p in enumerate(self._procs):
+                    if not p.is_alive():
+                        self._ended[i] = True
+            group = self._aligned()
+        self._got_frame = True
+
+        shape = (self.height * self.rows, self.width * self.cols, 3)
+        tiles = self._pool.buffer("tiles", shape) if self._pool is not None else np.empty(shape, np.uint8)
+        merged_norm, labels, scores, owners = [], [], [], []
+        ref = self._last_ref
+        skew = 0.0
+        for i, res in enumerate(group):
+            r, c = divmod(i, self.cols)
+            tile = tiles[r * self.height:(r + 1) * self.height, c * self.width:(c + 1) * self.width]
+            if res is None or self._rings[i].read(res.seq, out=tile) is None:
+                tile[...] = 0
+                if res is not None:
+                    self.torn_reads += 1
+                self.last_hands[i] = FrameHands.empty(self.width, self.height, ref)
+                continue
+            if res.seq != self._last_seq[i]:
+                self._last_seq[i] = res.seq
+                self.frames_used[i] += 1
+            skew = max(skew, abs(res.ts - ref))
+            self.last_hands[i] = FrameHands(res.norm, res.handedness, res.scores, self.width, self.height, res.ts)
+            if len(res.norm):
+                norm = np.array(res.norm, np.float32)
+                norm[..., 0] = (c + norm[..., 0]) / self.cols
+                norm[..., 1] = (r + norm[..., 1]) / self.rows
+                merged_norm.append(norm)
+                labels.extend(res.handedness)
+                scores.append(res.scores)
+                owners.extend([i] * len(norm))
+        # Tiles left over in the last row
+        for i in range(len(self.sources), self.rows * self.cols):
+            r, c = divmod(i, self.cols)
+            tiles[r * self.height:(r + 1) * self.height, c * self.width:(c + 1) * self.width] = 0
+
+        self.skew = skew
+        if merged_norm:
+            self._current = FrameHands(np.concatenate(merged_norm), labels, np.concatenate(scores),
+                                       shape[1], shape[0], ref)
+        else:
+            self._current = FrameHands.empty(shape[1], shape[0], ref)
+        self.hand_sources = np.asarray(owners, np.int32)
+        _metrics.active().set_gauge("sync_skew_ms", round(skew * 1000.0, 1))
+        return True, tiles
+
+    @property
+    def last_timestamp(self) -> float:
+        """Reference capture time of the last aligned read."""
+        return self._current.timestamp
+
+    def rates(self) -> List[float]:
+        """Results per second received from each source since start."""
+        elapsed = max(1e-6, time.time() - self._started)
+        return [n / elapsed for n in self.frames_received]
+
+    # --- Detector interface --------------------------------------------------------
+
+    def detect(self, frame_bgr=None, timestamp: Optional[float] = None, rgb=None) -> FrameHands:
+        """Merged hands of the last ``read()``, in tiled-frame coordinates."""
+        return self._current
+
+    def release(self) -> None:
+        if not self._procs:
+            return
+        self._stop.set()
+        deadline = time.time() + 5.0
+        # Keep draining so no worker blocks on a full queue pipe while exiting
+        while any(p.is_alive() for p in self._procs) and time.time() < deadline:
+            self._receive(0.05)
+        for p in self._procs:
+            if p.is_alive():
+                p.terminate()
+            p.join(timeout=1.0)
+        self._procs = []
+        self._results.close()
+        for ring in self._rings:
+            ring.close()
+
+    close = release
+
+
+def build_argparser():
+    p = argparse.ArgumentParser(description="Measure multi-source capture + tracking throughput")
+    p.add_argument("sources", nargs="+", help="Camera index, video file, .htrk log or synthetic[:WxH[@FPS]]")
+    p.add_argument("--width", type=int, default=640, help="Tile width every source is resized to")
+    p.add_argument("--height", type=int, default=480, help="Tile height every source is resized to")
+    p.add_argument("--seconds", type=float, default=10.0)
+    p.add_argument("--no-detect", action="store_true", help="Capture only, skip hand detection")
+    p.add_argument("--complexity", type=int, default=1, choices=[0, 1, 2])
+    return p
+
+
+def main(argv=None):
+    args = build_argparser().parse_args(argv)
+    cams = MultiCamera(args.sources, args.width, args.height, detect=not args.no_detect,
+                       complexity=args.complexity, reuse_buffers=True)
+    merged = 0
+    try:
+        ok, _ = cams.read()  # wait for every worker to come up
+        t0 = time.time()
+        base = list(cams.frames_received)
+        while ok and time.time() - t0 < args.seconds:
+            ok, _ = cams.read()
+            merged += ok
+        elapsed = max(1e-6, time.time() - t0)
+    finally:
+        cams.release()
+    for spec, n0, n in zip(cams.sources, base, cams.frames_received):
+        print(f"{spec}: {(n - n0) / elapsed:.1f} fps")
+    print(f"merged: {merged / elapsed:.1f} fps, {os.cpu_count()} cores")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,123 @@
+import functools
+from typing import List, NamedTuple, Tuple
+
 import cv2
 import mediapipe as mp
-from typing import Tuple
+import numpy as np
 
+from .hands import FrameHands
 
 mp_drawing = mp.solutions.drawing_utils
 mp_styles = mp.solutions.drawing_styles
 mp_hands = mp.solutions.hands
 
+_WHITE = (224, 224, 224)  # mp drawing_utils WHITE_COLOR, used for keypoint borders
+_PIXEL = np.dtype((np.void, 3))  # one BGR pixel as a single element, for cheap scatters
+
+
+class _HandStyle(NamedTuple):
+    pairs: np.ndarray  # (S, 2) connection (start, end) landmarks, grouped by style
+    groups: List[Tuple[Tuple[int, int, int], int, slice]]  # (color, thickness, slice of pairs)
+    offsets: np.ndarray  # (K, 2) (dy, dx) pixels of one keypoint: white border ring, then fill disc
+    colors: np.ndarray  # (21, K, 3) uint8 color of each of those pixels, per landmark
+    pixels: np.ndarray  # (21, K) the same colors viewed as ``_PIXEL``
+    radius: int  # border disc radius
+
+
+def _disc_offsets(radius: int) -> np.ndarray:
+    canvas = np.zeros((2 * radius + 1, 2 * radius + 1), np.uint8)
+    cv2.circle(canvas, (radius, radius), radius, 255, -1)
+    return np.argwhere(canvas) - radius
+
+
+@functools.lru_cache(maxsize=1)
+def _hand_style() -> _HandStyle:
+    """MediaPipe's default hand style, converted once into arrays grouped by color."""
+    lm_style = mp_styles.get_default_hand_landmarks_style()
+    conn_style = mp_styles.get_default_hand_connections_style()
+    by_style = {}
+    for (a, b), spec in sorted(conn_style.items()):
+        by_style.setdefault((tuple(spec.color), spec.thickness), []).append((a, b))
+    pairs, groups = [], []
+    for (color, thickness), group in by_style.items():
+        groups.append((color, thickness, slice(len(pairs), len(pairs) + len(group))))
+        pairs += group
+    specs = [lm_style[i] for i in range(len(lm_style))]
+    radius = specs[0].circle_radius
+    if not all(sp.circle_radius == radius and sp.thickness < 0 for sp in specs):
+        raise ValueError("Batched hand drawing needs filled, equal-size keypoints in the MediaPipe hand style")
+    border_radius = max(radius + 1, int(radius * 1.2))
+    fill = _disc_offsets(radius)
+    # The fill disc overwrites the middle of the border disc, so only the ring is stamped
+    border = np.array(sorted(set(map(tuple, _disc_offsets(border_radius))) - set(map(tuple, fill))))
+    colors = np.empty((len(specs), len(border) + len(fill), 3), np.uint8)
+    colors[:, : len(border)] = _WHITE
+    colors[:, len(border):] = np.array([sp.color for sp in specs], np.uint8)[:, None]
+    pixels = colors.view(_PIXEL)[..., 0]
+    return _HandStyle(np.array(pairs), groups, np.concatenate([border, fill]), colors, pixels, border_radius)
+
+
+@functools.lru_cache(maxsize=8)
+def _flat_offsets(width: int) -> np.ndarray:
+    offsets = _hand_style().offsets
+    return offsets[:, 0] * width + offsets[:, 1]
+
 
 def draw_hands(image, results, draw: bool = True):
+    """Draw every hand's skeleton, matching ``draw_hands_mp`` pixel for pixel on a single hand.
+
+    Connections are batched into one ``cv2.polylines`` call per style color and all
+    keypoints are stamped into the image with a single fancy-indexed assignment.
+    Accepts a ``FrameHands`` or raw MediaPipe results.
+    """
+    if not draw or results is None:
+        return image
+    hands = FrameHands.of(results, image)
+    if len(hands) == 0:
+        return image
+    style = _hand_style()
+    h, w = image.shape[:2]
+    xy = hands.norm[..., :2].astype(np.float64)
+    # Same rules as drawing_utils: skip landmarks outside the image, floor and clamp the rest
+    valid = ((xy >= 0.0) & (xy <= 1.0)).all(axis=-1)
+    px = np.minimum(np.floor(xy * (w, h)), (w - 1, h - 1)).astype(np.int32)
+    all_valid = valid.all()
+
+    segs = px[:, style.pairs]  # (n, S, 2, 2)
+    if not all_valid:
+        ok = valid[:, style.pairs].all(axis=-1)
+    for color, thickness, sl in style.groups:
+        group = segs[:, sl].reshape(-1, 2, 2) if all_valid else segs[:, sl][ok[:, sl]]
+        if len(group):
+            cv2.polylines(image, group, False, color, thickness)
+
+    r = style.radius
+    if all_valid:
+        centers = px.reshape(-1, 2)
+        lo, hi = centers.min(axis=0), centers.max(axis=0)
+        if (
+            lo[0] >= r and lo[1] >= r and hi[0] < w - r and hi[1] < h - r
+            and image.flags.c_contiguous and image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3
+        ):
+            # Keypoints clear of the edges: scatter whole pixels through flat indices, in order
+            # each keypoint's border, then its fill, then the next keypoint
+            flat = (centers[:, 1] * w + centers[:, 0])[:, None] + _flat_offsets(w)
+            pixels = style.pixels if len(hands) == 1 else np.tile(style.pixels, (len(hands), 1))
+            image.view(_PIXEL).reshape(-1)[flat.ravel()] = pixels.ravel()
+            return image
+        lm_i = np.tile(np.arange(valid.shape[1]), len(hands))
+    else:
+        hand_i, lm_i = np.nonzero(valid)
+        centers = px[hand_i, lm_i]
+    ys = centers[:, 1:2] + style.offsets[:, 0]
+    xs = centers[:, 0:1] + style.offsets[:, 1]
+    inside = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+    image[ys[inside], xs[inside]] = style.colors[lm_i][inside]
+    return image
+
+
+def draw_hands_mp(image, results, draw: bool = True):
+    """Reference renderer using ``mp.solutions.drawing_utils`` (kept for comparison benchmarks)."""
     if not draw or results is None or not getattr(results, "multi_hand_landmarks", None):
         return image
     for hand_landmarks in results.multi_hand_landmarks:
@@ -22,6 +131,11 @@ def draw_hands(image, results, draw: bool = True):
     return image
 
 
+@functools.lru_cache(maxsize=512)
+def _text_size(text: str, font: int, scale: float, thickness: int):
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
 def draw_fps(image, fps: float):
     cv2.putText(
         image,
@@ -35,6 +149,36 @@ def draw_fps(image, fps: float):
     )
 
 
+def draw_stats(image, lines, origin: Tuple[int, int] = (10, 90)):
+    """Draw a translucent panel with one line of text per entry (e.g. ``Metrics.summary_lines()``)."""
+    if not lines:
+        return image
+    x, y = origin
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    scale, thickness, line_h = 0.45, 1, 18
+    width = max(_text_size(line, font, scale, thickness)[0][0] for line in lines) + 12
+    h, w = image.shape[:2]
+    x1, y1 = min(w, x + width), min(h, y + line_h * len(lines) + 8)
+    if x1 > x and y1 > y:
+        roi = image[y:y1, x:x1]
+        roi[:] = (roi * 0.4).astype(roi.dtype)
+    for i, line in enumerate(lines):
+        cv2.putText(image, line, (x + 6, y + 16 + i * line_h), font, scale, (255, 255, 255), thickness, cv2.LINE_AA)
+    return image
+
+
+@functools.lru_cache(maxsize=128)
+def _label_sprite(text: str, scale: float, thickness: int, bg: Tuple[int, ...], fg: Tuple[int, ...]):
+    """Pre-rendered label box, plus the offset of its top-left corner from the text origin."""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (w, h), baseline = _text_size(text, font, scale, thickness)
+    pad = 6
+    top, bottom = h + pad * 2, baseline + pad // 2
+    sprite = np.empty((top + bottom + 1, w + pad * 2 + 1, 3), np.uint8)
+    sprite[:] = bg
+    cv2.putText(sprite, text, (pad, top - pad), font, scale, fg, thickness, cv2.LINE_AA)
+    sprite.flags.writeable = False
+    return sprite, top
 
 
 def draw_label(image, text: str, origin: Tuple[int, int], bg=(0, 0, 0), fg=(255, 255, 255)):
@@ -43,7 +187,14 @@ def draw_label(image, text: str, origin: Tuple[int, int], bg=(0, 0, 0), fg=(255,
     font = cv2.FONT_HERSHEY_SIMPLEX
     scale = 0.6
     thickness = 2
-    (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+    sprite, top = _label_sprite(text, scale, thickness, tuple(bg), tuple(fg))
+    y0 = y - top
+    ih, iw = image.shape[:2]
+    if x >= 0 and y0 >= 0 and x + sprite.shape[1] <= iw and y0 + sprite.shape[0] <= ih and image.ndim == 3 and image.dtype == np.uint8:
+        image[y0:y0 + sprite.shape[0], x:x + sprite.shape[1]] = sprite
+        return image
+    # Box touches an image edge: draw directly so clipping matches exactly
+    (w, h), baseline = _text_size(text, font, scale, thickness)
     pad = 6
     top_left = (max(0, x), max(0, y - h - pad * 2))
     bottom_right = (max(0, x) + w + pad * 2, max(0, y + baseline + pad // 2))
@@ -0,0 +1,145 @@
+"""
+Pipelined frame executor.
+
+Runs the per-frame stages (capture -> detect -> mode logic -> render) concurrently on
+worker threads connected by bounded queues, so throughput is limited by the slowest
+stage instead of the sum of all of them. The last queue is drained by the caller,
+which keeps GUI calls (cv2.imshow/waitKey) on the main thread.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+POLICIES = ("drop", "block")
+
+
+class BoundedQueue:
+    """Small FIFO between two stages.
+
+    When full, ``policy="drop"`` evicts the oldest item (the consumer always sees the
+    freshest frames) while ``policy="block"`` makes the producer wait for space.
+    """
+
+    def __init__(self, name: str, maxsize: int = 2, policy: str = "drop") -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}; expected one of {POLICIES}")
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.dropped = 0
+        self.total = 0
+        self._items: Deque[Any] = deque()
+        self._cond = threading.Condition()
+
+    def put(self, item: Any, stop: Optional[threading.Event] = None) -> bool:
+        """Enqueue ``item``; returns False if it was abandoned because ``stop`` got set."""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                if self.policy == "drop":
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._items) >= self.maxsize:
+                        if stop is not None and stop.is_set():
+                            return False
+                        self._cond.wait(0.05)
+            self._items.append(item)
+            self.total += 1
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Dequeue the oldest item, raising ``queue.Empty`` after ``timeout`` seconds."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: bool(self._items), timeout=timeout):
+                raise queue.Empty
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._items), "maxsize": self.maxsize, "dropped": self.dropped, "total": self.total}
+
+
+class Pipeline:
+    """Chain of stages connected by ``BoundedQueue``s, one worker thread per stage.
+
+    ``source`` is called repeatedly on its own thread and returns the next item (or None
+    to skip). Each stage is a ``(name, fn)`` pair; ``fn(item)`` returns the item for the
+    next stage or None to discard it. Results of the last stage are fetched with ``get``.
+    """
+
+    def __init__(
+        self,
+        source: Tuple[str, Callable[[], Any]],
+        stages: Sequence[Tuple[str, Callable[[Any], Any]]],
+        depth: int = 2,
+        policy: str = "drop",
+    ) -> None:
+        self.source = source
+        self.stages = list(stages)
+        names = [source[0]] + [name for name, _ in self.stages]
+        self.queues: List[BoundedQueue] = [
+            BoundedQueue(f"{a}->{b}", depth, policy) for a, b in zip(names, names[1:] + ["out"])
+        ]
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.error: Optional[BaseException] = None
+
+    def _run_source(self) -> None:
+        _, fn = self.source
+        out = self.queues[0]
+        try:
+            while not self._stop.is_set():
+                item = fn()
+                if item is not None:
+                    out.put(item, self._stop)
+        except BaseException as e:  # surface worker failures to the consumer
+            self.error = e
+            self._stop.set()
+
+    def _run_stage(self, idx: int) -> None:
+        _, fn = self.stages[idx]
+        inq, outq = self.queues[idx], self.queues[idx + 1]
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = inq.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                item = fn(item)
+                if item is not None:
+                    outq.put(item, self._stop)
+        except BaseException as e:
+            self.error = e
+            self._stop.set()
+
+    def start(self) -> "Pipeline":
+        self._threads = [threading.Thread(target=self._run_source, name=f"stage-{self.source[0]}", daemon=True)]
+        for i, (name, _) in enumerate(self.stages):
+            self._threads.append(threading.Thread(target=self._run_stage, args=(i,), name=f"stage-{name}", daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Return the next output item, or raise ``queue.Empty``; re-raises worker errors."""
+        if self.error is not None:
+            raise self.error
+        return self.queues[-1].get(timeout=timeout)
+
+    def occupancy(self) -> Dict[str, Dict[str, Any]]:
+        """Per-queue size/maxsize/dropped counters, keyed by ``producer->consumer``."""
+        return {q.name: q.stats() for q in self.queues}
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
@@ -0,0 +1,217 @@
+"""
+Adaptive inference quality: hold a per-frame detector budget by tuning parameters live.
+
+``QualityController`` wraps the detector and walks a ladder of ``QualityLevel``s, from the
+configured quality down to the cheapest settings. Each level sets three things: how much the
+frame is downscaled before inference, ``model_complexity``, and ``max_num_hands``. The
+controller measures what detection actually costs, in windows of frames:
+
+- a window whose 90th percentile exceeds the budget steps one level down;
+- stepping back up needs several consecutive windows below ``up_ratio`` of the budget
+  (hysteresis), and the cost of the level above, predicted from the cost ratio measured
+  the last time the controller moved between the two, must fit the budget. A level that
+  had to be left for being too slow also needs twice as many calm windows each time.
+
+Scale changes apply on the next frame. A complexity or hand-count change builds a new
+detector on a background thread and warms it on a dummy frame. The current detector keeps
+serving frames until the new one is swapped in. Every decision is kept in ``decisions``,
+printed to stderr and emitted as a ``quality`` event.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from . import events as _events
+from . import metrics as _metrics
+from .frames import FramePool
+from .hands import FrameHands
+
+
+class QualityLevel(NamedTuple):
+    scale: float  # inference input size relative to the captured frame
+    complexity: int
+    max_hands: int
+
+    def __str__(self) -> str:
+        return f"scale {self.scale:g}, complexity {self.complexity}, max hands {self.max_hands}"
+
+
+def default_ladder(
+    complexity: int = 1, max_hands: int = 2, scales: Sequence[float] = (1.0, 0.75, 0.5)
+) -> List[QualityLevel]:
+    """Levels from ``(scales[0], complexity, max_hands)`` down to the cheapest setting.
+
+    Steps alternate between the next smaller scale and the next lower complexity, so every
+    step changes one parameter; dropping to a single hand is the last resort.
+    """
+    scales = sorted({float(s) for s in scales}, reverse=True)
+    s, c = 0, int(complexity)
+    ladder = [QualityLevel(scales[0], c, max_hands)]
+    shrink = True
+    while s < len(scales) - 1 or c > 0:
+        if (shrink and s < len(scales) - 1) or c == 0:
+            s += 1
+        else:
+            c -= 1
+        shrink = not shrink
+        ladder.append(QualityLevel(scales[s], c, max_hands))
+    if max_hands > 1:
+        ladder.append(QualityLevel(scales[-1], 0, 1))
+    return ladder
+
+
+class QualityController:
+    """Detector wrapper that keeps detection within ``budget_ms`` per frame.
+
+    ``factory(complexity, max_hands)`` builds a detector (``HandDetector``-like). ``window``
+    frames make one measurement; ``up_windows`` calm windows are needed before stepping up.
+    ``warm_shape`` is the dummy frame new detectors are warmed on.
+    """
+
+    def __init__(
+        self,
+        factory: Callable,
+        budget_ms: float,
+        ladder: Optional[Sequence[QualityLevel]] = None,
+        window: int = 30,
+        up_ratio: float = 0.6,
+        up_windows: int = 3,
+        max_up_windows: int = 48,
+        warm_shape=(480, 640, 3),
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.factory = factory
+        self.budget_ms = float(budget_ms)
+        self.ladder = list(ladder or default_ladder())
+        self.window = max(2, int(window))
+        self.up_ratio = float(up_ratio)
+        self.up_windows = max(1, int(up_windows))
+        self.max_up_windows = max(self.up_windows, int(max_up_windows))
+        self.warm_shape = tuple(warm_shape)
+        self.clock = clock
+
+        self.level = 0
+        top = self.ladder[0]
+        self.detector = factory(top.complexity, top.max_hands)
+        self.decisions: List[Dict] = []
+        self.cost_ms: Dict[int, float] = {}  # level -> last measured p90
+        self._ratio: Dict[int, float] = {}  # level -> cost(level) / cost(level + 1)
+        self._moved = None  # (from_level, p90 there) until the new level has been measured
+        self._patience: Dict[int, int] = {}
+        self._calm = 0
+        self._costs = np.zeros(self.window, np.float64)
+        self._n = 0
+        self._rebuild: Optional[threading.Thread] = None
+        self._ready = None  # (level, detector) once a background rebuild finished
+        self._pool = FramePool(count=1)
+
+    @property
+    def current(self) -> QualityLevel:
+        return self.ladder[self.level]
+
+    def detect(self, frame_bgr, timestamp: Optional[float] = None, rgb=None) -> FrameHands:
+        if self._ready is not None:
+            self._swap()
+        scale = self.current.scale
+        t0 = self.clock()
+        if scale < 1.0:
+            h, w = frame_bgr.shape[:2]
+            size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+            dst = self._pool.buffer("scaled", (size[1], size[0]) + frame_bgr.shape[2:])
+            small = cv2.resize(frame_bgr, size, dst=dst, interpolation=cv2.INTER_AREA)
+            found = self.detector.detect(small, timestamp)
+            # Normalized landmarks are resolution independent; only the pixel frame changes
+            hands = FrameHands(found.norm, found.handedness, found.scores, w, h, found.timestamp)
+        else:
+            hands = self.detector.detect(frame_bgr, timestamp, rgb=rgb)
+        self._observe((self.clock() - t0) * 1000.0)
+        return hands
+
+    def _observe(self, ms: float) -> None:
+        self._costs[self._n % self.window] = ms
+        self._n += 1
+        if self._n % self.window or self._rebuild is not None:
+            return
+        p90 = float(np.percentile(self._costs, 90))
+        self.cost_ms[self.level] = p90
+        if self._moved is not None:
+            (prev, prev_p90), self._moved = self._moved, None
+            if abs(prev - self.level) == 1 and p90 > 0 and prev_p90 > 0:
+                upper = min(prev, self.level)
+                self._ratio[upper] = prev_p90 / p90 if prev == upper else p90 / prev_p90
+        metrics = _metrics.active()
+        metrics.set_gauge("quality_level", self.level)
+        metrics.set_gauge("quality_detect_p90_ms", round(p90, 2))
+        if p90 > self.budget_ms:
+            self._calm = 0
+            if self.level < len(self.ladder) - 1:
+                # Coming back here will take longer each time it proves too slow
+                patience = 2 * self._patience.get(self.level, self.up_windows)
+                self._patience[self.level] = min(self.max_up_windows, patience)
+                self._move(self.level + 1, "over budget", p90)
+        elif (
+            self.level > 0
+            and p90 < self.budget_ms * self.up_ratio
+            and p90 * self._ratio.get(self.level - 1, 1.0) <= self.budget_ms
+        ):
+            self._calm += 1
+            if self._calm >= self._patience.get(self.level - 1, self.up_windows):
+                self._move(self.level - 1, "under budget", p90)
+        else:
+            self._calm = 0
+
+    def _move(self, target: int, reason: str, p90: float) -> None:
+        old, new = self.ladder[self.level], self.ladder[target]
+        decision = dict(
+            t=round(time.time(), 3), reason=reason, detect_p90_ms=round(p90, 2), budget_ms=self.budget_ms,
+            from_level=self.level, to_level=target, scale=new.scale, complexity=new.complexity,
+            max_hands=new.max_hands,
+        )
+        self.decisions.append(decision)
+        _events.active().emit("quality", **{k: v for k, v in decision.items() if k != "t"})
+        print(f"Quality: {reason} (p90 {p90:.1f} ms vs {self.budget_ms:.1f} ms budget): "
+              f"level {self.level} -> {target} ({new})", file=sys.stderr)
+        self._calm = 0
+        self._n = 0
+        self._moved = (self.level, p90)
+        if (new.complexity, new.max_hands) == (old.complexity, old.max_hands):
+            self.level = target
+            return
+        self._rebuild = threading.Thread(target=self._build, args=(target,), name="quality-rebuild", daemon=True)
+        self._rebuild.start()
+
+    def _build(self, target: int) -> None:
+        level = self.ladder[target]
+        try:
+            detector = self.factory(level.complexity, level.max_hands)
+            h, w = self.warm_shape[:2]
+            detector.detect(np.zeros((int(h * level.scale), int(w * level.scale), 3), np.uint8))
+        except Exception as e:
+            print(f"Quality: could not build {level}: {e}", file=sys.stderr)
+            detector = None
+        self._ready = (target, detector)
+
+    def _swap(self) -> None:
+        (target, detector), self._ready = self._ready, None
+        self._rebuild.join()
+        self._rebuild = None
+        if detector is None:
+            return
+        old, self.detector, self.level = self.detector, detector, target
+        self._n = 0
+        old.close()
+
+    def close(self) -> None:
+        if self._rebuild is not None:
+            self._rebuild.join()
+            self._rebuild = None
+        if self._ready is not None and self._ready[1] is not None:
+            self._ready[1].close()
+        self._ready = None
+        self.detector.close()
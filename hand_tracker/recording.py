@@ -0,0 +1,204 @@
+"""
+Session recording and replay.
+
+``SessionRecorder`` appends each frame's detection output (capture timestamp, landmark
+arrays, handedness, scores) to a compact binary log, optionally with the JPEG-compressed
+camera frame. ``ReplaySource`` memory-maps such a log and stands in for both ``Camera``
+and ``HandDetector`` in ``app.main``, so the post-detection path can be reproduced and
+benchmarked without a camera or MediaPipe.
+
+Log layout (little endian)::
+
+    header : b"HTRK" | u16 version | u16 flags (bit 0: frames stored)
+    record : f8 timestamp | u32 frame_id | u16 width | u16 height | u8 n_hands | 3 pad | u32 jpeg_len
+             f4[n_hands, 21, 3] landmarks | i1[n_hands] handedness | f4[n_hands] scores | jpeg bytes
+
+A ``<log>.idx`` sidecar with the int64 record offsets is written on close; if it is
+missing (e.g. after a crash) the offsets are rebuilt by walking the record headers.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .hands import NUM_LANDMARKS, FrameHands
+
+MAGIC = b"HTRK"
+VERSION = 1
+FLAG_FRAMES = 1
+_FILE_HEADER = struct.Struct("<4sHH")
+_RECORD = struct.Struct("<dIHHB3xI")
+_HAND_BYTES = NUM_LANDMARKS * 3 * 4 + 1 + 4
+_LABELS = ("Left", "Right")
+
+
+def _label_code(label: str) -> int:
+    label_l = (label or "").lower()
+    return 0 if label_l.startswith("left") else 1 if label_l.startswith("right") else -1
+
+
+class SessionRecorder:
+    """Append per-frame ``FrameHands`` (and optionally frames) to a binary log."""
+
+    def __init__(self, path: str, frames: bool = False, jpeg_quality: int = 80) -> None:
+        self.path = path
+        self.frames = bool(frames)
+        self.jpeg_quality = int(jpeg_quality)
+        self._f = open(path, "wb")
+        self._f.write(_FILE_HEADER.pack(MAGIC, VERSION, FLAG_FRAMES if self.frames else 0))
+        self._offsets: List[int] = []
+        self._frame_id = 0
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def write(self, hands: FrameHands, frame=None) -> None:
+        """Record one frame. ``frame`` is stored only if the recorder was created with ``frames=True``."""
+        jpeg = b""
+        if self.frames and frame is not None:
+            ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+            if ok:
+                jpeg = buf.tobytes()
+        self._frame_id += 1
+        n = len(hands)
+        self._offsets.append(self._f.tell())
+        self._f.write(_RECORD.pack(hands.timestamp or time.time(), self._frame_id,
+                                   hands.width, hands.height, n, len(jpeg)))
+        if n:
+            self._f.write(np.ascontiguousarray(hands.norm, dtype="<f4").tobytes())
+            self._f.write(np.asarray([_label_code(h) for h in hands.handedness], dtype=np.int8).tobytes())
+            self._f.write(np.ascontiguousarray(hands.scores, dtype="<f4").tobytes())
+        if jpeg:
+            self._f.write(jpeg)
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._f.close()
+        np.asarray(self._offsets, dtype="<i8").tofile(self.path + ".idx")
+
+
+class ReplaySource:
+    """Replay a ``SessionRecorder`` log in place of ``Camera`` + ``HandDetector``.
+
+    - Camera side: ``read()`` returns the recorded frame (or a blank canvas of the
+      recorded size) and ``last_timestamp`` the recorded capture time.
+    - Detector side: ``detect(frame)`` returns the recorded ``FrameHands`` for that frame.
+
+    ``realtime=True`` paces reads by the recorded timestamps, otherwise frames are served
+    as fast as they are consumed. ``get(i)`` gives random access to any record.
+    """
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False) -> None:
+        self.path = path
+        self.realtime = bool(realtime)
+        self.loop = bool(loop)
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a hand tracker session log")
+        self.has_frames = bool(flags & FLAG_FRAMES)
+        self.offsets = self._load_index()
+
+        self.finished = False
+        self._pos = 0
+        self._current: Optional[FrameHands] = None
+        # Frames handed out but not yet passed to detect(), keyed by id(frame). Lets a
+        # pipelined app read ahead on one thread and detect on another.
+        self._pending: "OrderedDict[int, FrameHands]" = OrderedDict()
+        self._t0_wall: Optional[float] = None
+        self._t0_rec = 0.0
+
+    def _load_index(self) -> np.ndarray:
+        idx = self.path + ".idx"
+        if os.path.exists(idx) and os.path.getmtime(idx) >= os.path.getmtime(self.path):
+            return np.fromfile(idx, dtype="<i8")
+        # Walk the record headers (no payload is read)
+        offsets, off, size = [], _FILE_HEADER.size, len(self._mm)
+        while off + _RECORD.size <= size:
+            _, _, _, _, n, jlen = _RECORD.unpack_from(self._mm, off)
+            end = off + _RECORD.size + n * _HAND_BYTES + jlen
+            if end > size:  # truncated last record
+                break
+            offsets.append(off)
+            off = end
+        return np.asarray(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get(self, i: int) -> Tuple[FrameHands, Optional[np.ndarray]]:
+        """Return ``(hands, frame)`` for record ``i``; frame is None when not stored."""
+        off = int(self.offsets[i])
+        ts, _, w, h, n, jlen = _RECORD.unpack_from(self._mm, off)
+        off += _RECORD.size
+        norm = np.frombuffer(self._mm, dtype="<f4", count=n * NUM_LANDMARKS * 3, offset=off)
+        off += norm.nbytes
+        codes = np.frombuffer(self._mm, dtype=np.int8, count=n, offset=off)
+        off += n
+        scores = np.frombuffer(self._mm, dtype="<f4", count=n, offset=off)
+        off += n * 4
+        labels = [_LABELS[c] if 0 <= c < 2 else "Hand" for c in codes.tolist()]
+        # Copy out of the map: consumers may modify landmark arrays in place
+        hands = FrameHands(norm.reshape(n, NUM_LANDMARKS, 3).copy(), labels, scores.copy(), w, h, ts)
+        frame = None
+        if jlen:
+            frame = cv2.imdecode(np.frombuffer(self._mm, dtype=np.uint8, count=jlen, offset=off), cv2.IMREAD_COLOR)
+        return hands, frame
+
+    # --- Camera interface ----------------------------------------------------------
+
+    def read(self):
+        """Return (ok, frame) for the next record; (False, None) once the log is exhausted."""
+        if self._pos >= len(self):
+            if not self.loop or len(self) == 0:
+                self.finished = True
+                return False, None
+            self._pos = 0
+            self._t0_wall = None
+        hands, frame = self.get(self._pos)
+        self._pos += 1
+        if self.realtime:
+            if self._t0_wall is None:
+                self._t0_wall, self._t0_rec = time.time(), hands.timestamp
+            delay = (hands.timestamp - self._t0_rec) - (time.time() - self._t0_wall)
+            if delay > 0:
+                time.sleep(delay)
+        if frame is None:
+            frame = np.zeros((hands.height, hands.width, 3), np.uint8)
+        self._current = hands
+        self._pending[id(frame)] = hands
+        while len(self._pending) > 16:
+            self._pending.popitem(last=False)
+        return True, frame
+
+    @property
+    def last_timestamp(self) -> float:
+        return self._current.timestamp if self._current is not None else 0.0
+
+    def release(self) -> None:
+        self.close()
+
+    # --- Detector interface --------------------------------------------------------
+
+    def detect(self, frame_bgr=None, timestamp: Optional[float] = None, rgb=None) -> FrameHands:
+        """Recorded hands for ``frame_bgr`` (a frame returned by ``read``); ``rgb`` is ignored."""
+        hands = self._pending.pop(id(frame_bgr), None) if frame_bgr is not None else self._current
+        if hands is None:
+            h, w = frame_bgr.shape[:2] if frame_bgr is not None else (0, 0)
+            return FrameHands.empty(w, h, timestamp or 0.0)
+        return hands
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._mm.close()
+        self._f.close()
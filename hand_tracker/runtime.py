@@ -0,0 +1,327 @@
+"""
+Long-lived tracker runtime: one camera and one warm detector shared by every mode.
+
+Starting ``hand_tracker.app`` pays for importing MediaPipe, opening the camera and loading
+the hand model. The runtime pays that once:
+
+- ``open_warm`` opens the camera while a background thread builds the detector and runs it
+  on a dummy frame, so the model is loaded by the time the first real frame arrives.
+- ``ModeSwitcher`` is the frame loop's mode controller; it swaps the active mode in place
+  (keys 1-5 in the window, or ``ControlServer`` commands) without touching camera or detector.
+  A comma-separated mode list (``vmouse,slides``) runs those modes together as a
+  ``ModeGroup`` on every frame of the one detector.
+- Each mode declares the per-frame features it reads (``features``, see ``hands.FEATURES``).
+  ``FrameHands`` computes features lazily and caches them, so a feature no active mode reads
+  is never computed and a shared one is computed once; the app draws the landmark overlay
+  only when some active mode asks for ``overlay``.
+- Time-to-first-landmark is measured from process launch (cold) and from each switch request
+  (warm), and reported on stderr, as a ``first_landmark`` event and as metrics gauges.
+
+``python -m hand_tracker.runtime`` runs the app with the control server enabled; the
+launcher switches a running runtime's mode over it instead of starting a new process.
+The runtime binds the control port before opening the camera and exits if it is taken, and
+the launcher holds ``LAUNCH_LOCK`` until a runtime it started has bound the port, so quick
+repeated launches reach one runtime instead of starting several.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import events as _events
+from . import metrics as _metrics
+
+MODES = ("default", "vmouse", "slides", "rps", "reaction")
+DEFAULT_CONTROL_PORT = 47811
+LAUNCH_LOCK = os.path.join(tempfile.gettempdir(), "hand-tracker-launch.lock")
+LAUNCH_TIMEOUT = 15.0  # a lock older than this belongs to a runtime that never bound its control port
+
+_IMPORTED_AT = time.time()
+
+
+def parse_modes(spec: str) -> Tuple[str, ...]:
+    """Mode names in a comma-separated ``spec`` such as ``"vmouse,slides"`` (duplicates dropped)."""
+    names = tuple(dict.fromkeys(n.strip() for n in str(spec).split(",") if n.strip()))
+    unknown = [n for n in names if n not in MODES]
+    if unknown or not names:
+        raise ValueError(f"unknown mode {','.join(unknown) or spec!r}; expected one of {', '.join(MODES)}")
+    return names
+
+
+def mode_features(mode) -> FrozenSet[str]:
+    """Features ``mode`` declared; the default draw mode (None) only needs the overlay.
+
+    A mode that declares nothing is assumed to read everything.
+    """
+    from .hands import FEATURES  # lazy: the launcher imports this module without MediaPipe
+
+    if mode is None:
+        return frozenset({"overlay"})
+    return frozenset(getattr(mode, "features", FEATURES))
+
+
+class ModeGroup:
+    """Several modes run on the same frames, in order; features are the union of theirs."""
+
+    def __init__(self, names: Sequence[str], modes: Sequence) -> None:
+        self.names = tuple(names)
+        self.modes = list(modes)
+        self.features = frozenset().union(*map(mode_features, self.modes))
+
+    def update(self, frame, hands) -> None:
+        for mode in self.modes:
+            if mode is not None:
+                mode.update(frame, hands)
+
+    def close(self) -> None:
+        for mode in self.modes:
+            if hasattr(mode, "close"):
+                mode.close()
+
+
+def process_start_time() -> float:
+    """Wall-clock time this process started (Linux ``/proc``; else when this module was imported)."""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            ticks = int(f.read().rsplit(b")", 1)[1].split()[19])
+        with open("/proc/stat", "rb") as f:
+            btime = next(int(line.split()[1]) for line in f if line.startswith(b"btime"))
+        return btime + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration, AttributeError):
+        return _IMPORTED_AT
+
+
+def open_warm(open_camera: Callable, build_detector: Callable, shape=(480, 640, 3)):
+    """Return ``(camera, detector, timings)``, opening the camera while the detector warms up.
+
+    ``build_detector()`` runs on a background thread and the detector then processes one
+    black frame of ``shape``, which loads the model and initializes the graph. ``timings``
+    holds ``camera_ms`` and ``detector_ms`` (the two overlap).
+    """
+    built = {}
+
+    def warm():
+        t0 = time.perf_counter()
+        try:
+            detector = build_detector()
+            detector.detect(np.zeros(shape, np.uint8))
+            built["detector"] = detector
+        except BaseException as e:  # re-raised on the caller's thread
+            built["error"] = e
+        built["detector_ms"] = (time.perf_counter() - t0) * 1000.0
+
+    thread = threading.Thread(target=warm, name="detector-warmup", daemon=True)
+    thread.start()
+    t0 = time.perf_counter()
+    try:
+        cam = open_camera()
+    finally:
+        camera_ms = (time.perf_counter() - t0) * 1000.0
+        thread.join()
+    if "error" in built:
+        cam.release()
+        raise built["error"]
+    return cam, built["detector"], {"camera_ms": round(camera_ms, 1), "detector_ms": round(built["detector_ms"], 1)}
+
+
+class ModeSwitcher:
+    """Frame-loop mode controller that delegates to the active mode and swaps it on request.
+
+    ``build(name, options)`` returns the controller for a mode (anything with
+    ``update(frame, hands)``, or None for ``default``); ``options`` are extra app flags.
+    ``name`` may list several modes (``"vmouse,slides"``), which then run as a ``ModeGroup``.
+    ``features`` is what the active mode(s) read per frame (see ``mode_features``).
+    ``request`` may be called from any thread; the switch happens on the next ``update``, on
+    the thread running the mode logic. ``started_at`` (default: now) starts the cold
+    time-to-first-landmark clock.
+    """
+
+    def __init__(self, build: Callable, name: str = "default", started_at: Optional[float] = None) -> None:
+        names = parse_modes(name)
+        self._build = build
+        self.name = ",".join(names)
+        self.current = self._build_modes(names, [])
+        self.features = mode_features(self.current)
+        self.switches = 0
+        self.frames = 0
+        self.first_landmark_ms: dict = {}  # "cold" / "warm" -> latest measurement
+        self._lock = threading.Lock()
+        self._pending = None
+        self._clock = ("cold", time.time() if started_at is None else started_at)
+
+    def request(self, name: str, options: Sequence[str] = (), at: Optional[float] = None) -> None:
+        """Switch to mode(s) ``name`` (with extra mode ``options``) before the next frame."""
+        names = parse_modes(name)
+        with self._lock:
+            self._pending = (names, list(options), time.time() if at is None else at)
+
+    def _build_modes(self, names: Tuple[str, ...], options: List[str]):
+        if len(names) == 1:
+            return self._build(names[0], options)
+        return ModeGroup(names, [self._build(n, options) for n in names])
+
+    def _apply(self, names: Tuple[str, ...], options: List[str], at: float) -> None:
+        self._close_current()
+        t0 = time.perf_counter()
+        self.current = self._build_modes(names, options)
+        self.features = mode_features(self.current)
+        build_ms = (time.perf_counter() - t0) * 1000.0
+        previous, self.name = self.name, ",".join(names)
+        self.switches += 1
+        self._clock = ("warm", at)
+        _events.active().emit("mode", mode=self.name, previous=previous, build_ms=round(build_ms, 2))
+
+    def update(self, frame, hands) -> None:
+        self.frames += 1
+        if self._pending is not None:
+            with self._lock:
+                pending, self._pending = self._pending, None
+            self._apply(*pending)
+        if self._clock is not None and len(hands):
+            start, t0 = self._clock
+            self._clock = None
+            ms = (time.time() - t0) * 1000.0
+            self.first_landmark_ms[start] = ms
+            _metrics.active().set_gauge(f"first_landmark_ms[{start}]", round(ms, 1))
+            _events.active().emit("first_landmark", start=start, mode=self.name, ms=round(ms, 1))
+            print(f"Time to first landmark ({start} start, {self.name}): {ms:.0f} ms", file=sys.stderr)
+        if self.current is not None:
+            self.current.update(frame, hands)
+
+    def _close_current(self) -> None:
+        if hasattr(self.current, "close"):
+            self.current.close()
+        self.current = None
+
+    def close(self) -> None:
+        self._close_current()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    # On Windows SO_REUSEADDR lets a second runtime bind a port that is in use
+    allow_reuse_address = sys.platform != "win32"
+    daemon_threads = True
+
+
+class ControlServer:
+    """Line-based control socket for a running runtime (localhost TCP by default).
+
+    Commands, one per line, each answered with one line:
+
+    - ``mode NAME[,NAME...] [OPTIONS...]`` -> ``ok NAME``; OPTIONS are app mode flags, e.g.
+      ``--vm-scroll``
+    - ``status`` -> ``ok MODE frames=N``
+    - ``quit`` -> ``ok``, then sets ``stop``
+    """
+
+    def __init__(self, switcher: ModeSwitcher, stop: threading.Event, host: str = "127.0.0.1",
+                 port: int = DEFAULT_CONTROL_PORT) -> None:
+        self.switcher = switcher
+        self.stop = stop
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    reply = server.handle(raw.decode("utf-8", "replace").strip())
+                    self.wfile.write((reply + "\n").encode("utf-8"))
+
+        self._server = _TCPServer((host, port), Handler)
+        self.address = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    def handle(self, line: str) -> str:
+        parts = line.split()
+        if not parts:
+            return "error empty command"
+        cmd, rest = parts[0].lower(), parts[1:]
+        if cmd == "mode" and rest:
+            try:
+                self.switcher.request(rest[0], rest[1:])
+            except ValueError as e:
+                return f"error {e}"
+            return f"ok {rest[0]}"
+        if cmd == "status":
+            return f"ok {self.switcher.name} frames={self.switcher.frames}"
+        if cmd == "quit":
+            self.stop.set()
+            return "ok"
+        return f"error unknown command {line!r}"
+
+    def start(self) -> "ControlServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="control", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._server.server_close()
+
+
+def claim_launch(path: Optional[str] = None, timeout: float = LAUNCH_TIMEOUT) -> bool:
+    """Atomically take the launch lock; False while another launch is still starting up.
+
+    The runtime releases the lock once its control port is bound (``release_launch``), so the
+    lock only covers the window in which a starting runtime can't answer ``send_command`` yet.
+    """
+    path = path or LAUNCH_LOCK
+    try:
+        if time.time() - os.path.getmtime(path) > timeout:
+            os.remove(path)  # stale: that runtime died before binding
+    except OSError:
+        pass
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    os.write(fd, str(os.getpid()).encode("ascii"))
+    os.close(fd)
+    return True
+
+
+def launch_pending(path: Optional[str] = None, timeout: float = LAUNCH_TIMEOUT) -> bool:
+    """True while a launched runtime has not bound its control port yet."""
+    try:
+        return time.time() - os.path.getmtime(path or LAUNCH_LOCK) <= timeout
+    except OSError:
+        return False
+
+
+def release_launch(path: Optional[str] = None) -> None:
+    try:
+        os.remove(path or LAUNCH_LOCK)
+    except OSError:
+        pass
+
+
+def send_command(command: str, port: int = DEFAULT_CONTROL_PORT, host: str = "127.0.0.1", timeout: float = 1.0) -> str:
+    """Send one command to a running runtime and return its reply; raises OSError if none runs."""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall((command.strip() + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            return f.readline().strip()
+
+
+def main(argv=None) -> None:
+    """``hand_tracker.app`` with the control server on ``--control-port`` (default 47811)."""
+    from .app import main as app_main
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not any(a == "--control-port" or a.startswith("--control-port=") for a in argv):
+        argv = ["--control-port", str(DEFAULT_CONTROL_PORT)] + argv
+    app_main(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,112 +1,120 @@
 import time
-from collections import deque
-from typing import Deque, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
-from .gestures import count_fingers_up
-from .hands import landmarks_px
+from . import events as _events
+from .gestures import GestureRegistry
+from .hands import FrameHands
+from .input_dispatch import InputDispatcher, make_backend
+from .motion import MotionWindow
 from .overlay import draw_label
 
-# Optional keyboard backends
-try:
-    import pyautogui as _pygui  # type: ignore
-except Exception:  # pragma: no cover - optional
-    _pygui = None
 
-try:
-    from pynput.keyboard import Controller as _KeyCtl, Key as _Key  # type: ignore
-except Exception:  # pragma: no cover - optional
-    _KeyCtl = None
-    _Key = None
+DIRECTIONS = ("left", "right", "up", "down")
 
 
 class SlideController:
-    """Detect two-finger horizontal swipe and send Left/Right arrow keys.
-
-    Gesture: Index + Middle up, Ring + Pinky down. Trigger when horizontal velocity
-    and displacement exceed thresholds within a short time window. Cooldown to avoid repeats.
+    """Detect two-finger swipes and send the matching arrow keys.
+
+    Gesture: ``victory`` (Index + Middle up, Ring + Pinky down) from ``registry``. Every
+    hand's ``anchor`` landmark (default: wrist) is tracked in its own ``MotionWindow``
+    over the last ``window_sec`` seconds of capture time. A swipe triggers when, along
+    the dominant axis, the least-squares velocity exceeds ``vx_thresh`` px/s and the
+    displacement ``dx_thresh`` px, in one of ``directions``. Cooldown to avoid repeats.
+    Each trigger is reported as a ``swipe`` event; ``draw=False`` skips the on-frame labels.
     """
 
+    KEYS = {"left": "left", "right": "right", "up": "up", "down": "down"}
+    features = ("px", "fingers", "gestures", "handedness", "overlay")
+
     def __init__(
         self,
         vx_thresh: float = 900.0,  # px/sec
         dx_thresh: float = 120.0,  # px
         window_sec: float = 0.25,
         cooldown_sec: float = 0.8,
+        dispatcher: Optional[InputDispatcher] = None,
+        draw: bool = True,
+        registry: Optional[GestureRegistry] = None,
+        anchor: int = 0,
+        directions: Sequence[str] = DIRECTIONS,
     ) -> None:
+        self.draw = draw
+        self.registry = registry
         self.vx_thresh = float(vx_thresh)
         self.dx_thresh = float(dx_thresh)
         self.window_sec = float(window_sec)
         self.cooldown_sec = float(cooldown_sec)
-        self.samples: Deque[Tuple[float, float]] = deque(maxlen=30)  # (t, x)
-        self.last_trigger: float = 0.0
-
-        # keyboard backend
-        self.backend = None
-        self._key = None
-        if _pygui is not None:
-            self.backend = "pyautogui"
-            self._key = _pygui
-        elif _KeyCtl is not None:
-            self.backend = "pynput"
-            self._key = _KeyCtl()
+        self.anchor = int(anchor)
+        unknown = set(directions) - set(DIRECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown swipe direction(s) {sorted(unknown)}; use {DIRECTIONS}")
+        self.directions = tuple(directions)
+        self.windows: Dict[str, MotionWindow] = {}  # per hand, keyed by label (+ index for duplicates)
+        self.last_trigger: Optional[float] = None
+
+        # keyboard backend (key presses are sent from the dispatcher's worker thread)
+        self.input = dispatcher if dispatcher is not None else InputDispatcher(make_backend())
+        self.backend = self.input.name
 
     def _press(self, which: str) -> None:
-        if self.backend == "pyautogui":
-            try:
-                self._key.press(which)
-            except Exception:
-                pass
-        elif self.backend == "pynput":
-            try:
-                key = getattr(_Key, which)
-                self._key.press(key)
-                self._key.release(key)
-            except Exception:
-                pass
+        self.input.key(which)
+
+    @staticmethod
+    def _hand_keys(hands: FrameHands):
+        seen: Dict[str, int] = {}
+        for i in range(len(hands)):
+            label = hands.label(i)
+            seen[label] = seen.get(label, 0) + 1
+            yield i, label if seen[label] == 1 else f"{label}#{seen[label]}"
+
+    def _swipe(self, window: MotionWindow) -> Tuple[Optional[str], float, float]:
+        """``(direction, speed, distance)`` along the dominant axis of the window's motion."""
+        dx, dy = window.displacement()
+        vx, vy = window.velocity()
+        if abs(dx) >= abs(dy):
+            direction, v, d = ("right" if dx > 0 else "left"), vx, dx
+        else:
+            direction, v, d = ("down" if dy > 0 else "up"), vy, dy
+        if v * d <= 0:  # fit and endpoints disagree: jitter, not a swipe
+            return None, v, d
+        return direction, v, d
 
     def update(self, frame_bgr, results) -> None:
         h, w = frame_bgr.shape[:2]
-        t = time.time()
-        # Need hand and gesture state
-        if not results or not getattr(results, "multi_hand_landmarks", None):
-            self.samples.clear()
-            return
-        hand_landmarks = results.multi_hand_landmarks[0]
-        handed = getattr(results, "multi_handedness", [])
-        label = handed[0].classification[0].label if handed else "Hand"
-        cnt, states = count_fingers_up(frame_bgr, hand_landmarks, label)
-
-        two_fingers = states.get("Index") and states.get("Middle") and not states.get("Ring") and not states.get("Pinky")
-        pts = landmarks_px(frame_bgr, hand_landmarks)
-        if not pts:
-            self.samples.clear()
-            return
-
-        x = float(pts[0][0])  # wrist x
-        self.samples.append((t, x))
-
-        # Only consider when gesture held
-        if not two_fingers:
-            draw_label(frame_bgr, "Slides: show ✌️ and swipe", (10, h - 10))
-            return
-
-        # Compute dx and vx in the recent window
-        t0 = t - self.window_sec
-        xs = [sx for (st, sx) in self.samples if st >= t0]
-        ts = [st for (st, sx) in self.samples if st >= t0]
-        if len(xs) < 2:
+        hands = FrameHands.of(results, frame_bgr)
+        t = hands.timestamp or time.time()
+        if len(hands) == 0:
+            self.windows.clear()
             return
-        dx = xs[-1] - xs[0]
-        dt = max(1e-3, ts[-1] - ts[0])
-        vx = dx / dt
-
-        ready = (t - self.last_trigger) > self.cooldown_sec
-        if ready and abs(vx) > self.vx_thresh and abs(dx) > self.dx_thresh:
-            direction = "right" if vx > 0 else "left"
-            key = "right" if vx > 0 else "left"
-            self._press(key)
-            self.last_trigger = t
-            draw_label(frame_bgr, f"Slides: {direction} ▶", (10, h - 10))
-        else:
-            draw_label(frame_bgr, f"Slides: hold ✌️, swipe fast (vx={vx:.0f})", (10, h - 10))
-
+        gestures = hands.gestures(self.registry)
+        keys = dict(self._hand_keys(hands))
+        for stale in set(self.windows) - set(keys.values()):
+            del self.windows[stale]
+
+        status = "Slides: show ✌️ and swipe"
+        for i, key in keys.items():
+            window = self.windows.get(key)
+            if window is None:
+                window = self.windows[key] = MotionWindow(self.window_sec)
+            x, y = hands.px[i, self.anchor].tolist()
+            window.push(t, x, y)
+            # Only consider when gesture held
+            if not gestures.has("victory", i) or len(window) < 2:
+                continue
+            direction, v, d = self._swipe(window)
+            ready = self.last_trigger is None or not (0.0 <= t - self.last_trigger <= self.cooldown_sec)
+            if (ready and direction in self.directions and abs(v) > self.vx_thresh and abs(d) > self.dx_thresh):
+                key_name = self.KEYS[direction]
+                self._press(key_name)
+                self.last_trigger = t
+                (dx, dy), (vx, vy) = window.displacement(), window.velocity()
+                _events.active().emit("swipe", direction=direction, key=key_name, hand=key,
+                                      vx=round(vx, 1), vy=round(vy, 1), dx=round(dx, 1), dy=round(dy, 1))
+                status = f"Slides: {direction} ▶"
+                break
+            status = f"Slides: hold ✌️, swipe fast (v={abs(v):.0f})"
+        if self.draw:
+            draw_label(frame_bgr, status, (10, h - 10))
+
+    def close(self) -> None:
+        self.input.close()
@@ -0,0 +1,769 @@
+"""
+Local network streaming of hand data to other apps (a Unity scene, a dashboard, ...).
+
+``StreamServer`` runs an asyncio loop on a background thread. ``app.main`` feeds it
+each frame's hands with ``publish(hands)`` and, installed as an ``events`` sink, every
+gesture event. Subscribers connect over:
+
+- UDP: send ``b"HTSUB"`` (binary) or ``b"HTSUBJ"`` (JSON) to the server port and repeat
+  it at least every ``UDP_TTL`` seconds; ``b"HTBYE"`` unsubscribes. Fixed targets can
+  also be configured up front.
+- WebSocket: ``ws://host:port/`` for binary messages, ``ws://host:port/json`` for JSON
+  text messages. The small RFC 6455 subset needed here is implemented on asyncio
+  streams, so no extra dependency is required. Clients only send control frames, so a
+  frame over ``WS_MAX_FRAME`` bytes closes the connection (1009). Browsers must come from
+  a localhost page or an origin in ``ws_origins``; clients without an ``Origin`` header
+  (native apps, ``StreamClient``) are always accepted.
+
+Every WebSocket client has its own short frame queue: when a client falls behind, its
+oldest frames are dropped (events are kept) and the tracker never waits. UDP sends are
+dropped while the socket's send buffer is over ``udp_buffer`` bytes.
+
+Binary messages (little endian)::
+
+    header : b"HT" | u8 version | u8 kind (1 frame, 2 event) | u32 seq | f8 timestamp
+             | u16 width | u16 height | u8 n_hands | 3 pad                        (24 bytes)
+    frame  : n_hands x [f4[21, 3] landmarks | i1 handedness | u1 finger bits
+             | u1 finger count | 1 pad | f4 score]                             (260 bytes each)
+    event  : UTF-8 JSON object with the event ``type`` and its fields
+
+``timestamp`` is the capture time (frames) or emit time (events) from ``time.time()``;
+handedness is 0 Left, 1 Right, -1 unknown; finger bit i is ``gestures.FINGERS[i]``.
+``StreamClient`` is a small blocking client that decodes either format; run
+``python -m hand_tracker.streaming bench`` for a loopback throughput/latency check.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from . import metrics as _metrics
+from .hands import NUM_LANDMARKS
+
+VERSION = 1
+KIND_FRAME = 1
+KIND_EVENT = 2
+UDP_TTL = 10.0
+WS_MAX_FRAME = 4096  # subscribers only send close/ping frames
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+HEADER = struct.Struct("<2sBBIdHHB3x")
+HAND_DTYPE = np.dtype([
+    ("landmarks", "<f4", (NUM_LANDMARKS, 3)),
+    ("handedness", "i1"),
+    ("fingers", "u1"),
+    ("count", "u1"),
+    ("pad", "u1"),
+    ("score", "<f4"),
+])
+_HANDEDNESS = {"Left": 0, "Right": 1}
+_LABELS = {0: "Left", 1: "Right"}
+_FINGER_BITS = (1 << np.arange(5)).astype(np.uint8)
+
+
+class FrameMessage(NamedTuple):
+    seq: int
+    timestamp: float
+    width: int
+    height: int
+    landmarks: np.ndarray  # (n_hands, 21, 3) float32, normalized
+    handedness: List[str]
+    scores: np.ndarray  # (n_hands,) float32
+    fingers: np.ndarray  # (n_hands, 5) bool
+    counts: np.ndarray  # (n_hands,) int
+
+
+class EventMessage(NamedTuple):
+    seq: int
+    timestamp: float
+    type: str
+    fields: Dict
+
+
+# --- Encoding ------------------------------------------------------------------------
+
+
+def encode_frame(seq: int, hands) -> bytes:
+    """Binary frame message for a ``FrameHands``."""
+    n = min(len(hands), 255)
+    body = np.zeros(n, HAND_DTYPE)
+    if n:
+        states, counts = hands.finger_states()
+        body["landmarks"] = hands.norm[:n]
+        body["handedness"] = [_HANDEDNESS.get(h, -1) for h in hands.handedness[:n]]
+        body["fingers"] = (states[:n] * _FINGER_BITS).sum(axis=1)
+        body["count"] = counts[:n]
+        body["score"] = hands.scores[:n]
+    header = HEADER.pack(b"HT", VERSION, KIND_FRAME, seq & 0xFFFFFFFF, hands.timestamp,
+                         min(hands.width, 0xFFFF), min(hands.height, 0xFFFF), n)
+    return header + body.tobytes()
+
+
+def encode_frame_json(seq: int, hands) -> bytes:
+    states, counts = hands.finger_states()
+    out = []
+    for i in range(len(hands)):
+        out.append({
+            "label": hands.label(i),
+            "score": round(float(hands.scores[i]), 4),
+            "fingers": states[i].tolist(),
+            "count": int(counts[i]),
+            "landmarks": hands.norm[i].round(5).tolist(),
+        })
+    msg = {"type": "frame", "seq": seq, "t": hands.timestamp, "width": hands.width, "height": hands.height,
+           "hands": out}
+    return json.dumps(msg, separators=(",", ":")).encode("utf-8")
+
+
+def encode_event(seq: int, timestamp: float, type: str, fields: Dict) -> bytes:
+    payload = json.dumps({"type": type, **fields}, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(b"HT", VERSION, KIND_EVENT, seq & 0xFFFFFFFF, timestamp, 0, 0, 0) + payload
+
+
+def encode_event_json(seq: int, timestamp: float, type: str, fields: Dict) -> bytes:
+    return json.dumps({"type": type, "seq": seq, "t": timestamp, **fields}, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data) -> "FrameMessage | EventMessage":
+    """Decode a binary or JSON message (``bytes`` or ``str``)."""
+    if isinstance(data, str) or data[:1] == b"{":
+        msg = json.loads(data)
+        kind, seq, t = msg.pop("type"), msg.pop("seq"), msg.pop("t")
+        if kind != "frame":
+            return EventMessage(seq, t, kind, msg)
+        hands = msg["hands"]
+        return FrameMessage(
+            seq, t, msg["width"], msg["height"],
+            np.asarray([h["landmarks"] for h in hands], np.float32).reshape(-1, NUM_LANDMARKS, 3),
+            [h["label"] for h in hands],
+            np.asarray([h["score"] for h in hands], np.float32),
+            np.asarray([h["fingers"] for h in hands], bool).reshape(-1, 5),
+            np.asarray([h["count"] for h in hands], int),
+        )
+    magic, version, kind, seq, t, width, height, n = HEADER.unpack_from(data)
+    if magic != b"HT" or version != VERSION:
+        raise ValueError("Not a hand stream message")
+    if kind == KIND_EVENT:
+        fields = json.loads(bytes(data[HEADER.size:]).decode("utf-8"))
+        return EventMessage(seq, t, fields.pop("type"), fields)
+    body = np.frombuffer(data, HAND_DTYPE, count=n, offset=HEADER.size)
+    return FrameMessage(
+        seq, t, width, height,
+        body["landmarks"].copy(),
+        [_LABELS.get(int(c), "Hand") for c in body["handedness"]],
+        body["score"].copy(),
+        (body["fingers"][:, None] & _FINGER_BITS) != 0,
+        body["count"].astype(int),
+    )
+
+
+# --- Minimal WebSocket framing (RFC 6455) ----------------------------------------------
+
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OP_TEXT, _OP_BINARY, _OP_CLOSE, _OP_PING, _OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+def _ws_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1(key.strip().encode("ascii") + _WS_GUID).digest()).decode("ascii")
+
+
+def _ws_mask(payload: bytes, key: bytes) -> bytes:
+    data = np.frombuffer(payload, np.uint8)
+    mask = np.resize(np.frombuffer(key, np.uint8), len(data))
+    return (data ^ mask).tobytes()
+
+
+def _ws_frame(opcode: int, payload: bytes, mask: bool = False) -> bytes:
+    """One final frame; clients must mask what they send, servers must not."""
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, bit | n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, bit | 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, bit | 127, n)
+    if mask:
+        key = os.urandom(4)
+        return header + key + _ws_mask(payload, key)
+    return header + payload
+
+
+def _ws_parse_header(head: bytes) -> Tuple[int, int, bool]:
+    return head[0] & 0x0F, head[1] & 0x7F, bool(head[1] & 0x80)
+
+
+class _WSClose(ConnectionError):
+    """The peer broke a protocol limit; close the connection with ``code``."""
+
+    def __init__(self, code: int, reason: str) -> None:
+        super().__init__(reason)
+        self.code = code
+
+
+async def _ws_read_frame(reader: asyncio.StreamReader, limit: int = WS_MAX_FRAME) -> Tuple[int, bytes]:
+    opcode, n, masked = _ws_parse_header(await reader.readexactly(2))
+    if n == 126:
+        n = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if opcode & 0x8 and n > 125:
+        raise _WSClose(1002, "control frame over 125 bytes")
+    if n > limit:
+        raise _WSClose(1009, f"frame of {n} bytes")
+    key = await reader.readexactly(4) if masked else b""
+    payload = await reader.readexactly(n)
+    return opcode, _ws_mask(payload, key) if masked else payload
+
+
+def _origin_allowed(origin: Optional[str], allowed: Sequence[str]) -> bool:
+    if origin is None or "*" in allowed or origin in allowed:
+        return True
+    return urlparse(origin).hostname in LOCAL_HOSTS
+
+
+async def _ws_handshake(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, origins: Sequence[str] = ()
+) -> str:
+    """Answer the HTTP upgrade request; returns the request path."""
+    request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    lines = request.split("\r\n")
+    parts = lines[0].split()
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    key = headers.get("sec-websocket-key")
+    if len(parts) < 2 or parts[0] != "GET" or not key:
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        raise ConnectionError("not a WebSocket upgrade")
+    if not _origin_allowed(headers.get("origin"), origins):
+        writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        raise ConnectionError(f"origin {headers['origin']!r} not allowed")
+    writer.write(
+        b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        + f"Sec-WebSocket-Accept: {_ws_accept(key)}\r\n\r\n".encode("ascii")
+    )
+    await writer.drain()
+    return parts[1]
+
+
+# --- Server --------------------------------------------------------------------------
+
+
+class _Subscriber:
+    """Per-client outbox of ready-to-send WebSocket frames: the newest ``depth`` frame
+    messages plus every event and control frame, which go first."""
+
+    def __init__(self, fmt: str, depth: int) -> None:
+        self.fmt = fmt
+        self.frames: Deque[bytes] = deque(maxlen=max(1, depth))
+        self.priority: Deque[bytes] = deque(maxlen=1024)
+        self.wake = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+
+    def push(self, msg: bytes, frame: bool) -> None:
+        if frame:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1
+                _metrics.active().inc("stream_dropped")
+            self.frames.append(msg)
+        else:
+            self.priority.append(msg)
+        self.wake.set()
+
+    def pop(self) -> Optional[bytes]:
+        if self.priority:
+            return self.priority.popleft()
+        if self.frames:
+            return self.frames.popleft()
+        return None
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "StreamServer", subscriptions: bool = True) -> None:
+        self.server = server
+        self.subscriptions = subscriptions
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if not self.subscriptions:
+            return  # send-only socket: nobody may subscribe (or have a spoofed address subscribed)
+        if data.startswith(b"HTSUB"):
+            fmt = "json" if data[5:6] == b"J" else "binary"
+            self.server._udp_subs[addr] = (fmt, time.monotonic())
+        elif data.startswith(b"HTBYE"):
+            self.server._udp_subs.pop(addr, None)
+        else:
+            return
+        self.server._update_json_wanted()
+
+    def error_received(self, exc) -> None:  # e.g. ICMP port unreachable from a gone client
+        pass
+
+
+class StreamServer:
+    """Broadcasts frames and events to UDP and WebSocket subscribers from a background loop.
+
+    ``udp_port``/``ws_port`` of 0 pick a free port (see ``udp_address``/``ws_address``
+    after ``start()``); None disables that transport. ``udp_targets`` are fixed
+    ``(host, port)`` destinations that always receive ``udp_format`` messages. With targets
+    but no ``udp_port`` the UDP socket is send-only: it binds the wildcard address on an
+    ephemeral port, so the OS can route to targets on any interface, and ignores ``HTSUB``.
+    ``ws_origins`` lists the browser origins (e.g. ``"http://dashboard.lan:8080"``, or ``"*"``)
+    allowed besides localhost pages.
+    ``publish`` and ``emit`` can be called from any thread and never block.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        udp_port: Optional[int] = None,
+        ws_port: Optional[int] = None,
+        udp_targets: Sequence[Tuple[str, int]] = (),
+        udp_format: str = "binary",
+        queue_depth: int = 2,
+        udp_buffer: int = 256 * 1024,
+        ws_origins: Sequence[str] = (),
+    ) -> None:
+        self.host = host
+        self.udp_port = udp_port
+        self.ws_port = ws_port
+        self.udp_targets = list(udp_targets)
+        self.udp_format = udp_format
+        self.queue_depth = queue_depth
+        self.udp_buffer = udp_buffer
+        self.ws_origins = list(ws_origins)
+        self.udp_address: Optional[Tuple[str, int]] = None
+        self.ws_address: Optional[Tuple[str, int]] = None
+        self.published = 0
+        self.udp_sent = 0
+        self.udp_dropped = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._udp = None
+        self._ws_server = None
+        self._udp_subs: Dict[Tuple, Tuple[str, float]] = {}
+        self._ws_clients: List[_Subscriber] = []
+        self._json_wanted = udp_format == "json" and bool(udp_targets)
+
+    # --- lifecycle -------------------------------------------------------------------
+
+    def start(self) -> "StreamServer":
+        ready = threading.Event()
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            loop = self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self._open())
+            except BaseException as exc:  # surfaced to the caller of start()
+                failure.append(exc)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="stream-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            self._thread.join()
+            self._thread = None
+            raise failure[0]
+        return self
+
+    async def _open(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.udp_port is not None:
+            self._udp, _ = await loop.create_datagram_endpoint(
+                lambda: _UDPProtocol(self), local_addr=(self.host, self.udp_port)
+            )
+        elif self.udp_targets:
+            self._udp, _ = await loop.create_datagram_endpoint(
+                lambda: _UDPProtocol(self, subscriptions=False), local_addr=("0.0.0.0", 0)
+            )
+        if self._udp is not None:
+            self.udp_address = self._udp.get_extra_info("sockname")[:2]
+        if self.ws_port is not None:
+            self._ws_server = await asyncio.start_server(self._serve_ws, self.host, self.ws_port)
+            self.ws_address = self._ws_server.sockets[0].getsockname()[:2]
+
+    async def _shutdown(self) -> None:
+        if self._ws_server is not None:
+            self._ws_server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._udp is not None:
+            self._udp.close()
+
+    def close(self) -> None:
+        """Stop the loop and disconnect everyone (safe to call more than once)."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    # --- publishing ------------------------------------------------------------------
+
+    def _next_seq(self) -> int:
+        with self._lock:
+            self._seq += 1
+            return self._seq
+
+    def publish(self, hands) -> None:
+        """Queue one frame's hands for every subscriber."""
+        if self._thread is None:
+            return
+        seq = self._next_seq()
+        binary = encode_frame(seq, hands)
+        text = encode_frame_json(seq, hands) if self._json_wanted else None
+        self.published += 1
+        self._loop.call_soon_threadsafe(self._broadcast, binary, text, True)
+
+    def emit(self, type: str, **fields) -> None:
+        """``events`` sink interface: queue a gesture event for every subscriber."""
+        if self._thread is None:
+            return
+        seq, t = self._next_seq(), time.time()
+        binary = encode_event(seq, t, type, fields)
+        text = encode_event_json(seq, t, type, fields) if self._json_wanted else None
+        self._loop.call_soon_threadsafe(self._broadcast, binary, text, False)
+
+    def _broadcast(self, binary: bytes, text: Optional[bytes], frame: bool) -> None:
+        if self._ws_clients:
+            # Framed once, shared by every client of the same format
+            framed = {"binary": _ws_frame(_OP_BINARY, binary),
+                      "json": _ws_frame(_OP_TEXT, text) if text is not None else None}
+            for client in self._ws_clients:
+                if framed[client.fmt] is not None:
+                    client.push(framed[client.fmt], frame)
+        if self._udp is None:
+            return
+        now = time.monotonic()
+        for addr, (fmt, seen) in list(self._udp_subs.items()):
+            if now - seen > UDP_TTL:
+                del self._udp_subs[addr]
+                self._update_json_wanted()
+            else:
+                self._send_udp(text if fmt == "json" else binary, addr, frame)
+        for addr in self.udp_targets:
+            self._send_udp(text if self.udp_format == "json" else binary, addr, frame)
+
+    def _send_udp(self, msg: Optional[bytes], addr, frame: bool) -> None:
+        if msg is None:
+            return
+        if frame and self._udp.get_write_buffer_size() > self.udp_buffer:
+            self.udp_dropped += 1
+            _metrics.active().inc("stream_dropped")
+            return
+        self._udp.sendto(msg, addr)
+        self.udp_sent += 1
+
+    def _update_json_wanted(self) -> None:
+        self._json_wanted = (
+            any(c.fmt == "json" for c in self._ws_clients)
+            or any(fmt == "json" for fmt, _ in self._udp_subs.values())
+            or (self.udp_format == "json" and bool(self.udp_targets))
+        )
+        clients = len(self._ws_clients) + len(self._udp_subs) + len(self.udp_targets)
+        _metrics.active().set_gauge("stream_clients", clients)
+
+    # --- WebSocket clients -----------------------------------------------------------
+
+    async def _serve_ws(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            path = await _ws_handshake(reader, writer, self.ws_origins)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        client = _Subscriber("json" if path.rstrip("/").endswith("json") else "binary", self.queue_depth)
+        self._ws_clients.append(client)
+        self._update_json_wanted()
+        sender = asyncio.ensure_future(self._ws_send_loop(client, writer))
+        try:
+            while True:
+                opcode, payload = await _ws_read_frame(reader)
+                if opcode == _OP_CLOSE:
+                    client.priority.append(_ws_frame(_OP_CLOSE, payload[:2]))
+                    client.wake.set()
+                    break
+                if opcode == _OP_PING:
+                    client.priority.append(_ws_frame(_OP_PONG, payload))
+                    client.wake.set()
+        except _WSClose as exc:
+            client.priority.append(_ws_frame(_OP_CLOSE, struct.pack("!H", exc.code)))
+            client.wake.set()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._ws_clients.remove(client)
+            self._update_json_wanted()
+            await asyncio.sleep(0)  # let a queued close frame go out
+            sender.cancel()
+            writer.close()
+
+    async def _ws_send_loop(self, client: _Subscriber, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                await client.wake.wait()
+                client.wake.clear()
+                while True:
+                    msg = client.pop()
+                    if msg is None:
+                        break
+                    writer.write(msg)
+                    await writer.drain()
+                    client.sent += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def stats(self) -> Dict:
+        return {
+            "published": self.published,
+            "udp_subscribers": len(self._udp_subs),
+            "udp_sent": self.udp_sent,
+            "udp_dropped": self.udp_dropped,
+            "ws_clients": [{"format": c.fmt, "sent": c.sent, "dropped": c.dropped} for c in list(self._ws_clients)],
+        }
+
+
+# --- Client --------------------------------------------------------------------------
+
+
+class StreamClient:
+    """Blocking subscriber: ``StreamClient("udp://127.0.0.1:9000")`` or ``("ws://127.0.0.1:8765/json")``.
+
+    ``recv()`` returns the next decoded ``FrameMessage``/``EventMessage`` (None on
+    timeout); iterating yields messages until the connection closes.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        u = urlparse(url)
+        self.url = url
+        self.fmt = "json" if u.path.rstrip("/").endswith("json") else "binary"
+        self.address = (u.hostname or "127.0.0.1", u.port)
+        self.kind = u.scheme
+        if self.kind == "udp":
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._subscribe()
+        elif self.kind == "ws":
+            self.sock = socket.create_connection(self.address, timeout=timeout)
+            self._ws_open(u.path or "/")
+        else:
+            raise ValueError(f"Unsupported stream URL {url!r} (use udp://host:port or ws://host:port[/json])")
+
+    def _subscribe(self) -> None:
+        self.sock.sendto(b"HTSUBJ" if self.fmt == "json" else b"HTSUB", self.address)
+        self._subscribed_at = time.monotonic()
+
+    def _ws_open(self, path: str) -> None:
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        host, port = self.address
+        self.sock.sendall(
+            f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("ascii")
+        )
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(1024)
+            if not chunk:
+                raise ConnectionError("connection closed during WebSocket handshake")
+            response += chunk
+        head, _, self._buffer = response.partition(b"\r\n\r\n")
+        status = head.split(b"\r\n")[0]
+        if b" 101 " not in status or _ws_accept(key).encode("ascii") not in head:
+            raise ConnectionError(f"WebSocket handshake failed: {status!r}")
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buffer)))
+            if not chunk:
+                raise ConnectionError("connection closed")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def _ws_recv(self) -> Optional[bytes]:
+        while True:
+            opcode, n, _ = _ws_parse_header(self._read_exact(2))
+            if n == 126:
+                n = struct.unpack("!H", self._read_exact(2))[0]
+            elif n == 127:
+                n = struct.unpack("!Q", self._read_exact(8))[0]
+            payload = self._read_exact(n)
+            if opcode in (_OP_TEXT, _OP_BINARY):
+                return payload
+            if opcode == _OP_CLOSE:
+                return None
+            if opcode == _OP_PING:
+                self.sock.sendall(_ws_frame(_OP_PONG, payload, mask=True))
+
+    def recv(self, timeout: Optional[float] = None):
+        self.sock.settimeout(timeout)
+        try:
+            if self.kind == "udp":
+                if time.monotonic() - self._subscribed_at > UDP_TTL / 3:
+                    self._subscribe()
+                data = self.sock.recv(65536)
+            else:
+                data = self._ws_recv()
+        except socket.timeout:
+            return None
+        if data is None:
+            raise ConnectionError("stream closed")
+        return decode(data)
+
+    def __iter__(self):
+        while True:
+            try:
+                msg = self.recv(timeout=UDP_TTL / 3)
+            except ConnectionError:
+                return
+            if msg is not None:
+                yield msg
+
+    def close(self) -> None:
+        try:
+            if self.kind == "udp":
+                self.sock.sendto(b"HTBYE", self.address)
+            else:
+                self.sock.sendall(_ws_frame(_OP_CLOSE, struct.pack("!H", 1000), mask=True))
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# --- CLI: print a stream / loopback benchmark ------------------------------------------------
+
+
+def bench(transport: str = "udp", fmt: str = "binary", seconds: float = 3.0, rate: float = 0.0,
+          hands: int = 2) -> Dict:
+    """Publish synthetic frames to one loopback subscriber; returns throughput and latency.
+
+    ``rate`` is the publish rate in frames per second (0 = as fast as possible).
+    """
+    from .bench import synthetic_hands
+    from .hands import FrameHands
+
+    seq = synthetic_hands(120, 640, 480)
+    if hands > 1:
+        seq = [FrameHands(np.repeat(f.norm, hands, axis=0), (f.handedness * hands)[:hands],
+                          np.repeat(f.scores, hands), 640, 480) for f in seq]
+    server = StreamServer(udp_port=0 if transport == "udp" else None, ws_port=0 if transport == "ws" else None).start()
+    addr = server.udp_address if transport == "udp" else server.ws_address
+    client = StreamClient(f"{transport}://{addr[0]}:{addr[1]}/{'json' if fmt == 'json' else ''}")
+    latencies: List[float] = []
+    done = threading.Event()
+
+    def receive() -> None:
+        while not done.is_set():
+            try:
+                msg = client.recv(timeout=0.2)
+            except (ConnectionError, OSError):
+                return
+            if isinstance(msg, FrameMessage):
+                latencies.append(time.time() - msg.timestamp)
+
+    rx = threading.Thread(target=receive, name="stream-bench-client", daemon=True)
+    rx.start()
+    time.sleep(0.2)  # let the subscription reach the server
+    sent, t0 = 0, time.time()
+    period = 1.0 / rate if rate > 0 else 0.0
+    while time.time() - t0 < seconds:
+        f = seq[sent % len(seq)]
+        f.timestamp = time.time()
+        server.publish(f)
+        sent += 1
+        if period:
+            time.sleep(max(0.0, t0 + sent * period - time.time()))
+        elif sent % 64 == 0:
+            time.sleep(0)  # yield the GIL to the loop and client threads
+    elapsed = time.time() - t0
+    time.sleep(0.3)
+    done.set()
+    rx.join()
+    stats = server.stats()
+    client.close()
+    server.close()
+    lat = np.sort(np.asarray(latencies)) * 1000.0 if latencies else np.zeros(1)
+    example = encode_frame(0, seq[0]) if fmt == "binary" else encode_frame_json(0, seq[0])
+    return {
+        "transport": transport,
+        "format": fmt,
+        "published_per_s": sent / elapsed,
+        "received_per_s": len(latencies) / elapsed,
+        "dropped": sent - len(latencies),
+        "bytes_per_message": len(example),
+        "latency_ms_p50": float(np.percentile(lat, 50)),
+        "latency_ms_p99": float(np.percentile(lat, 99)),
+        "server": stats,
+    }
+
+
+def build_argparser():
+    p = argparse.ArgumentParser(description="Hand stream client and loopback benchmark")
+    sub = p.add_subparsers(dest="command", required=True)
+    c = sub.add_parser("client", help="Print messages from a running tracker")
+    c.add_argument("url", help="udp://host:port or ws://host:port (append /json for JSON messages)")
+    b = sub.add_parser("bench", help="Loopback throughput and latency")
+    b.add_argument("--transport", choices=["udp", "ws"], default="udp")
+    b.add_argument("--format", choices=["binary", "json"], default="binary")
+    b.add_argument("--seconds", type=float, default=3.0)
+    b.add_argument("--rate", type=float, default=0.0, help="Frames per second to publish (0 = unthrottled)")
+    b.add_argument("--hands", type=int, default=2)
+    return p
+
+
+def main(argv=None):
+    args = build_argparser().parse_args(argv)
+    if args.command == "bench":
+        r = bench(args.transport, args.format, args.seconds, args.rate, args.hands)
+        print(f"{r['transport']}/{r['format']}: {r['published_per_s']:.0f} msg/s published, "
+              f"{r['received_per_s']:.0f} msg/s received ({r['dropped']} dropped), {r['bytes_per_message']} B/msg")
+        print(f"latency p50 {r['latency_ms_p50']:.3f} ms, p99 {r['latency_ms_p99']:.3f} ms")
+        return 0
+    client = StreamClient(args.url)
+    try:
+        for msg in client:
+            if isinstance(msg, FrameMessage):
+                hands = ", ".join(f"{h}: {c}" for h, c in zip(msg.handedness, msg.counts.tolist()))
+                print(f"#{msg.seq} t={msg.timestamp:.3f} {len(msg.handedness)} hands {hands}")
+            else:
+                print(f"#{msg.seq} t={msg.timestamp:.3f} {msg.type} {json.dumps(msg.fields)}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
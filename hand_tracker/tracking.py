@@ -0,0 +1,118 @@
+"""
+Inference decimation with landmark prediction between detector runs.
+
+``DecimatingDetector`` wraps a ``HandDetector`` and runs MediaPipe only on every k-th frame
+(or, in adaptive mode, whenever the predicted error grows too large). Frames in between
+get landmarks extrapolated with a per-landmark constant-velocity model, so modes and the
+overlay still receive a ``FrameHands`` every frame.
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from . import metrics as _metrics
+from .hands import FrameHands
+
+
+class DecimatingDetector:
+    """Run ``detector`` on a subset of frames and predict landmarks for the rest.
+
+    - ``every``: run a real detection at least every ``every`` frames (1 = every frame).
+    - ``adaptive``: also run one as soon as the expected prediction error, learnt from the
+      residuals of past predictions, exceeds ``max_error_px``.
+    - ``smoothing``: weight of the newest velocity estimate (alpha-beta style filter).
+
+    A real detection is also forced when a synthesized frame would change any hand's
+    finger states (a gesture transition is never decided on predicted landmarks), or when
+    ``request_detection()`` was called.
+    """
+
+    def __init__(
+        self,
+        detector,
+        every: int = 2,
+        adaptive: bool = False,
+        max_error_px: float = 6.0,
+        smoothing: float = 0.6,
+    ) -> None:
+        self.detector = detector
+        self.every = max(1, int(every))
+        self.adaptive = bool(adaptive)
+        self.max_error_px = float(max_error_px)
+        self.smoothing = min(1.0, max(0.0, float(smoothing)))
+
+        self.real_frames = 0
+        self.synth_frames = 0
+        self.forced = 0
+        self._force = False
+        self._last: Optional[FrameHands] = None
+        self._last_t = 0.0
+        self._velocity: Optional[np.ndarray] = None  # (n, 21, 3) normalized units per second
+        self._since_real = 0
+        self._residual_px = 0.0  # EMA of the prediction error per predicted frame
+
+    def request_detection(self) -> None:
+        """Make the next ``detect`` call run the real detector."""
+        self._force = True
+
+    def _predict(self, dt: float, w: int, h: int, ts: float) -> FrameHands:
+        last = self._last
+        norm = last.norm if self._velocity is None else last.norm + self._velocity * dt
+        hands = FrameHands(norm, last.handedness, last.scores, w, h, ts)
+        hands.synthetic = True
+        return hands
+
+    def _due(self) -> bool:
+        if self._force or self._last is None or self._since_real + 1 >= self.every:
+            return True
+        if self.adaptive:
+            return self._residual_px * (self._since_real + 1) > self.max_error_px
+        return False
+
+    def detect(self, frame_bgr, timestamp: Optional[float] = None, rgb=None) -> FrameHands:
+        ts = time.time() if timestamp is None else timestamp
+        if not self._due():
+            h, w = frame_bgr.shape[:2]
+            pred = self._predict(ts - self._last_t, w, h, ts)
+            if len(pred) == 0 or np.array_equal(pred.finger_states()[0], self._last.finger_states()[0]):
+                self._since_real += 1
+                self.synth_frames += 1
+                _metrics.active().inc("synth_frames")
+                return pred
+            self._force = True  # predicted a finger flip: confirm it with the detector
+        if self._force:
+            self.forced += 1
+            _metrics.active().inc("forced_detections")
+        return self._detect_real(frame_bgr, ts, rgb)
+
+    def _detect_real(self, frame_bgr, ts: float, rgb=None) -> FrameHands:
+        hands = self.detector.detect(frame_bgr, ts, rgb=rgb)
+        last = self._last
+        if last is not None and len(hands) and len(hands) == len(last) and hands.handedness == last.handedness:
+            dt = max(1e-3, ts - self._last_t)
+            if self._since_real and self._velocity is not None:
+                # How far off the prediction for this frame would have been, per predicted frame
+                pred = last.norm[..., :2] + self._velocity[..., :2] * dt
+                err = float(np.abs((hands.norm[..., :2] - pred) * (hands.width, hands.height)).max())
+                self._residual_px += 0.3 * (err / (self._since_real + 1) - self._residual_px)
+            v_new = (hands.norm - last.norm) / dt
+            if self._velocity is None:
+                self._velocity = v_new
+            else:
+                a = self.smoothing
+                self._velocity = a * v_new + (1.0 - a) * self._velocity
+        else:
+            self._velocity = None  # hands appeared/disappeared: no motion history to trust
+        self._last = hands
+        self._last_t = ts
+        self._since_real = 0
+        self._force = False
+        self.real_frames += 1
+        _metrics.active().inc("real_frames")
+        return hands
+
+    def close(self) -> None:
+        self.detector.close()
@@ -1,68 +1,121 @@
 import math
 import time
+import warnings
 from typing import Optional, Tuple
 
 import cv2
 
-from .hands import landmarks_px
+from . import events as _events
+from .hands import FrameHands
+from .input_dispatch import InputDispatcher, make_backend, screen_size as _screen_size
 from .overlay import draw_label
 
-# Try optional backends for controlling mouse
-try:  # Prefer pyautogui for cross-platform simplicity
-    import pyautogui as _pygui  # type: ignore
-except Exception:  # pragma: no cover - optional
-    _pygui = None
 
-try:
-    from pynput.mouse import Controller as _PynputMouse, Button as _MouseButton  # type: ignore
-except Exception:  # pragma: no cover - optional
-    _PynputMouse = None
-    _MouseButton = None
+def _smoothing_factor(dt: float, cutoff: float) -> float:
+    r = 2.0 * math.pi * cutoff * dt
+    return r / (r + 1.0)
 
 
-def _distance(a: Tuple[int, int], b: Tuple[int, int]) -> float:
-    dx = a[0] - b[0]
-    dy = a[1] - b[1]
-    return math.hypot(dx, dy)
+def smoothing_to_cutoff(alpha: float, fps: float = 30.0) -> float:
+    """One-Euro ``min_cutoff`` (Hz) equivalent to the old per-frame low-pass ``alpha`` at ``fps``.
 
+    Inverse of ``_smoothing_factor``: a cutoff giving the same blend factor per frame.
+    """
+    alpha = min(max(float(alpha), 1e-3), 0.999)
+    return alpha / (1.0 - alpha) * fps / (2.0 * math.pi)
 
-class _LowPass:
-    def __init__(self, alpha: float = 0.2):
-        self.alpha = max(0.0, min(1.0, float(alpha)))
-        self._v: Optional[Tuple[float, float]] = None
 
-    def __call__(self, x: Tuple[float, float]) -> Tuple[float, float]:
-        if self._v is None:
-            self._v = x
-        else:
-            ax = self.alpha
-            self._v = (self._v[0] + ax * (x[0] - self._v[0]), self._v[1] + ax * (x[1] - self._v[1]))
-        return self._v
+class _OneEuro:
+    """One-Euro filter on 2-D points (Casiez et al. 2012).
+
+    The cutoff frequency rises with the filtered speed: heavy smoothing when the hand is
+    still (no jitter), little when it moves fast (little lag). ``velocity`` is the filtered
+    derivative in units per second, used for prediction.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.01, d_cutoff: float = 1.0):
+        self.min_cutoff = float(min_cutoff)
+        self.beta = float(beta)
+        self.d_cutoff = float(d_cutoff)
+        self.reset()
+
+    def reset(self) -> None:
+        self._x: Optional[Tuple[float, float]] = None
+        self._t = 0.0
+        self.velocity: Tuple[float, float] = (0.0, 0.0)
+
+    def __call__(self, x: Tuple[float, float], t: float) -> Tuple[float, float]:
+        if self._x is None:
+            self._x, self._t = (float(x[0]), float(x[1])), t
+            return self._x
+        dt = t - self._t
+        if dt <= 0.0:
+            dt = 1.0 / 30.0  # duplicate/unknown timestamps: assume a nominal frame interval
+        a_d = _smoothing_factor(dt, self.d_cutoff)
+        dx = (x[0] - self._x[0]) / dt
+        dy = (x[1] - self._x[1]) / dt
+        vx = self.velocity[0] + a_d * (dx - self.velocity[0])
+        vy = self.velocity[1] + a_d * (dy - self.velocity[1])
+        a = _smoothing_factor(dt, self.min_cutoff + self.beta * math.hypot(vx, vy))
+        self._x = (self._x[0] + a * (x[0] - self._x[0]), self._x[1] + a * (x[1] - self._x[1]))
+        self._t = t
+        self.velocity = (vx, vy)
+        return self._x
 
 
 class VirtualMouse:
     """Virtual mouse controller using hand landmarks.
 
     - Pointer: index fingertip (id=8)
-    - Click: pinch (thumb tip id=4 close to index tip id=8)
+    - Click: pinch (thumb tip id=4 within ``pinch_threshold`` palm widths of index tip id=8,
+      read from ``FrameHands.pinch_ratio``)
     - Optional scroll: change in pinch distance -> mouse wheel
 
+    The pointer is smoothed with a One-Euro filter (``min_cutoff``/``beta``/``d_cutoff``)
+    and extrapolated by ``predict`` times the frame's age (now minus its capture
+    timestamp, or ``latency`` seconds if given), capped at ``max_predict`` seconds.
+    ``smoothing`` (the old low-pass alpha) is deprecated and mapped onto ``min_cutoff``.
+
     Works best when the app frame is mirrored (use --flip).
     External libs (optional): pyautogui or pynput. If missing, actions are no-ops with on-screen hints.
+    OS events go through ``dispatcher`` (an ``InputDispatcher`` on the best available backend
+    by default), so ``update`` never blocks on the backend. Clicks and scrolls are also
+    reported as ``mouse_down``/``mouse_up``/``scroll`` events; ``draw=False`` skips the hint.
     """
 
+    # Per-frame features read by ``update`` (see ``hands.FEATURES``)
+    features = ("px", "pinch", "overlay")
+
     def __init__(
         self,
         screen_size: Optional[Tuple[int, int]] = None,
         pinch_threshold: float = 0.8,
-        smoothing: float = 0.25,
+        smoothing: Optional[float] = None,
         enable_scroll: bool = False,
         scroll_gain: float = 60.0,
+        min_cutoff: float = 1.0,
+        beta: float = 0.01,
+        d_cutoff: float = 1.0,
+        predict: float = 1.0,
+        max_predict: float = 0.08,
+        latency: Optional[float] = None,
+        dispatcher: Optional[InputDispatcher] = None,
+        draw: bool = True,
     ) -> None:
+        self.draw = draw
         # Determine screen size
         self.screen_w, self.screen_h = self._detect_screen_size(screen_size)
-        self.alpha = smoothing
-        self.filter = _LowPass(alpha=self.alpha)
+        if smoothing is not None:
+            min_cutoff = smoothing_to_cutoff(smoothing)
+            warnings.warn(
+                f"VirtualMouse(smoothing=...) is deprecated; using min_cutoff={min_cutoff:.2f} Hz instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        self.filter = _OneEuro(min_cutoff=min_cutoff, beta=beta, d_cutoff=d_cutoff)
+        self.predict = max(0.0, float(predict))
+        self.max_predict = max(0.0, float(max_predict))
+        self.latency = latency
         self.enable_scroll = enable_scroll
         self.scroll_gain = float(scroll_gain)
 
@@ -72,21 +125,8 @@ class VirtualMouse:
         self._pinch_down = False
 
         # Mouse backend
-        self.backend = None
-        self._mouse = None
-        if _pygui is not None:
-            try:
-                _pygui.FAILSAFE = False
-                self.backend = "pyautogui"
-                self._mouse = _pygui
-            except Exception:
-                pass
-        if self.backend is None and _PynputMouse is not None:
-            try:
-                self._mouse = _PynputMouse()
-                self.backend = "pynput"
-            except Exception:
-                pass
+        self.input = dispatcher if dispatcher is not None else InputDispatcher(make_backend())
+        self.backend = self.input.name
 
         # Accumulators
         self._scroll_accum = 0.0
@@ -95,96 +135,64 @@ class VirtualMouse:
     def _detect_screen_size(self, hint: Optional[Tuple[int, int]]) -> Tuple[int, int]:
         if hint:
             return int(hint[0]), int(hint[1])
-        # Try pyautogui
-        if _pygui is not None:
-            try:
-                sz = _pygui.size()
-                return int(sz[0]), int(sz[1])
-            except Exception:
-                pass
         # Fallback common 1080p
-        return 1920, 1080
+        return _screen_size() or (1920, 1080)
 
     def _move_cursor(self, x: float, y: float) -> None:
-        if self.backend == "pyautogui":
-            try:
-                self._mouse.moveTo(x, y)
-            except Exception:
-                pass
-        elif self.backend == "pynput":
-            try:
-                self._mouse.position = (int(x), int(y))
-            except Exception:
-                pass
+        self.input.move(x, y)
 
     def _mouse_down(self) -> None:
-        if self.backend == "pyautogui":
-            try:
-                self._mouse.mouseDown()
-            except Exception:
-                pass
-        elif self.backend == "pynput":
-            try:
-                self._mouse.press(_MouseButton.left)
-            except Exception:
-                pass
+        self.input.button(True)
+        _events.active().emit("mouse_down", pos=self._event_pos())
 
     def _mouse_up(self) -> None:
-        if self.backend == "pyautogui":
-            try:
-                self._mouse.mouseUp()
-            except Exception:
-                pass
-        elif self.backend == "pynput":
-            try:
-                self._mouse.release(_MouseButton.left)
-            except Exception:
-                pass
+        self.input.button(False)
+        _events.active().emit("mouse_up", pos=self._event_pos())
 
     def _scroll(self, dy: int) -> None:
-        if dy == 0:
-            return
-        if self.backend == "pyautogui":
-            try:
-                self._mouse.scroll(dy)
-            except Exception:
-                pass
-        elif self.backend == "pynput":
-            try:
-                self._mouse.scroll(0, int(dy))
-            except Exception:
-                pass
-
-    def _hand_scale(self, pts):
-        # Approximate palm width between index MCP (5) and pinky MCP (17)
-        try:
-            return max(1.0, _distance(pts[5], pts[17]))
-        except Exception:
-            return 100.0
+        self.input.scroll(dy)
+        _events.active().emit("scroll", steps=int(dy))
+
+    def _event_pos(self):
+        return [round(float(v), 1) for v in self._last_pos] if self._last_pos is not None else None
+
+    def _filtered(self, pos: Tuple[float, float], timestamp: float) -> Tuple[float, float]:
+        now = time.time()
+        t = timestamp if timestamp > 0 else now
+        fx, fy = self.filter(pos, t)
+        if self.predict <= 0.0:
+            return fx, fy
+        if self.latency is not None:
+            age = self.latency
+        else:
+            age = now - t if timestamp > 0 else 0.0  # no capture stamp: nothing to compensate
+            if age > 1.0:
+                age = 0.0  # stamp from another clock (e.g. a replayed session)
+        horizon = min(self.max_predict, max(0.0, self.predict * age))
+        vx, vy = self.filter.velocity
+        px = min(max(fx + vx * horizon, 0.0), self.screen_w - 1)
+        py = min(max(fy + vy * horizon, 0.0), self.screen_h - 1)
+        return px, py
 
     def update(self, frame_bgr, results) -> None:
-        if not results or not getattr(results, "multi_hand_landmarks", None):
+        hands = FrameHands.of(results, frame_bgr)
+        if len(hands) == 0:
             self._maybe_release()
             return
         # Use first detected hand
-        hand_landmarks = results.multi_hand_landmarks[0]
-        pts = landmarks_px(frame_bgr, hand_landmarks)
-        if not pts or len(pts) < 21:
-            self._maybe_release()
-            return
+        pts = hands.px[0]
         h, w = frame_bgr.shape[:2]
 
         # Pointer position from index tip
         ix, iy = pts[8]
         sx = int(self.screen_w * (ix / max(1, w)))
         sy = int(self.screen_h * (iy / max(1, h)))
-        sx, sy = self.filter((sx, sy))
+        sx, sy = self._filtered((sx, sy), hands.timestamp)
         self._move_cursor(sx, sy)
         self._last_pos = (sx, sy)
 
-        # Pinch distance normalized by hand scale
-        pinch_d = _distance(pts[4], pts[8])
-        norm = pinch_d / self._hand_scale(pts)
+        # Pinch distance normalized by palm width; no finger states or gesture matching needed
+        norm = float(hands.pinch_ratio()[0])
         if norm < self.pinch_threshold:
             if not self._pinch_down:
                 self._mouse_down()
@@ -205,13 +213,19 @@ class VirtualMouse:
         self._prev_pinch_norm = norm
 
         # On-screen hint
+        if not self.draw:
+            return
         lib = self.backend or "no-op"
         hint = f"VMOUSE[{lib}] pinch<{self.pinch_threshold:.2f} scroll={'on' if self.enable_scroll else 'off'}"
         draw_label(frame_bgr, hint, (10, frame_bgr.shape[0] - 10))
 
     def _maybe_release(self) -> None:
+        self.filter.reset()  # don't glide in from a stale position when the hand returns
         if self._pinch_down:
             self._mouse_up()
             self._pinch_down = False
         self._prev_pinch_norm = None
 
+    def close(self) -> None:
+        self._maybe_release()
+        self.input.close()
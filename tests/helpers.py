@@ -0,0 +1,115 @@
+"""Test doubles shared by several test modules."""
+import time
+
+import numpy as np
+
+from hand_tracker.hands import FrameHands
+from hand_tracker.recording import SessionRecorder
+
+
+class LM:
+    def __init__(self, x, y, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class HandLandmarks:
+    def __init__(self, pts):
+        self.landmark = [LM(*p) for p in pts]
+
+
+class Category:
+    def __init__(self, label, score):
+        self.label = label
+        self.score = score
+
+
+class Handedness:
+    def __init__(self, label, score=0.9):
+        self.classification = [Category(label, score)]
+
+
+class Results:
+    def __init__(self, hands, handed):
+        self.multi_hand_landmarks = hands
+        self.multi_handedness = handed
+
+
+class FakeHands:
+    """Stands in for mp Hands: reports one hand whose landmarks sit at fixed crop-relative spots."""
+
+    def __init__(self, pts=None):
+        self.pts = pts
+        self.shapes = []
+
+    def process(self, rgb):
+        self.shapes.append(rgb.shape[:2])
+        if self.pts is None:
+            return Results(None, None)
+        return Results([HandLandmarks(self.pts)], [Handedness("Right")])
+
+    def close(self):
+        pass
+
+
+class FakeCapture:
+    """Stand-in for cv2.VideoCapture that produces numbered frames at a fixed rate."""
+
+    def __init__(self, *args, period=0.002, shape=(4, 4, 3), **kwargs):
+        self.period = period
+        self.shape = shape
+        self.n = 0
+        self.props = {}
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+    def read(self, image=None):
+        time.sleep(self.period)
+        self.n += 1
+        if image is None or image.shape != self.shape:
+            image = np.empty(self.shape, np.uint8)  # like cv2: fill the caller's buffer when it fits
+        image[:] = self.n % 256
+        return True, image
+
+    def release(self):
+        pass
+
+
+def make_session(path, n=20, frames=False):
+    rng = np.random.default_rng(3)
+    rec = SessionRecorder(path, frames=frames)
+    written = []
+    for i in range(n):
+        k = i % 3  # 0, 1 or 2 hands
+        hands = FrameHands(rng.uniform(0, 1, (k, 21, 3)), ["Left", "Right"][:k], rng.uniform(0, 1, k),
+                           160, 120, timestamp=100.0 + i / 30)
+        frame = np.full((120, 160, 3), i * 10, np.uint8)
+        rec.write(hands, frame)
+        written.append(hands)
+    rec.close()
+    return written
+
+
+class CountingDetector:
+    def __init__(self, hands=None):
+        self.calls = 0
+        self.hands = hands
+
+    def detect(self, frame, timestamp=None, rgb=None):
+        self.calls += 1
+        h, w = frame.shape[:2]
+        if self.hands is None:
+            return FrameHands.empty(w, h, timestamp or 0.0)
+        return FrameHands(self.hands.norm, self.hands.handedness, self.hands.scores, w, h, timestamp or 0.0)
+
+    def close(self):
+        pass
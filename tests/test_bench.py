@@ -0,0 +1,21 @@
+from hand_tracker.bench import compare, synthetic_hands
+
+
+def report(**stages):
+    return {"results": {"640x480": {k: {"p95_ms": v} for k, v in stages.items()}}}
+
+
+def test_compare_flags_only_real_regressions():
+    base = report(flip=0.20, detect_c1=15.0, draw_hands=0.010)
+    new = report(flip=0.21, detect_c1=19.0, draw_hands=0.020)  # draw_hands: +100% but below noise floor
+    rows, regressions = compare(base, new, threshold=0.10, min_delta_ms=0.05)
+    assert len(rows) == 3
+    assert [r["stage"] for r in regressions] == ["detect_c1"]
+
+
+def test_synthetic_hands_are_well_formed():
+    seq = synthetic_hands(30, 640, 480)
+    assert len(seq) == 30
+    assert all(len(h) == 1 and h.px.shape == (1, 21, 2) for h in seq)
+    counts = {int(h.finger_states()[1][0]) for h in seq}
+    assert len(counts) > 1  # fingers actually curl and extend over the sequence
@@ -0,0 +1,151 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_tracker import camera as camera_mod
+
+from helpers import FakeCapture
+
+
+def test_threaded_read_returns_newest_and_counts_drops(monkeypatch):
+    monkeypatch.setattr(camera_mod.cv2, "VideoCapture", FakeCapture)
+    cam = camera_mod.Camera(0, threaded=True)
+    try:
+        first = cam.read_stamped(timeout=1.0)
+        assert first.ok
+        time.sleep(0.05)  # consumer is slow: several frames get superseded
+        second = cam.read_stamped(timeout=1.0)
+        assert second.ok
+        assert second.frame_id > first.frame_id + 1
+        assert second.timestamp >= first.timestamp
+        # every frame captured between the two reads was superseded without being read
+        assert cam.frames_dropped >= second.frame_id - first.frame_id - 1
+    finally:
+        cam.release()
+
+
+def test_threaded_read_does_not_wait_for_a_new_frame(monkeypatch):
+    slow = lambda *a, **kw: FakeCapture(period=0.2)  # noqa: E731  a 5 fps camera
+    monkeypatch.setattr(camera_mod.cv2, "VideoCapture", slow)
+    cam = camera_mod.Camera(0, threaded=True)
+    try:
+        first = cam.read_stamped(timeout=1.0)  # explicit opt-in wait for the first frame
+        assert first.ok
+        start = time.perf_counter()
+        again = cam.read_stamped()
+        assert time.perf_counter() - start < 0.05
+        assert again.ok and again.frame_id == first.frame_id  # a repeat, visible from the id
+        assert cam.frames_dropped == 0
+    finally:
+        cam.release()
+
+
+def test_sync_read_stamps_frames(monkeypatch):
+    monkeypatch.setattr(camera_mod.cv2, "VideoCapture", FakeCapture)
+    cam = camera_mod.Camera(0)
+    ok, _ = cam.read()
+    assert ok and cam.last_frame_id == 1
+    ok, _ = cam.read()
+    assert ok and cam.last_frame_id == 2
+    assert cam.frames_dropped == 0
+    cam.release()
+
+
+class FakeV4L2:
+    """VideoCapture stand-in for a webcam: snaps requests to its mode table and delivers frames
+    at ``real`` fps, which for some modes is lower than the advertised rate. Time is virtual:
+    each read advances ``clock`` by one frame interval."""
+
+    clock = 0.0
+
+    # (fourcc, w, h) -> (advertised fps values, real fps)
+    MODES = {
+        ("YUYV", 640, 480): ((30,), 30),
+        ("YUYV", 1280, 720): ((10,), 10),
+        ("MJPG", 640, 480): ((60, 30), 60),
+        ("MJPG", 1280, 720): ((60, 30), 20),  # claims 60 but the USB link can't keep up
+    }
+
+    def __init__(self, *args, **kwargs):
+        self.props = {camera_mod.cv2.CAP_PROP_FOURCC: camera_mod.cv2.VideoWriter_fourcc(*"YUYV")}
+        self.mode = ("YUYV", 640, 480)
+        self.fps = 30
+        self.sets = 0
+        self.buffersize = None
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        cv2 = camera_mod.cv2
+        self.sets += 1
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            self.buffersize = value
+            return True
+        fourcc, w, h = self.mode
+        if prop == cv2.CAP_PROP_FOURCC:
+            fourcc = "".join(chr((int(value) >> 8 * i) & 0xFF) for i in range(4))
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            w = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            h = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            rates = self.MODES[self.mode][0]
+            self.fps = min(rates, key=lambda r: abs(r - value))
+            return True
+        # Unsupported combination: the driver snaps to the closest mode of that format
+        modes = [m for m in self.MODES if m[0] == fourcc] or list(self.MODES)
+        self.mode = min(modes, key=lambda m: abs(m[1] - w) + abs(m[2] - h) * (m[1] != w))
+        if self.fps not in self.MODES[self.mode][0]:
+            self.fps = self.MODES[self.mode][0][0]
+        return True
+
+    def get(self, prop):
+        cv2 = camera_mod.cv2
+        fourcc, w, h = self.mode
+        return {
+            cv2.CAP_PROP_FOURCC: float(cv2.VideoWriter_fourcc(*fourcc)),
+            cv2.CAP_PROP_FRAME_WIDTH: float(w),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(h),
+            cv2.CAP_PROP_FPS: float(self.fps),
+        }.get(prop, 0.0)
+
+    def read(self, image=None):
+        real = self.MODES[self.mode][1]
+        FakeV4L2.clock += 1.0 / min(real, self.fps)
+        return True, np.zeros((self.mode[2], self.mode[1], 3), np.uint8)
+
+    def release(self):
+        pass
+
+
+def test_negotiates_verifies_and_caches_the_capture_format(monkeypatch, tmp_path):
+    from hand_tracker.camera_formats import CaptureFormat, rank
+    from hand_tracker import camera_formats
+
+    monkeypatch.setattr(camera_mod.cv2, "VideoCapture", FakeV4L2)
+    monkeypatch.setattr(camera_formats, "time", SimpleNamespace(perf_counter=lambda: FakeV4L2.clock, time=time.time))
+    cache = str(tmp_path / "formats.json")
+    cam = camera_mod.Camera(0, 640, 480, negotiate=True, format_cache=cache)
+    # 640x480: MJPG reaches 60 fps, YUYV only 30
+    assert cam.format.format == CaptureFormat("MJPG", 640, 480, 60) and not cam.format.cached
+    assert cam.cap.buffersize == 1
+    cam.release()
+
+    # 1280x720: MJPG claims 60 fps but delivers 20; MJPG@30 is measured too and does no better,
+    # and YUYV (10 fps) can't beat it, so MJPG stays with its real rate on record
+    cam = camera_mod.Camera(0, 1280, 720, negotiate=True, format_cache=cache)
+    assert cam.format.format == CaptureFormat("MJPG", 1280, 720, 60) and cam.format.measured_fps == 20
+    cam.release()
+
+    # A later start applies the cached result without probing or measuring again
+    cam = camera_mod.Camera(0, 1280, 720, negotiate=True, format_cache=cache)
+    assert cam.format.cached and cam.format.measured_fps == 20
+    assert cam.cap.sets <= 6 and cam.cap.mode == ("MJPG", 1280, 720)
+    cam.release()
+
+    # Equal rates prefer the uncompressed format (no decode)
+    fmts = [CaptureFormat("MJPG", 640, 480, 30), CaptureFormat("YUYV", 640, 480, 30),
+            CaptureFormat("MJPG", 320, 240, 60)]
+    assert rank(fmts, 640, 480)[0].fourcc == "YUYV" and rank(fmts, 640, 480)[-1].width == 320
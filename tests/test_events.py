@@ -0,0 +1,41 @@
+import io
+import json
+
+import numpy as np
+
+from hand_tracker import events
+from hand_tracker.bench import synthetic_hands
+from hand_tracker.games import ReactionGame, RPSGame
+from hand_tracker.hands import FrameHands
+
+
+def test_headless_modes_emit_events_without_touching_the_frame():
+    buf = io.StringIO()
+    events.enable(events.EventLog(buf))
+    try:
+        fist = synthetic_hands(1, 640, 480)[0]
+        norm = fist.norm.copy()
+        norm[0, [8, 12, 16, 20], 1] = norm[0, [6, 10, 14, 18], 1] + 0.05  # fold the fingers
+        norm[0, 4, 0] = norm[0, 2, 0] + (0.05 if fist.handedness[0] == "Right" else -0.05)
+        fist = FrameHands(norm, fist.handedness, fist.scores, 640, 480)
+        frame = np.zeros((480, 640, 3), np.uint8)
+
+        rps = RPSGame(draw=False)
+        rps.countdown_end = 0.0
+        rps.update(frame, fist)
+        rps.update(frame, fist)
+
+        reaction = ReactionGame(draw=False)
+        reaction.next_at = 0.0
+        reaction.update(frame, fist)  # get_ready -> go
+        reaction.update(frame, fist)  # fist closed -> result
+        reaction.update(frame, fist)
+
+        assert not frame.any()
+    finally:
+        events.disable()
+
+    lines = [json.loads(line) for line in buf.getvalue().splitlines()]
+    assert [e["type"] for e in lines] == ["rps_result", "reaction"]
+    assert lines[0]["player"] == "rock" and lines[0]["recognized"]
+    assert lines[1]["ms"] >= 0 and lines[1]["best_ms"] == lines[1]["ms"]
@@ -0,0 +1,54 @@
+import os
+
+import cv2
+import numpy as np
+
+from hand_tracker.extract import extract, load_dataset
+
+
+def write_video(path, n=10, size=(64, 48)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for i in range(n):
+        writer.write(np.full((size[1], size[0], 3), i * 20, np.uint8))
+    writer.release()
+
+
+def test_extract_is_ordered_and_resumable(tmp_path):
+    video = str(tmp_path / "clip.avi")
+    write_video(video)
+    images = tmp_path / "imgs"
+    images.mkdir()
+    for i in range(3):
+        cv2.imwrite(str(images / f"{i:03d}.png"), np.zeros((32, 32, 3), np.uint8))
+    out = str(tmp_path / "out")
+
+    manifest = extract([video, str(images)], out, workers=2, chunk_size=4, verbose=False)
+    assert [(c["start"], c["stop"]) for c in manifest["chunks"]] == [(0, 4), (4, 8), (8, 10), (0, 3)]
+
+    data = load_dataset(out)
+    assert len(data) == 2
+    vid = next(v for k, v in data.items() if k.startswith("clip-"))
+    assert vid["frame_index"].tolist() == list(range(10))
+    assert vid["hand_offsets"].shape == (11,)
+    assert vid["landmarks"].shape[1:] == (21, 3)
+
+    # Resume: only the missing chunk is recomputed
+    files = [os.path.join(out, c["file"]) for c in manifest["chunks"]]
+    mtimes = [os.path.getmtime(f) for f in files]
+    os.remove(files[1])
+    extract([video, str(images)], out, workers=1, chunk_size=4, verbose=False)
+    assert os.path.exists(files[1])
+    assert [os.path.getmtime(f) for i, f in enumerate(files) if i != 1] == mtimes[:1] + mtimes[2:]
+
+    # A different chunk size re-plans the ranges: no chunk with a stale range is reused
+    manifest = extract([video, str(images)], out, workers=1, chunk_size=3, verbose=False)
+    assert [(c["start"], c["stop"]) for c in manifest["chunks"]][:4] == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    vid = next(v for k, v in load_dataset(out).items() if k.startswith("clip-"))
+    assert vid["frame_index"].tolist() == list(range(10)) and "frame_range" not in vid
+
+    # Replacing an image keeps every range but changes the fingerprint: that chunk is redone
+    os.remove(images / "001.png")
+    cv2.imwrite(str(images / "001.png"), np.full((40, 40, 3), 255, np.uint8))
+    extract([video, str(images)], out, workers=1, chunk_size=3, verbose=False)
+    imgs = next(v for k, v in load_dataset(out).items() if k.startswith("imgs-"))
+    assert imgs["image_size"].tolist() == [[32, 32], [40, 40], [32, 32]] and "source_fingerprint" not in imgs
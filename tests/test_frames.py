@@ -0,0 +1,64 @@
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from hand_tracker import camera as camera_mod
+from hand_tracker.frames import FramePool
+from hand_tracker.hands import HandDetector
+
+from helpers import FakeCapture, FakeHands
+
+SHAPE = (480, 640, 3)
+
+
+def test_fused_mirror_rgb_matches_flip_then_convert():
+    frame = np.random.default_rng(6).integers(0, 256, SHAPE, dtype=np.uint8)
+    pool = FramePool()
+    rgb = pool.to_rgb(frame, mirror=True)
+    assert np.array_equal(rgb, cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    assert not rgb.flags.writeable
+    assert np.array_equal(pool.to_rgb(frame[:, :320], mirror=True), cv2.cvtColor(cv2.flip(frame[:, :320], 1), cv2.COLOR_BGR2RGB))
+
+
+def peak_growth(step, n=30):
+    for _ in range(5):  # warm up: pools and caches are filled here
+        step()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(n):
+            step()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def test_steady_state_frame_path_allocates_no_frames(monkeypatch):
+    monkeypatch.setattr(camera_mod.cv2, "VideoCapture", lambda *a, **k: FakeCapture(period=0, shape=SHAPE))
+    frame_bytes = int(np.prod(SHAPE))
+
+    cam = camera_mod.Camera(0, reuse_buffers=True)
+    det = HandDetector()
+    det.hands.close()
+    det.hands = FakeHands()
+    pool = FramePool()
+
+    def pooled():
+        ok, frame = cam.read()
+        rgb = pool.to_rgb(frame, mirror=True)
+        det.detect(pool.flip(frame), rgb=rgb)
+        det.detect(frame)  # detector-side conversion reuses its own buffer too
+
+    legacy_cam = camera_mod.Camera(0)
+
+    def legacy():
+        ok, frame = legacy_cam.read()
+        frame = cv2.flip(frame, 1)
+        det.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    assert peak_growth(legacy) >= frame_bytes  # sanity check: the old path allocates whole frames
+    assert peak_growth(pooled) < 64 * 1024
+    cam.release()
+    legacy_cam.release()
@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from hand_tracker.gestures import count_fingers_up
+from hand_tracker.gestures import FINGERS, count_fingers_up, finger_states_batch
 
 
 class LM:
@@ -99,3 +100,87 @@ def test_right_thumb_up():
     assert states["Thumb"] is True
     assert cnt == 1
 
+
+def reference_states(pts, label):
+    # Original per-hand heuristics, kept as an oracle for the batch classifier
+    label_l = (label or "").lower()
+    tip_x, mcp_x = pts[4][0], pts[2][0]
+    thumb = tip_x < mcp_x if label_l.startswith("left") else tip_x > mcp_x
+    others = [pts[t][1] < pts[p][1] for t, p in ((8, 6), (12, 10), (16, 14), (20, 18))]
+    return [thumb] + others
+
+
+def test_batch_matches_scalar_on_random_poses():
+    rng = np.random.default_rng(42)
+    n = 500
+    img = make_blank()
+    # Coarse grid so ties (equal pixel coords) are common, plus some off-frame points
+    norm = rng.integers(-5, 25, size=(n, 21, 3)) / 20.0
+    labels = rng.choice(["Left", "Right", "left", "Hand", ""], size=n).tolist()
+
+    states, counts = finger_states_batch(norm, labels, image_size=(img.shape[1], img.shape[0]))
+    assert states.shape == (n, 5) and states.dtype == bool
+    assert counts.shape == (n,)
+
+    for i in range(n):
+        hl = HandLandmarks([tuple(p[:2]) for p in norm[i]])
+        cnt, st = count_fingers_up(img, hl, labels[i])
+        pts = [(int(x * img.shape[1]), int(y * img.shape[0])) for x, y, _ in norm[i]]
+        assert [st[f] for f in FINGERS] == reference_states(pts, labels[i]) == states[i].tolist()
+        assert cnt == counts[i]
+
+
+def test_registry_matches_hand_coded_rules():
+    from hand_tracker.gestures import REGISTRY
+    from hand_tracker.hands import FrameHands
+
+    rng = np.random.default_rng(7)
+    n = 400
+    norm = rng.integers(0, 20, size=(n, 21, 3)) / 20.0
+    labels = rng.choice(["Left", "Right"], size=n).tolist()
+    hands = FrameHands(norm, labels, np.ones(n), 640, 480)
+    m = hands.gestures()
+    assert m is hands.gestures()  # evaluated once per frame
+    states, counts = hands.finger_states()
+    for i in range(n):
+        thumb, index, middle, ring, pinky = states[i]
+        victory = index and middle and not ring and not pinky
+        rps = "rock" if counts[i] <= 1 else "paper" if counts[i] >= 4 else "scissors" if victory else None
+        assert {"fist": "rock", "open_palm": "paper", "victory": "scissors"}.get(
+            m.first(("fist", "open_palm", "victory"), i)) == rps
+        assert m.has("victory", i) == victory
+        # Pinch ratio as VirtualMouse computed it from pixel points
+        pts = hands.px[i]
+        palm = max(1.0, float(np.hypot(*(pts[5] - pts[17]))))
+        ratio = float(np.hypot(*(pts[4] - pts[8]))) / palm
+        assert m.distance(4, 8)[i] == pytest.approx(ratio)
+        assert m.has("pinch", i) == (ratio <= 0.45)
+        assert all(0.0 <= s <= 1.0 for _, s in m.matching(i))
+    assert set(REGISTRY.names) >= {"fist", "open_palm", "victory", "pinch"}
+
+
+def test_angle_constraints_scores_and_reregistration():
+    from hand_tracker.gestures import Gesture, GestureRegistry
+    from hand_tracker.hands import FrameHands
+
+    norm = np.zeros((2, 21, 3))
+    norm[:, 5] = norm[:, 17] = (0.5, 0.5, 0)
+    norm[:, 17, 0] += 0.1
+    # Landmarks 0-1-2: a right angle for hand 0, a straight line for hand 1
+    norm[:, 1] = (0.5, 0.5, 0)
+    norm[:, 0] = (0.5, 0.3, 0)
+    norm[0, 2] = (0.7, 0.5, 0)
+    norm[1, 2] = (0.5, 0.7, 0)
+    hands = FrameHands(norm, ["Right", "Right"], [1, 1], 100, 100)
+
+    reg = GestureRegistry([Gesture("bent", angles={(0, 1, 2): (60, 120)})])
+    m = hands.gestures(reg)
+    assert m.mask[:, 0].tolist() == [True, False]
+    assert m.score("bent", 0) == pytest.approx(0.5) and m.score("bent", 1) == 0.0
+    assert m.matching(0) == [("bent", pytest.approx(0.5))]
+
+    reg.register(Gesture("bent", angles={(0, 1, 2): (60, 120)}))  # unchanged: cache stays valid
+    assert hands.gestures(reg) is m
+    reg.register(Gesture("straight", angles={(0, 1, 2): (170, None)}))
+    m2 = hands.gestures(reg)
+    assert m2 is not m and m2.first(("straight", "bent"), 1) == "straight"
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from hand_tracker.hands import FrameHands, landmarks_px
+
+from helpers import FakeHands, Handedness, HandLandmarks, Results
+
+
+def test_from_results_matches_landmarks_px():
+    rng = np.random.default_rng(0)
+    img = np.zeros((480, 640, 3), np.uint8)
+    hands = [HandLandmarks(rng.uniform(-0.1, 1.1, size=(21, 3)).astype(np.float32).tolist()) for _ in range(2)]
+    results = Results(hands, [Handedness("Left"), Handedness("Right", 0.7)])
+
+    fh = FrameHands.of(results, img)
+    assert fh.norm.shape == (2, 21, 3) and fh.norm.dtype == np.float32
+    assert fh.px.shape == (2, 21, 2) and fh.px.dtype == np.int32
+    assert fh.handedness == ["Left", "Right"]
+    assert np.allclose(fh.scores, [0.9, 0.7])
+    for i, hl in enumerate(hands):
+        assert fh.points(i) == landmarks_px(img, hl)
+    assert FrameHands.of(fh, img) is fh
+
+
+def test_compat_views_from_arrays():
+    norm = np.random.default_rng(1).uniform(0, 1, size=(1, 21, 3))
+    fh = FrameHands(norm, ["Right"], [0.8], 320, 240)
+    img = np.zeros((240, 320, 3), np.uint8)
+    assert landmarks_px(img, fh.multi_hand_landmarks[0]) == fh.points(0)
+    assert fh.multi_handedness[0].classification[0].label == "Right"
+    assert FrameHands.empty(320, 240).multi_hand_landmarks is None
+
+
+def test_roi_crop_maps_landmarks_back_to_full_frame():
+    from hand_tracker.hands import HandDetector
+
+    det = HandDetector(roi=True, roi_size=64, roi_refresh=5)
+    det.hands.close()
+    rng = np.random.default_rng(2)
+    crop_pts = rng.uniform(0.3, 0.7, size=(21, 3)).tolist()
+    det.hands = FakeHands(crop_pts)  # full-frame pass
+    built = []
+    det.mp_hands = SimpleNamespace(Hands=lambda **options: built.append(options) or FakeHands(crop_pts))
+    frame = np.zeros((720, 1280, 3), np.uint8)
+
+    full = det.detect(frame)
+    assert det._roi_box is not None
+    x0, y0, x1, y1 = det._roi_box
+    side = x1 - x0
+    assert side == y1 - y0 and 0 <= x0 and x1 <= 1280 and 0 <= y0 and y1 <= 720
+
+    roi = det.detect(frame)
+    assert det._roi_hands.shapes[-1] == (64, 64)  # crop was downscaled for inference
+    # The box moves between frames, so crops must not inherit tracking state from the last one
+    assert [o["static_image_mode"] for o in built] == [True]
+    expected_x = (np.asarray(crop_pts)[:, 0] * side + x0) / 1280
+    expected_y = (np.asarray(crop_pts)[:, 1] * side + y0) / 720
+    assert np.allclose(roi.norm[0, :, 0], expected_x, atol=1e-5)
+    assert np.allclose(roi.norm[0, :, 1], expected_y, atol=1e-5)
+    assert (roi.width, roi.height) == (1280, 720) and len(full) == 1
+
+    # Losing the hand in the crop falls back to a full-frame pass in the same call
+    det._roi_hands.pts = None
+    n_full = len(det.hands.shapes)
+    assert len(det.detect(frame)) == 1
+    assert len(det.hands.shapes) == n_full + 1
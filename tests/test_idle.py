@@ -0,0 +1,63 @@
+import pytest
+
+from hand_tracker.bench import gate_clips, synthetic_hands
+from hand_tracker.idle import ACTIVE, IDLE, IdleController
+
+from helpers import CountingDetector
+
+DETECT_S = 0.03
+
+
+class SlowDetector(CountingDetector):
+    """CountingDetector whose every call takes ``DETECT_S`` of the fake clock."""
+
+    def __init__(self, now):
+        super().__init__()
+        self.now = now
+
+    def detect(self, frame, timestamp=None, rgb=None):
+        self.now[0] += DETECT_S
+        return super().detect(frame, timestamp, rgb)
+
+
+def test_idles_without_hands_and_wakes_on_motion_or_a_probed_hand():
+    clips = gate_clips(4, 160, 120)
+    still, moved = clips["static"][0], clips["moving"][0]
+    now, slept = [1000.0], []  # one fake clock for capture stamps, pacing and latency
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    det, probe = SlowDetector(now), SlowDetector(now)
+    ctl = IdleController(det, idle_after=0.5, idle_fps=10, probe_factory=lambda: probe, probe_every=1.0,
+                         sleep=sleep, clock=lambda: now[0], wall_clock=lambda: now[0])
+
+    def step(frame, wait=0.0):
+        now[0] += wait
+        return ctl.detect(frame, now[0])  # captured "now"
+
+    step(still)
+    step(still, 0.4)
+    assert ctl.state == ACTIVE and det.calls == 2
+    step(still, 0.2)  # no hand for 0.6 s
+    assert ctl.state == IDLE
+    for _ in range(3):
+        assert len(step(still)) == 0
+    assert det.calls == 3 and probe.calls == 0  # idle frames run no inference
+    assert slept == pytest.approx([0.1] * 3)  # each quiet frame waits for its 10 fps slot
+    step(moved)
+    assert ctl.state == ACTIVE and det.calls == 4 and ctl.wakes == 1
+    # Bounded: the motion could only start after the last quiet frame was captured
+    assert ctl.wake_latencies_ms[0] <= (ctl.idle_interval + DETECT_S) * 1000.0 + 1e-6
+
+    # Idle again; a hand that appears without moving the scene is found by the probe
+    step(still, 0.6)
+    assert ctl.state == IDLE
+    while probe.calls == 0 and ctl.state == IDLE:
+        probe.hands = det.hands = synthetic_hands(1, 160, 120)[0]
+        hands = step(still)
+    assert probe.calls == 1 and ctl.state == ACTIVE and len(hands) == 1 and ctl.wakes == 2
+    seconds = ctl.state_seconds()
+    assert seconds[IDLE] > 1.0 and seconds[ACTIVE] > 0
+    ctl.close()
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import numpy as np
+
+from hand_tracker.input_dispatch import FakeBackend, InputDispatcher
+
+
+class SlowBackend(FakeBackend):
+    """Fake backend that blocks like pyautogui's PAUSE until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def move(self, x, y):
+        self.gate.wait(2.0)
+        super().move(x, y)
+
+
+def test_moves_coalesce_and_ordered_events_keep_their_place():
+    backend = SlowBackend()
+    disp = InputDispatcher(backend, move_hz=0)
+    disp.move(0, 0)  # the worker picks this up and blocks in the backend
+    time.sleep(0.05)
+    t0 = time.perf_counter()
+    for i in range(1, 100):
+        disp.move(i, i)
+    disp.button(True)
+    for i in range(100, 200):
+        disp.move(i, i)
+    disp.key("right")
+    disp.button(False)
+    assert time.perf_counter() - t0 < 0.05  # callers never wait on the backend
+    backend.gate.set()
+    assert disp.flush(2.0)
+    disp.close()
+
+    assert backend.kinds() == ["move", "move", "down", "move", "key", "up"]
+    moves = [e[2] for e in backend.events if e[1] == "move"]
+    assert moves == [(0, 0), (99, 99), (199, 199)]
+    assert disp.coalesced == 197
+
+
+def test_moves_are_rate_limited():
+    backend = FakeBackend()
+    disp = InputDispatcher(backend, move_hz=50)
+    t_end = time.perf_counter() + 0.3
+    i = 0
+    while time.perf_counter() < t_end:
+        disp.move(i, 0)
+        i += 1
+        time.sleep(0.001)
+    disp.close()
+    stamps = np.array([e[0] for e in backend.events])
+    assert len(stamps) <= 0.3 * 50 + 2
+    assert np.diff(stamps[:-1]).min() >= 0.02 * 0.9  # close() flushes the last move right away
+    assert backend.events[-1][2] == (i - 1, 0)  # the final position is never lost
+
+
+def test_virtual_mouse_pinch_goes_through_dispatcher():
+    from hand_tracker.hands import FrameHands
+    from hand_tracker.virtual_mouse import VirtualMouse
+
+    backend = FakeBackend()
+    vm = VirtualMouse(screen_size=(640, 480), dispatcher=InputDispatcher(backend), predict=0.0)
+    norm = np.random.default_rng(5).uniform(0.4, 0.6, (1, 21, 3))
+    norm[0, 4, :2] = norm[0, 8, :2]  # thumb on index tip: pinch
+    frame = np.zeros((480, 640, 3), np.uint8)
+    vm.update(frame, FrameHands(norm, ["Right"], [0.9], 640, 480))
+    vm.update(frame, FrameHands.empty(640, 480))
+    vm.close()
+    assert backend.kinds() == ["move", "down", "up"]
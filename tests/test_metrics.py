@@ -0,0 +1,65 @@
+import json
+
+from hand_tracker import metrics
+
+
+def test_spans_fill_histograms_and_exporters():
+    reg = metrics.Metrics()
+    for ms in [0.3] * 90 + [20.0] * 10:
+        reg.observe("inference", ms)
+    with reg.span("capture"):
+        pass
+    reg.inc("frames", 3)
+    reg.set_gauge("fps", 29.5)
+
+    h = reg.histograms["inference"]
+    assert h.count == 100 and sum(h.counts) == 100
+    assert 0.25 <= h.quantile(0.5) <= 0.5
+    assert 16.0 <= h.quantile(0.95) <= 33.0
+
+    snap = json.loads(reg.to_json())
+    assert snap["spans"]["capture"]["count"] == 1
+    assert snap["counters"]["frames"] == 3 and snap["gauges"]["fps"] == 29.5
+
+    prom = reg.to_prometheus()
+    assert 'hand_tracker_stage_seconds_bucket{stage="inference",le="+Inf"} 100' in prom
+    assert "hand_tracker_frames_total 3" in prom
+    assert "hand_tracker_fps 29.5" in prom
+
+
+def test_disabled_by_default_and_shared_null_span():
+    assert metrics.active() is metrics.NULL
+    assert metrics.NULL.span("a") is metrics.NULL.span("b")
+    reg = metrics.enable()
+    try:
+        assert metrics.active() is reg
+    finally:
+        metrics.disable()
+    assert metrics.active() is metrics.NULL
+
+
+def test_concurrent_updates_are_not_lost():
+    import sys
+    import threading
+
+    reg = metrics.Metrics()
+    n, threads = 20000, 4
+
+    def work():
+        for i in range(n):
+            reg.inc("frames")
+            reg.observe("detect", i % 50)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    hist = reg.histograms["detect"]
+    assert reg.counters["frames"] == n * threads
+    assert hist.count == sum(hist.counts) == n * threads
@@ -0,0 +1,58 @@
+import numpy as np
+
+from hand_tracker.bench import gate_clips, synthetic_hands
+from hand_tracker.motion_gate import MotionGate
+
+from helpers import CountingDetector
+
+
+def test_static_frames_reuse_the_last_result_until_it_goes_stale():
+    clips = gate_clips(60, 320, 240)
+    det = CountingDetector(synthetic_hands(1, 320, 240)[0])
+    gate = MotionGate(det, max_stale=0.5)
+    out = [gate.detect(f, 10.0 + i / 30) for i, f in enumerate(clips["static"])]
+    # Sensor noise never counts as motion: one inference, then one every 0.5 s of frames
+    assert det.calls == 4 and gate.skipped == 56 and gate.skip_ratio == 56 / 60
+    assert all(len(h) == 1 for h in out) and [h.timestamp for h in out] == [10.0 + i / 30 for i in range(60)]
+    assert not out[0].synthetic and out[1].synthetic
+    assert np.array_equal(out[5].norm, out[0].norm)
+
+
+def test_motion_runs_the_detector_and_empty_results_are_reused_too():
+    clips = gate_clips(40, 320, 240)
+    det = CountingDetector()
+    gate = MotionGate(det, threshold=0.005)
+    for i, f in enumerate(clips["moving"]):
+        assert len(gate.detect(f, i / 30)) == 0
+    assert det.calls >= 30  # the blob keeps moving; only its turning points look still
+
+    det = CountingDetector()
+    gate = MotionGate(det, threshold=0.005)
+    frame = clips["static"][0]
+    gate.detect(frame, 1.0)
+    gate.detect(frame, 1.1)
+    assert det.calls == 1 and gate.last_change == 0.0
+    lit = frame.copy()
+    lit[100:140, 150:200] = 255  # a hand-sized patch changes
+    gate.detect(lit, 1.2)
+    assert det.calls == 2 and gate.last_change > 0.005
+
+
+def test_gate_benchmark_reports_skips_per_clip_and_threshold():
+    from hand_tracker.bench import bench_gate
+
+    report = bench_gate(gate_clips(31, 160, 120), [0.005, 0.5], detector_factory=CountingDetector)
+    assert set(report) == {"static", "moving"}
+    assert report["static"]["gate"]["0.005"]["skip_ratio"] > 0.9
+    assert report["moving"]["gate"]["0.005"]["skip_ratio"] < report["moving"]["gate"]["0.5"]["skip_ratio"]
+
+
+def test_high_threshold_still_runs_the_detector_without_a_fresh_result():
+    frame = gate_clips(1, 160, 120)["static"][0]
+    det = CountingDetector()
+    gate = MotionGate(det, threshold=1.0, max_stale=0.5)
+    assert len(gate.detect(frame, 1.0)) == 0 and det.calls == 1  # first frame: nothing to reuse
+    gate.detect(frame, 1.2)
+    assert det.calls == 1 and gate.skipped == 1
+    gate.detect(frame, 2.0)  # the last result is older than max_stale
+    assert det.calls == 2 and gate.skipped == 1
@@ -0,0 +1,48 @@
+import numpy as np
+
+from hand_tracker.multicam import FrameRing, MultiCamera
+
+from helpers import make_session
+
+
+def test_frame_ring_roundtrip_across_attachments():
+    ring = FrameRing((4, 6, 3), slots=3)
+    reader = FrameRing((4, 6, 3), slots=3, name=ring.name)
+    try:
+        seqs = [ring.write(np.full((4, 6, 3), i, np.uint8), 10.0 + i) for i in range(5)]
+        assert seqs == [1, 2, 3, 4, 5]
+        out = np.empty((4, 6, 3), np.uint8)
+        assert reader.read(5, out) is out and (out == 4).all()
+        assert reader.read(1) is None  # overwritten two writes ago
+        big = np.full((8, 12, 3), 7, np.uint8)
+        assert (reader.read(ring.write(big, 20.0)) == 7).all()
+    finally:
+        reader.close()
+        ring.close()
+
+
+def test_sources_merge_into_one_tiled_stream(tmp_path):
+    path = str(tmp_path / "s.htrk")
+    written = make_session(path, n=60, frames=True)
+    cams = MultiCamera(["synthetic:160x120@60", path], width=160, height=120, detect=False)
+    try:
+        stamps = []
+        while len(stamps) < 8:
+            ok, frame = cams.read(timeout=5.0)
+            assert ok
+            assert frame.shape == (120, 320, 3)
+            hands = cams.detect(frame)
+            assert (hands.width, hands.height) == (320, 120)
+            # Every hand came from the replayed source, whose tile is the right half
+            assert (cams.hand_sources == 1).all()
+            assert (hands.norm[..., 0] >= 0.5).all()
+            assert len(hands) == len(cams.last_hands[1])
+            right = frame[:, 160:].astype(int)
+            assert frame[:, :160].any() and np.ptp(right) <= 4  # pattern | flat recorded frame
+            stamps.append(cams.last_timestamp)
+            assert cams.skew < 0.2
+        assert stamps == sorted(stamps) and len(set(stamps)) == len(stamps)
+        recorded = {len(h) for h in written}
+        assert {len(h) for h in cams.last_hands} <= recorded
+    finally:
+        cams.release()
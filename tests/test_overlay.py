@@ -0,0 +1,52 @@
+import cv2
+import numpy as np
+import pytest
+
+from hand_tracker.bench import synthetic_hands
+from hand_tracker.hands import FrameHands
+from hand_tracker.overlay import draw_hands, draw_hands_mp, draw_label
+
+
+def test_draw_hands_matches_drawing_utils():
+    hands = synthetic_hands(10, 640, 480, seed=1)
+    # One hand partly outside the frame: off-image landmarks and their connections are skipped
+    edge = hands[0].norm.copy()
+    edge[..., 0] += 0.45 - edge[..., 0].min() + 0.2
+    hands.append(FrameHands(edge, ["Left"], [0.9], 640, 480))
+    for fh in hands:
+        one = FrameHands(fh.norm[:1], fh.handedness[:1], fh.scores[:1], 640, 480)
+        fast = np.full((480, 640, 3), 40, np.uint8)
+        ref = fast.copy()
+        draw_hands(fast, one)
+        draw_hands_mp(ref, one)
+        assert np.array_equal(fast, ref)
+
+
+def test_cached_label_matches_direct_drawing():
+    def direct(image, text, origin, bg, fg):
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+        x, y = origin
+        cv2.rectangle(image, (max(0, x), max(0, y - h - 12)), (max(0, x) + w + 12, max(0, y + baseline + 3)), bg, -1)
+        cv2.putText(image, text, (x + 6, y - 6), cv2.FONT_HERSHEY_SIMPLEX, 0.6, fg, 2, cv2.LINE_AA)
+
+    for origin in [(10, 470), (300, 200), (630, 479), (5, 8)]:
+        for _ in range(2):  # second pass hits the sprite cache
+            img = np.full((480, 640, 3), 90, np.uint8)
+            ref = img.copy()
+            draw_label(img, "Right: 3", origin, (0, 0, 255))
+            direct(ref, "Right: 3", origin, (0, 0, 255), (255, 255, 255))
+            assert np.array_equal(img, ref)
+
+
+def test_unsupported_keypoint_style_raises_value_error(monkeypatch):
+    from hand_tracker import overlay
+
+    styles = overlay.mp_styles.get_default_hand_landmarks_style()
+    styles[0] = type(styles[0])(color=styles[0].color, thickness=2, circle_radius=styles[0].circle_radius)
+    monkeypatch.setattr(overlay.mp_styles, "get_default_hand_landmarks_style", lambda: styles)
+    overlay._hand_style.cache_clear()
+    try:
+        with pytest.raises(ValueError):
+            overlay._hand_style()
+    finally:
+        overlay._hand_style.cache_clear()
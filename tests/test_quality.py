@@ -0,0 +1,78 @@
+import numpy as np
+
+from hand_tracker.bench import synthetic_hands
+from hand_tracker.hands import FrameHands
+from hand_tracker.quality import QualityController, QualityLevel, default_ladder
+
+
+def test_default_ladder_changes_one_parameter_per_step():
+    assert default_ladder(1, 2) == [
+        QualityLevel(1.0, 1, 2), QualityLevel(0.75, 1, 2), QualityLevel(0.75, 0, 2),
+        QualityLevel(0.5, 0, 2), QualityLevel(0.5, 0, 1),
+    ]
+    ladder = default_ladder(2, 1, scales=(0.5, 1.0))
+    assert ladder[0] == (1.0, 2, 1) and ladder[-1] == (0.5, 0, 1) and len(ladder) == 4
+
+
+class Clock:
+    t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class CostlyDetector:
+    """Advances ``clock`` by a cost that grows with complexity and input area."""
+
+    built = []
+
+    def __init__(self, clock, complexity, max_hands, load):
+        self.clock, self.complexity, self.max_hands, self.load = clock, complexity, max_hands, load
+        self.shapes = []
+        self.closed = False
+        CostlyDetector.built.append(self)
+
+    def detect(self, frame, timestamp=None, rgb=None):
+        h, w = frame.shape[:2]
+        self.shapes.append((h, w))
+        self.clock.t += self.load[0] * (1 + self.complexity) * (h * w) / (480 * 640) / 1000.0
+        hand = synthetic_hands(1, w, h)[0]
+        return FrameHands(hand.norm, hand.handedness, hand.scores, w, h, timestamp or 0.0)
+
+    def close(self):
+        self.closed = True
+
+
+def test_steps_down_when_over_budget_and_back_up_with_hysteresis():
+    clock, load = Clock(), [20.0]  # ms per frame at complexity 0, full size
+    CostlyDetector.built = []
+    ctl = QualityController(
+        lambda c, n: CostlyDetector(clock, c, n, load), budget_ms=20.0, ladder=default_ladder(1, 2),
+        window=10, up_windows=2, clock=clock,
+    )
+    frame = np.zeros((480, 640, 3), np.uint8)
+
+    def run(frames):
+        for _ in range(frames):
+            hands = ctl.detect(frame, 1.0)
+            assert (hands.width, hands.height) == (640, 480)
+        ctl._rebuild is not None and ctl._rebuild.join()
+
+    run(10)  # 40 ms at (1.0, 1): too slow
+    assert ctl.level == 1 and CostlyDetector.built[0].shapes[-1] == (480, 640)
+    run(10)  # 22.5 ms at (0.75, 1): still too slow, rebuild with complexity 0 in the background
+    run(1)
+    assert ctl.level == 2 and CostlyDetector.built[0].closed
+    assert CostlyDetector.built[-1].complexity == 0 and CostlyDetector.built[-1].shapes[-1] == (360, 480)
+    run(60)  # 11.25 ms: calm, but level 1 is predicted to cost 22.5 ms again, so it stays here
+    assert ctl.level == 2
+    assert [d["reason"] for d in ctl.decisions] == ["over budget", "over budget"]
+
+    load[0] = 5.0  # scene got cheaper: calm windows step back up, level by level
+    run(20)
+    assert ctl.level == 2  # level 1 failed once, so it needs 4 calm windows instead of 2
+    run(25)
+    assert ctl.level == 1 and ctl.decisions[-1]["reason"] == "under budget"
+    assert ctl.decisions[-1]["complexity"] == 1 and CostlyDetector.built[-1].complexity == 1
+    ctl.close()
+    assert CostlyDetector.built[-1].closed
@@ -0,0 +1,208 @@
+import threading
+
+import numpy as np
+import pytest
+
+from hand_tracker.bench import synthetic_hands
+from hand_tracker.hands import FrameHands
+from hand_tracker.runtime import ControlServer, ModeGroup, ModeSwitcher, open_warm, send_command
+
+
+class _Mode:
+    def __init__(self, name, options):
+        self.name, self.options = name, options
+        self.frames = 0
+        self.closed = False
+
+    def update(self, frame, hands):
+        self.frames += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_switches_modes_in_place_over_the_control_socket():
+    built = []
+
+    def build(name, options):
+        if name == "default":
+            return None
+        built.append(_Mode(name, options))
+        return built[-1]
+
+    switcher = ModeSwitcher(build, "slides", started_at=0.0)
+    stop = threading.Event()
+    control = ControlServer(switcher, stop, port=0).start()
+    frame = np.zeros((480, 640, 3), np.uint8)
+    empty, hand = FrameHands.empty(640, 480), synthetic_hands(1, 640, 480)[0]
+    try:
+        switcher.update(frame, empty)
+        switcher.update(frame, hand)
+        assert set(switcher.first_landmark_ms) == {"cold"}
+
+        port = control.address[1]
+        assert send_command("mode vmouse --vm-scroll", port) == "ok vmouse"
+        assert send_command("mode paint", port).startswith("error")
+        assert send_command("status", port) == "ok slides frames=2"
+        switcher.update(frame, empty)  # applies the switch; no hand yet
+        assert built[0].closed and built[1].options == ["--vm-scroll"]
+        assert "warm" not in switcher.first_landmark_ms
+        switcher.update(frame, hand)
+        assert switcher.name == "vmouse" and built[1].frames == 2
+        assert 0 <= switcher.first_landmark_ms["warm"] < switcher.first_landmark_ms["cold"]
+
+        switcher.request("default")
+        switcher.update(frame, hand)
+        assert switcher.current is None and built[1].closed
+        assert send_command("quit", port) == "ok" and stop.is_set()
+    finally:
+        control.close()
+        switcher.close()
+
+
+class _Camera:
+    released = False
+
+    def release(self):
+        self.released = True
+
+
+class _Detector:
+    def __init__(self):
+        self.shapes = []
+        self.thread = threading.current_thread()
+
+    def detect(self, frame, timestamp=None, rgb=None):
+        self.shapes.append(frame.shape)
+
+
+def test_open_warm_runs_the_detector_once_while_the_camera_opens():
+    cam, detector, timings = open_warm(_Camera, _Detector, (120, 160, 3))
+    assert isinstance(cam, _Camera) and detector.shapes == [(120, 160, 3)]
+    assert detector.thread is not threading.main_thread()
+    assert set(timings) == {"camera_ms", "detector_ms"}
+
+    def broken():
+        raise RuntimeError("no model")
+
+    cam = _Camera()
+    with pytest.raises(RuntimeError, match="no model"):
+        open_warm(lambda: cam, broken)
+    assert cam.released
+
+
+class _Reader(_Mode):
+    def __init__(self, name, features):
+        super().__init__(name, [])
+        self.features = features
+        self.seen = []
+
+    def update(self, frame, hands):
+        super().update(frame, hands)
+        for feature in self.features:
+            if feature == "px":
+                self.seen.append(hands.px)
+            elif feature == "fingers":
+                self.seen.append(hands.finger_states())
+            elif feature == "pinch":
+                self.seen.append(hands.pinch_ratio())
+
+
+def test_mode_list_runs_every_mode_on_shared_lazy_features():
+    features = {"vmouse": ("px", "pinch", "overlay"), "slides": ("px", "fingers")}
+    built = {}
+
+    def build(name, options):
+        built[name] = None if name == "default" else _Reader(name, features[name])
+        return built[name]
+
+    switcher = ModeSwitcher(build, "vmouse,slides,vmouse", started_at=0.0)
+    assert switcher.name == "vmouse,slides" and isinstance(switcher.current, ModeGroup)
+    assert switcher.features == {"px", "pinch", "fingers", "overlay"}
+
+    hand = synthetic_hands(1, 640, 480)[0]
+    assert hand._px is None and hand._fingers is None  # nothing computed before it is read
+    switcher.update(np.zeros((480, 640, 3), np.uint8), hand)
+    vmouse, slides = built["vmouse"], built["slides"]
+    assert vmouse.frames == slides.frames == 1
+    assert vmouse.seen[0] is slides.seen[0]  # px computed once and shared
+    assert hand._gesture_cache == {}  # no gesture matching needed for either
+    np.testing.assert_allclose(hand.pinch_ratio(), hand.gestures().distance(4, 8))
+
+    switcher.request("default")
+    switcher.update(np.zeros((480, 640, 3), np.uint8), hand)
+    assert vmouse.closed and slides.closed and switcher.features == {"overlay"}
+    with pytest.raises(ValueError):
+        switcher.request("vmouse,paint")
+    switcher.close()
+
+
+def test_vmouse_and_slides_share_one_gesture_evaluation_and_one_px_per_frame(monkeypatch):
+    from hand_tracker import app
+    from hand_tracker.gestures import REGISTRY
+
+    args = app.build_argparser().parse_args(["--mode", "vmouse,slides", "--input-backend", "fake"])
+    switcher = ModeSwitcher(app._mode_factory(args), args.mode, started_at=0.0)
+    vmouse, slides = switcher.current.modes
+    assert type(vmouse).__name__ == "VirtualMouse" and type(slides).__name__ == "SlideController"
+    assert {"px", "pinch", "gestures"} <= switcher.features
+
+    counts = {"evaluate": 0, "px": 0}
+    evaluate = REGISTRY.evaluate
+
+    def counting_evaluate(hands):
+        counts["evaluate"] += 1
+        return evaluate(hands)
+
+    px = FrameHands.px
+
+    def counting_px(self):
+        if self._px is None:
+            counts["px"] += 1
+        return px.fget(self)
+
+    monkeypatch.setattr(REGISTRY, "evaluate", counting_evaluate)
+    monkeypatch.setattr(FrameHands, "px", property(counting_px))
+    frame = np.zeros((480, 640, 3), np.uint8)
+    frames = synthetic_hands(5, 640, 480)
+    try:
+        for hands in frames:
+            switcher.update(frame, hands)
+    finally:
+        switcher.close()
+    assert counts == {"evaluate": len(frames), "px": len(frames)}
+    assert vmouse._last_pos is not None and slides.windows  # both modes really ran on every frame
+
+
+def test_quick_relaunch_waits_for_the_starting_runtime(monkeypatch, tmp_path):
+    from hand_tracker import app, launcher, runtime
+
+    monkeypatch.setattr(runtime, "LAUNCH_LOCK", str(tmp_path / "launch.lock"))
+    spawned, bound = [], threading.Event()
+
+    def fake_send(command, port):
+        if not bound.is_set():
+            raise ConnectionRefusedError
+        return "ok " + command.split()[1]
+
+    monkeypatch.setattr(launcher, "send_command", fake_send)
+    monkeypatch.setattr(launcher.subprocess, "Popen", lambda cmd, **kw: spawned.append(cmd))
+    assert launcher._launch(["--mode", "slides"]).startswith("Started")
+    second = []
+    clicker = threading.Thread(target=lambda: second.append(launcher._launch(["--mode", "vmouse"])))
+    clicker.start()
+    clicker.join(0.3)
+    assert clicker.is_alive() and len(spawned) == 1  # waiting, not starting a second runtime
+    bound.set()  # the runtime bound its control port...
+    runtime.release_launch()  # ...and released the lock
+    clicker.join(2.0)
+    assert second == ["Switched the running tracker to vmouse"] and len(spawned) == 1
+
+    # A runtime started anyway exits on the taken control port before touching the camera
+    holder = ControlServer(ModeSwitcher(lambda name, options: None), threading.Event(), port=0)
+    monkeypatch.setattr(app, "open_warm", lambda *a, **kw: pytest.fail("opened the camera"))
+    try:
+        with pytest.raises(SystemExit):
+            app.main(["--control-port", str(holder.address[1]), "--headless"])
+    finally:
+        holder.close()
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from hand_tracker.hands import FrameHands
+from hand_tracker.input_dispatch import FakeBackend, InputDispatcher
+from hand_tracker.motion import MotionWindow
+from hand_tracker.slides import SlideController
+
+
+def victory(cx, cy):
+    """Index + middle up, ring + pinky curled, wrist (landmark 0) at (cx, cy)."""
+    pts = np.zeros((21, 3))
+    pts[:, :2] = (cx, cy)
+    pts[[6, 10], 1] = cy - 0.02
+    pts[[8, 12], 1] = cy - 0.08
+    pts[[14, 18], 1] = cy - 0.03
+    pts[[16, 20], 1] = cy - 0.01
+    return pts
+
+
+def test_motion_window_matches_a_full_refit():
+    rng = np.random.default_rng(5)
+    win = MotionWindow(0.25, capacity=16)
+    ts = 1.7e9 + np.cumsum(rng.uniform(0.005, 0.04, 500))
+    xs, ys = rng.normal(0, 50, 500).cumsum(), rng.normal(0, 50, 500).cumsum()
+    for i, (t, x, y) in enumerate(zip(ts, xs, ys)):
+        win.push(t, x, y)
+        keep = (ts[:i + 1] >= t - 0.25)
+        keep[:max(0, i + 1 - 16)] = False  # ring capacity
+        tw, xw, yw = ts[:i + 1][keep], xs[:i + 1][keep], ys[:i + 1][keep]
+        assert len(win) == len(tw)
+        assert win.displacement() == pytest.approx((xw[-1] - xw[0], yw[-1] - yw[0]) if len(tw) > 1 else (0, 0))
+        if len(tw) > 1:
+            vx, vy = np.polyfit(tw - tw[0], xw, 1)[0], np.polyfit(tw - tw[0], yw, 1)[0]
+            assert win.velocity() == pytest.approx((vx, vy), rel=1e-6, abs=1e-6)
+    win.push(ts[0], 0, 0)  # time went backwards: start over
+    assert len(win) == 1
+
+
+def test_swipes_in_four_directions_from_capture_timestamps():
+    backend = FakeBackend()
+    slides = SlideController(cooldown_sec=0.3, dispatcher=InputDispatcher(backend, move_hz=1000), draw=False)
+    frame = np.zeros((480, 640, 3), np.uint8)
+    t = 1000.0  # capture clock, unrelated to time.time()
+    moves = {"right": (1, 0), "left": (-1, 0), "down": (0, 1), "up": (0, -1)}
+    for ux, uy in moves.values():
+        for i in range(10):  # 0.3 s at 30 fps, ~1500 px/s
+            t += 1 / 30
+            x, y = 0.5 + ux * (i - 5) * 0.08, 0.5 + uy * (i - 5) * 0.1
+            # A second, still hand must not block or trigger anything
+            norm = np.stack([victory(x, y), victory(0.1, 0.1)])
+            slides.update(frame, FrameHands(norm, ["Right", "Left"], [1, 1], 640, 480, timestamp=t))
+        t += 0.5
+        slides.update(frame, FrameHands.empty(640, 480, t))
+    slides.close()
+    assert [e[2][0] for e in backend.events if e[1] == "key"] == list(moves)
+
+
+def test_directions_can_be_restricted():
+    with pytest.raises(ValueError):
+        SlideController(directions=["sideways"], dispatcher=InputDispatcher(None))
+    backend = FakeBackend()
+    slides = SlideController(directions=["left", "right"], dispatcher=InputDispatcher(backend), draw=False)
+    frame = np.zeros((480, 640, 3), np.uint8)
+    for i in range(10):
+        slides.update(frame, FrameHands(victory(0.5, 0.1 + i * 0.08)[None], ["Right"], [1], 640, 480, 5 + i / 30))
+    slides.close()
+    assert backend.events == []
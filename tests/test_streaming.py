@@ -0,0 +1,143 @@
+import time
+
+import numpy as np
+
+from hand_tracker.bench import synthetic_hands
+from hand_tracker.hands import FrameHands
+from hand_tracker.streaming import (
+    EventMessage,
+    FrameMessage,
+    StreamClient,
+    StreamServer,
+    decode,
+    encode_event,
+    encode_event_json,
+    encode_frame,
+    encode_frame_json,
+)
+
+
+def two_hands():
+    f = synthetic_hands(1, 640, 480)[0]
+    return FrameHands(np.repeat(f.norm, 2, axis=0), ["Left", "Right"], [0.9, 0.8], 640, 480, timestamp=123.5)
+
+
+def test_binary_and_json_messages_roundtrip():
+    hands = two_hands()
+    states, counts = hands.finger_states()
+    for data in (encode_frame(7, hands), encode_frame_json(7, hands)):
+        msg = decode(data)
+        assert isinstance(msg, FrameMessage)
+        assert (msg.seq, msg.timestamp, msg.width, msg.height) == (7, 123.5, 640, 480)
+        assert np.allclose(msg.landmarks, hands.norm, atol=1e-5)
+        assert msg.handedness == ["Left", "Right"]
+        assert np.array_equal(msg.fingers, states) and np.array_equal(msg.counts, counts)
+    assert len(encode_frame(7, hands)) == 24 + 2 * 260
+    for data in (encode_event(8, 1.25, "swipe", {"direction": "left"}),
+                 encode_event_json(8, 1.25, "swipe", {"direction": "left"})):
+        assert decode(data) == EventMessage(8, 1.25, "swipe", {"direction": "left"})
+
+
+def test_subscribers_receive_frames_and_slow_ones_get_frames_dropped():
+    server = StreamServer(udp_port=0, ws_port=0, queue_depth=2).start()
+    udp = ws = slow = None
+    try:
+        host, port = server.udp_address
+        udp = StreamClient(f"udp://{host}:{port}")
+        host, port = server.ws_address
+        ws = StreamClient(f"ws://{host}:{port}/json")
+        slow = StreamClient(f"ws://{host}:{port}/")
+        deadline = time.time() + 5
+        while time.time() < deadline and server.stats()["udp_subscribers"] + len(server.stats()["ws_clients"]) < 3:
+            time.sleep(0.01)
+
+        hands = two_hands()
+        server.publish(hands)
+        server.emit("swipe", direction="right")
+        for client in (udp, ws):
+            # WebSocket subscribers send events ahead of queued frames, so either may come first
+            got = [client.recv(timeout=5), client.recv(timeout=5)]
+            frame, event = sorted(got, key=lambda m: not isinstance(m, FrameMessage))
+            assert isinstance(frame, FrameMessage) and frame.handedness == ["Left", "Right"]
+            assert event.type == "swipe" and event.fields == {"direction": "right"}
+            client.close()
+        udp = ws = None
+
+        # ``slow`` never reads while thousands of frames go out: publishing must not block
+        t0 = time.perf_counter()
+        for _ in range(20000):
+            server.publish(hands)
+        assert time.perf_counter() - t0 < 10.0
+        server.emit("swipe", direction="left")
+        deadline = time.time() + 5
+        while time.time() < deadline and max(c["dropped"] for c in server.stats()["ws_clients"]) == 0:
+            time.sleep(0.01)
+        assert max(c["dropped"] for c in server.stats()["ws_clients"]) > 0
+        # Events are never dropped, even for the slow client
+        directions = []
+        while "left" not in directions:
+            msg = slow.recv(timeout=5)
+            assert msg is not None
+            if isinstance(msg, EventMessage):
+                directions.append(msg.fields["direction"])
+        assert directions == ["right", "left"]
+    finally:
+        for client in (udp, ws, slow):
+            if client is not None:
+                client.close()
+        server.close()
+
+
+def test_send_only_udp_ignores_subscriptions():
+    import socket
+
+    target = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target.bind(("127.0.0.1", 0))
+    target.settimeout(5)
+    server = StreamServer(udp_targets=[target.getsockname()]).start()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        assert server.udp_address[0] == "0.0.0.0"
+        sender.sendto(b"HTSUB", ("127.0.0.1", server.udp_address[1]))
+        server.publish(two_hands())
+        assert isinstance(decode(target.recv(65536)), FrameMessage)  # the fixed target still gets frames
+        time.sleep(0.1)
+        assert server.stats()["udp_subscribers"] == 0
+    finally:
+        sender.close()
+        target.close()
+        server.close()
+
+
+def test_websocket_rejects_foreign_origins_and_oversized_frames():
+    import socket
+    import struct
+
+    def upgrade(sock, origin):
+        sock.sendall(
+            f"GET / HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nOrigin: {origin}\r\n"
+            "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("ascii")
+        )
+        response = b""
+        while b"\r\n\r\n" not in response:
+            response += sock.recv(1024)
+        return response.split(b"\r\n")[0]
+
+    server = StreamServer(ws_port=0, ws_origins=["http://dashboard.lan"]).start()
+    try:
+        with socket.create_connection(server.ws_address, timeout=5) as sock:
+            assert b" 403 " in upgrade(sock, "http://evil.example")
+        with socket.create_connection(server.ws_address, timeout=5) as sock:
+            assert b" 101 " in upgrade(sock, "http://dashboard.lan")
+        with socket.create_connection(server.ws_address, timeout=5) as sock:
+            assert b" 101 " in upgrade(sock, "http://localhost:3000")
+            # A header claiming a 1 TiB payload: the server closes with 1009 instead of buffering it
+            sock.sendall(struct.pack("!BBQ", 0x82, 0x80 | 127, 1 << 40) + b"\0\0\0\0")
+            data = b""
+            while len(data) < 4:
+                chunk = sock.recv(64)
+                assert chunk
+                data += chunk
+            assert data[0] & 0x0F == 0x8 and struct.unpack("!H", data[2:4])[0] == 1009
+    finally:
+        server.close()
@@ -0,0 +1,69 @@
+import numpy as np
+
+from hand_tracker.hands import FrameHands
+from hand_tracker.tracking import DecimatingDetector
+
+
+class ScriptedDetector:
+    """Returns ``make(timestamp)`` and counts how often it was asked."""
+
+    def __init__(self, make):
+        self.make = make
+        self.calls = 0
+
+    def detect(self, frame, timestamp=None, rgb=None):
+        self.calls += 1
+        return self.make(timestamp)
+
+    def close(self):
+        pass
+
+
+def moving_hand(t, w=640, h=480):
+    base = np.random.default_rng(0).uniform(0.3, 0.5, (1, 21, 3))
+    base[..., 0] += 0.2 * t  # constant drift to the right
+    return FrameHands(base, ["Right"], [0.9], w, h, timestamp=t)
+
+
+def test_predicts_between_detections():
+    frame = np.zeros((480, 640, 3), np.uint8)
+    ts = [i / 30 for i in range(9)]
+    det = ScriptedDetector(moving_hand)
+    dec = DecimatingDetector(det, every=3)
+
+    out = [dec.detect(frame, t) for t in ts]
+    assert det.calls == 3 and dec.real_frames == 3 and dec.synth_frames == 6
+    assert [h.synthetic for h in out] == [False, True, True] * 3
+    # Once a velocity is known, the constant-velocity prediction is exact for constant drift
+    for i in (4, 5, 7, 8):
+        assert np.allclose(out[i].norm, moving_hand(ts[i]).norm, atol=1e-5)
+
+
+def test_forced_detection():
+    frame = np.zeros((480, 640, 3), np.uint8)
+    det = ScriptedDetector(moving_hand)
+    dec = DecimatingDetector(det, every=10)
+    dec.detect(frame, 0.0)
+    dec.detect(frame, 1 / 30)
+    assert det.calls == 1
+    dec.request_detection()
+    assert not dec.detect(frame, 2 / 30).synthetic
+    assert det.calls == 2 and dec.forced == 1
+
+
+def test_predicted_finger_flip_triggers_detection():
+    frame = np.zeros((480, 640, 3), np.uint8)
+
+    def rising_index(t):  # index tip rising past its PIP joint
+        hand = moving_hand(0.0)
+        hand.norm[0, 8, 1] = hand.norm[0, 6, 1] + 0.04 - 0.9 * t
+        return FrameHands(hand.norm, ["Right"], [0.9], 640, 480, timestamp=t)
+
+    det = ScriptedDetector(rising_index)
+    dec = DecimatingDetector(det, every=10)
+    dec.detect(frame, 0.0)
+    dec.request_detection()
+    dec.detect(frame, 1 / 30)
+    out = dec.detect(frame, 2 / 30)
+    assert det.calls == 3 and not out.synthetic
+    assert out.finger_states()[0][0, 1]
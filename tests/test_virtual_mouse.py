@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from hand_tracker.hands import FrameHands
+from hand_tracker.input_dispatch import InputDispatcher
+from hand_tracker.recording import ReplaySource, SessionRecorder
+from hand_tracker.virtual_mouse import VirtualMouse
+
+W, H, FPS = 640, 480, 30.0
+
+
+def record_trajectory(path, rng):
+    """60 frames holding still with landmark noise, then 30 frames sweeping right at 400 px/s."""
+    rec = SessionRecorder(path)
+    truth = []
+    base = rng.uniform(0.4, 0.5, (1, 21, 3))
+    base[0, 4, :2] = base[0, 8, :2] - 0.3  # thumb far from the index tip: no click
+    x = 100.0
+    for i in range(90):
+        if i >= 60:
+            x += 400.0 / FPS
+        truth.append(x)
+        norm = base.copy()
+        norm[0, 8, 0] = (x + rng.normal(0, 2.0)) / W
+        norm[0, 8, 1] = (240 + rng.normal(0, 2.0)) / H
+        rec.write(FrameHands(norm, ["Right"], [0.9], W, H, timestamp=1000.0 + i / FPS))
+    rec.close()
+    return np.asarray(truth)
+
+
+def replay_pointer(path, **kw):
+    vm = VirtualMouse(screen_size=(W, H), dispatcher=InputDispatcher(None), **kw)
+    out = []
+    vm._move_cursor = lambda x, y: out.append((x, y))
+    src = ReplaySource(path, realtime=False)
+    frame = np.zeros((H, W, 3), np.uint8)
+    try:
+        for i in range(len(src)):
+            hands, _ = src.get(i)
+            vm.update(frame, hands)
+    finally:
+        src.close()
+        vm.close()
+    return np.asarray(out)
+
+
+def test_one_euro_trades_jitter_and_lag_on_replayed_trajectory(tmp_path):
+    path = str(tmp_path / "traj.htrk")
+    truth = record_trajectory(path, np.random.default_rng(4))
+    latency = 1.0 / FPS  # frames reach the mouse one frame after capture
+    raw = replay_pointer(path, beta=0.0, min_cutoff=1e6, predict=0.0)  # cutoff so high it is a passthrough
+    smooth = replay_pointer(path, predict=0.0)
+    predicted = replay_pointer(path, latency=latency)
+
+    still = slice(20, 60)
+    jitter = lambda p: float(np.std(p[still], axis=0).mean())  # noqa: E731
+    assert jitter(smooth) < 0.5 * jitter(raw)
+    assert jitter(predicted) < 0.6 * jitter(raw)
+
+    # During the sweep, lag is how far behind the true position "now" (capture + latency) we are
+    moving = slice(75, 90)
+    now_x = truth[moving] + 400.0 * latency
+    lag = lambda p: float(np.mean(now_x - p[moving, 0]))  # noqa: E731
+    assert lag(predicted) < lag(smooth)
+    assert lag(predicted) < 0.5 * lag(raw)
+
+
+def test_does_not_touch_the_shared_gesture_registry():
+    from hand_tracker.gestures import REGISTRY
+
+    names, version = REGISTRY.names, REGISTRY.version
+    for threshold in (0.3, 0.8):
+        VirtualMouse(screen_size=(W, H), pinch_threshold=threshold, dispatcher=InputDispatcher(None)).close()
+    assert REGISTRY.names == names and REGISTRY.version == version
+
+
+def test_deprecated_smoothing_maps_onto_min_cutoff():
+    from hand_tracker import app
+    from hand_tracker.virtual_mouse import smoothing_to_cutoff
+
+    with pytest.warns(DeprecationWarning):
+        vm = VirtualMouse(screen_size=(W, H), smoothing=0.25, dispatcher=InputDispatcher(None))
+    assert vm.filter.min_cutoff == pytest.approx(smoothing_to_cutoff(0.25)) == pytest.approx(1.59, abs=0.01)
+    vm.close()
+
+    args = app.build_argparser().parse_args(["--mode", "vmouse", "--vm-smooth", "0.5", "--input-backend", "none"])
+    app._build_mode(args).close()
+    assert args.vm_min_cutoff == pytest.approx(smoothing_to_cutoff(0.5))
+
+
+def test_pinch_exactly_at_the_threshold_does_not_click():
+    hands = FrameHands(np.full((1, 21, 3), 0.5), ["Right"], [0.9], W, H)
+    vm = VirtualMouse(screen_size=(W, H), pinch_threshold=0.5, dispatcher=InputDispatcher(None), draw=False)
+    for ratio, down in ((0.5, False), (0.49, True), (0.5, False)):
+        hands._pinch = np.array([ratio])
+        vm.update(np.zeros((H, W, 3), np.uint8), hands)
+        assert vm._pinch_down is down
+    vm.close()